@@ -0,0 +1,21 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_started
+
+
+def _start_notification_sweeper(**kwargs):
+    from .notifications import notification_sweeper
+
+    notification_sweeper.start(
+        interval=settings.NOTIFICATION_SWEEP_INTERVAL,
+        batch_size=settings.NOTIFICATION_SWEEP_BATCH_SIZE,
+    )
+
+
+class ApiConfig(AppConfig):
+    name = "api"
+
+    def ready(self):
+        # Only web workers serve requests, so management commands never start the sweeper.
+        if settings.NOTIFICATION_SWEEP_INTERVAL > 0:
+            request_started.connect(_start_notification_sweeper, dispatch_uid="api_notification_sweeper")
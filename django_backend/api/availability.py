@@ -0,0 +1,219 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, timedelta
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .db_router import primary_reads
+from .models import BOOKING_BLOCKING_STATUSES, Booking, Car
+from .occupancy import forget_all, forget_car
+
+
+AVAILABILITY_GENERATION_KEY = "api:availability:generation"
+
+_entry_start = itemgetter(0)
+
+
+def _incr_generation():
+    cache.add(AVAILABILITY_GENERATION_KEY, 0, timeout=None)
+    try:
+        return cache.incr(AVAILABILITY_GENERATION_KEY)
+    except ValueError:
+        cache.set(AVAILABILITY_GENERATION_KEY, 1, timeout=None)
+        return 1
+
+
+def blocking_bookings(today, car_ids):
+    # Availability is only asked for future dates, so past bookings never matter.
+    return Booking.objects.filter(
+        status__in=BOOKING_BLOCKING_STATUSES,
+        end_date__gte=today,
+        car_id__in=car_ids,
+    ).values_list("id", "car_id", "start_date", "end_date")
+
+
+class _CarIntervals:
+    """Blocking date ranges of one car, sorted by start date."""
+
+    def __init__(self):
+        self.entries = []
+        self.longest = 0
+
+    def add(self, start_date, end_date, booking_id):
+        insort(self.entries, (start_date, end_date, booking_id))
+        self.longest = max(self.longest, (end_date - start_date).days)
+
+    def remove(self, start_date, end_date, booking_id):
+        try:
+            self.entries.remove((start_date, end_date, booking_id))
+        except ValueError:
+            pass
+
+    def overlaps(self, start_date, end_date):
+        # Nothing starting after end_date can overlap; walking back, stop once an
+        # entry starts so early that even the longest booking ends before start_date.
+        position = bisect_right(self.entries, end_date, key=_entry_start)
+        for index in range(position - 1, -1, -1):
+            entry_start, entry_end, _ = self.entries[index]
+            if (start_date - entry_start).days > self.longest:
+                break
+            if entry_end >= start_date:
+                return True
+        return False
+
+    def free_windows(self, after, days, limit):
+        """Up to limit (first start, last free day or None) gaps of at least days free days from after on.
+
+        One pass over the entries in start order, tracking the latest end seen so far.
+        """
+        windows = []
+        cursor = after
+        # Entries starting more than `longest` days before `after` end before it too.
+        position = bisect_left(self.entries, after - timedelta(days=self.longest), key=_entry_start)
+        for entry_start, entry_end, _ in self.entries[position:]:
+            if entry_end < cursor:
+                continue
+            if (entry_start - cursor).days >= days:
+                windows.append((cursor, entry_start - timedelta(days=1)))
+                if len(windows) == limit:
+                    return windows
+            cursor = max(cursor, entry_end + timedelta(days=1))
+        windows.append((cursor, None))
+        return windows
+
+
+class AvailabilityIndex:
+    """Per-worker in-memory index of active cars and their blocking bookings.
+
+    Built lazily on first use and rebuilt when it is older than
+    AVAILABILITY_INDEX_MAX_AGE seconds, when the day rolls over, or when another
+    worker bumps the shared generation counter in the cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._cars = None
+        self._intervals = {}
+        self._bookings = {}
+        self._generation = None
+        self._built_on = None
+        self._built_at = 0.0
+
+    def _max_age(self):
+        return getattr(settings, "AVAILABILITY_INDEX_MAX_AGE", 300)
+
+    def _is_stale(self, today):
+        if self._cars is None or self._built_on != today:
+            return True
+        if time.monotonic() - self._built_at > self._max_age():
+            return True
+        return cache.get(AVAILABILITY_GENERATION_KEY, 0) != self._generation
+
+    def _rebuild(self, today):
+        generation = cache.get(AVAILABILITY_GENERATION_KEY, 0)
+        # Built from the primary: a replica behind the generation bump would hide the new booking.
+        with primary_reads():
+            cars = list(
+                Car.objects.filter(is_active=True)
+                .order_by("id")
+                .values("id", "name", "price_per_day")
+            )
+            intervals = {car["id"]: _CarIntervals() for car in cars}
+            bookings = {}
+
+            for booking_id, car_id, start_date, end_date in blocking_bookings(today, intervals.keys()):
+                intervals[car_id].add(start_date, end_date, booking_id)
+                bookings[booking_id] = (car_id, start_date, end_date)
+
+        self._cars = cars
+        self._intervals = intervals
+        self._bookings = bookings
+        self._generation = generation
+        self._built_on = today
+        self._built_at = time.monotonic()
+
+    def _ensure_fresh(self):
+        today = date.today()
+        if self._is_stale(today):
+            self._rebuild(today)
+
+    def _bump_generation(self):
+        generation = _incr_generation()
+
+        # Only adopt the new generation if no other worker wrote in between;
+        # otherwise leave the index stale so the next read rebuilds it.
+        if self._generation is not None and generation == self._generation + 1:
+            self._generation = generation
+        else:
+            self._cars = None
+
+    def cars_for_range(self, start_date, end_date):
+        with self._lock:
+            self._ensure_fresh()
+            return [
+                {
+                    **car,
+                    "is_available": not self._intervals[car["id"]].overlaps(start_date, end_date),
+                }
+                for car in self._cars
+            ]
+
+    def free_windows(self, car_ids, after, days, limit):
+        """Active cars among car_ids with their earliest free windows of `days` days, soonest first."""
+        with self._lock:
+            self._ensure_fresh()
+            wanted = set(car_ids)
+            results = []
+            for car in self._cars:
+                if car["id"] not in wanted:
+                    continue
+                windows = self._intervals[car["id"]].free_windows(after, days, limit)
+                results.append(
+                    {
+                        **car,
+                        "windows": [
+                            {
+                                "start_date": start.isoformat(),
+                                "end_date": (start + timedelta(days=days - 1)).isoformat(),
+                                "free_until": free_until.isoformat() if free_until else None,
+                                "total_price": car["price_per_day"] * days,
+                            }
+                            for start, free_until in windows
+                        ],
+                    }
+                )
+        results.sort(key=lambda car: (car["windows"][0]["start_date"], car["price_per_day"], car["id"]))
+        return results
+
+    def track_booking(self, booking):
+        """Apply a created or updated booking to the index in place."""
+        forget_car(booking.car_id)
+        with self._lock:
+            if self._cars is None:
+                _incr_generation()
+                return
+
+            previous = self._bookings.pop(booking.id, None)
+            if previous is not None:
+                car_id, start_date, end_date = previous
+                self._intervals[car_id].remove(start_date, end_date, booking.id)
+
+            car_intervals = self._intervals.get(booking.car_id)
+            if booking.status in BOOKING_BLOCKING_STATUSES and car_intervals is not None:
+                car_intervals.add(booking.start_date, booking.end_date, booking.id)
+                self._bookings[booking.id] = (booking.car_id, booking.start_date, booking.end_date)
+
+            self._bump_generation()
+
+    def invalidate(self):
+        """Drop the index and cached occupancy calendars on every worker, e.g. after the car catalog changed."""
+        forget_all()
+        with self._lock:
+            self._cars = None
+            _incr_generation()
+
+
+availability_index = AvailabilityIndex()
@@ -0,0 +1,143 @@
+import csv
+import io
+import os
+
+from django.db import transaction
+
+from .availability import availability_index
+from .catalog import bump_catalog_version
+from .counters import record_cars_added
+from .image_pipeline import image_variant_pipeline
+from .models import Car, CarImage
+
+
+IMPORT_BATCH_SIZE = 500
+IMPORT_ERROR_LIMIT = 200
+# Several image URLs share one "images" cell.
+IMAGE_URL_SEPARATOR = "|"
+
+
+class CarImportError(ValueError):
+    pass
+
+
+def _column_name(value):
+    return str(value or "").strip().lower().replace(" ", "_")
+
+
+def _row_dict(header, values):
+    # Blank cells are left out so the validator applies its own defaults (e.g. is_active).
+    return {
+        name: value
+        for name, value in zip(header, values)
+        if name and value is not None and str(value).strip() != ""
+    }
+
+
+def _csv_rows(fileobj):
+    reader = csv.reader(io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline=""))
+    header = [_column_name(name) for name in next(reader, [])]
+    for values in reader:
+        row = _row_dict(header, values)
+        if row:
+            yield reader.line_num, row
+
+
+def _xlsx_rows(workbook):
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [_column_name(name) for name in next(rows, [])]
+        for line, values in enumerate(rows, start=2):
+            # Spreadsheet numbers come back as floats (1500.0); keep whole numbers integral.
+            values = [int(v) if isinstance(v, float) and v.is_integer() else v for v in values]
+            row = _row_dict(header, values)
+            if row:
+                yield line, row
+    finally:
+        workbook.close()
+
+
+def read_car_rows(fileobj, filename):
+    """Yield (line number, {column: value}) from a .csv or .xlsx file without loading it whole."""
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext in ("", ".csv", ".txt"):
+        return _csv_rows(fileobj)
+    if ext != ".xlsx":
+        raise CarImportError("Unsupported file type; upload a .csv or .xlsx file")
+
+    try:
+        import openpyxl
+    except ImportError:
+        raise CarImportError("XLSX import needs openpyxl (pip install openpyxl)")
+
+    try:
+        workbook = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+    except Exception:
+        raise CarImportError("Could not read the XLSX file")
+    return _xlsx_rows(workbook)
+
+
+def _image_urls(value):
+    urls = [url.strip() for url in str(value or "").split(IMAGE_URL_SEPARATOR) if url.strip()]
+    if any(len(url) > 500 for url in urls):
+        return None, "image URL is too long"
+    return urls, None
+
+
+def _write_batch(batch):
+    with transaction.atomic():
+        cars = Car.objects.bulk_create([car for car, _ in batch])
+        images = CarImage.objects.bulk_create(
+            [CarImage(car=car, image_url=url) for car, urls in batch for url in urls]
+        )
+        record_cars_added(len(cars), sum(car.is_active for car in cars))
+        for image in images:
+            image_variant_pipeline.schedule(image)
+    return len(cars), len(images)
+
+
+def import_car_rows(rows, validate, batch_size=IMPORT_BATCH_SIZE, dry_run=False, error_limit=IMPORT_ERROR_LIMIT):
+    """Validate rows one by one and bulk-insert the valid ones, batch_size cars per transaction.
+
+    validate(row) returns (Car field values, None) or (None, error message), the same
+    contract as the admin create form. Invalid rows are skipped and reported; batches
+    already written stay written if a later one fails.
+    """
+    result = {"rows": 0, "valid": 0, "created": 0, "images": 0, "error_count": 0, "errors": []}
+
+    def add_error(line, message):
+        result["error_count"] += 1
+        if error_limit is None or len(result["errors"]) < error_limit:
+            result["errors"].append({"row": line, "message": message})
+
+    def flush():
+        if batch and not dry_run:
+            cars, images = _write_batch(batch)
+            result["created"] += cars
+            result["images"] += images
+        batch.clear()
+
+    batch = []
+    try:
+        for line, row in rows:
+            result["rows"] += 1
+            fields, message = validate(row)
+            if message is None:
+                urls, message = _image_urls(row.get("images"))
+            if message:
+                add_error(line, message)
+                continue
+
+            result["valid"] += 1
+            batch.append((Car(**fields), urls))
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    except (UnicodeDecodeError, csv.Error) as exc:
+        add_error(None, f"Stopped reading the file: {exc}")
+    finally:
+        if result["created"]:
+            availability_index.invalidate()
+            bump_catalog_version()
+
+    return result
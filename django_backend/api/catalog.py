@@ -0,0 +1,63 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .db_router import primary_reads
+
+
+CATALOG_VERSION_KEY = "api:catalog:version"
+
+
+def catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so a lost counter never reuses an old version's entries.
+        cache.add(CATALOG_VERSION_KEY, time.time_ns() // 1_000_000, timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY, 0)
+    return version
+
+
+def bump_catalog_version():
+    """Invalidate every cached catalog response.
+
+    Other workers see the new version only when they share this cache backend
+    (settings.SHARED_CACHE); otherwise their entries expire after CATALOG_CACHE_TIMEOUT.
+    """
+    catalog_version()
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        return catalog_version()
+
+
+def cached_catalog_response(keyword, build_body):
+    """Return (etag, body) for the public catalog, building the JSON body at most once per version.
+
+    build_body() must return the encoded JSON bytes; it is only called on a miss.
+    """
+    version = catalog_version()
+    key_digest = hashlib.sha1(keyword.lower().encode("utf-8")).hexdigest()
+    cache_key = f"api:catalog:{version}:{key_digest}"
+
+    entry = cache.get(cache_key)
+    if entry is None:
+        # A lagging replica would pin stale rows under this version until the next bump.
+        with primary_reads():
+            body = build_body()
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        entry = (etag, body)
+        cache.set(cache_key, entry, timeout=getattr(settings, "CATALOG_CACHE_TIMEOUT", 3600))
+    return entry
+
+
+def cached_catalog_cars(build_cars):
+    """{car id: serialized car} for the active catalog, cached per version like the responses above."""
+    cache_key = f"api:catalog:{catalog_version()}:cars"
+    cars = cache.get(cache_key)
+    if cars is None:
+        with primary_reads():
+            cars = build_cars()
+        cache.set(cache_key, cars, timeout=getattr(settings, "CATALOG_CACHE_TIMEOUT", 3600))
+    return cars
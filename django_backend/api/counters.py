@@ -0,0 +1,158 @@
+from collections import namedtuple
+
+from django.db import transaction
+from django.db.models import F, Sum
+
+from .models import Booking, Car, DashboardCounters, User
+from .rollups import apply_rollup_changes
+
+
+COUNTER_FIELDS = [
+    "total_users",
+    "total_admins",
+    "total_cars",
+    "active_cars",
+    "total_orders",
+    "incoming_orders",
+    "pending_orders",
+    "completed_orders",
+    "completed_revenue",
+]
+
+
+BookingState = namedtuple(
+    "BookingState",
+    [
+        "status",
+        "order_stage",
+        "total_price",
+        "deposit",
+        "car_id",
+        "start_date",
+        "end_date",
+        "created_at",
+        "completed_at",
+    ],
+)
+
+
+def booking_state(booking):
+    """Snapshot of the booking fields the dashboard counters and daily rollups depend on."""
+    return BookingState(
+        booking.status,
+        booking.order_stage,
+        booking.total_price,
+        booking.deposit,
+        booking.car_id,
+        booking.start_date,
+        booking.end_date,
+        booking.created_at,
+        booking.completed_at,
+    )
+
+
+def _booking_contribution(state):
+    if state is None:
+        return {}
+    is_completed = state.order_stage == "completed"
+    return {
+        "total_orders": 1,
+        "incoming_orders": int(not is_completed and state.status != "rejected"),
+        "pending_orders": int(state.status == "pending"),
+        "completed_orders": int(is_completed),
+        "completed_revenue": state.total_price if is_completed else 0,
+    }
+
+
+def _user_contribution(role):
+    if role is None:
+        return {}
+    return {
+        "total_users": int(role == "customer"),
+        "total_admins": int(role == "admin"),
+    }
+
+
+def _car_contribution(is_active):
+    if is_active is None:
+        return {}
+    return {
+        "total_cars": 1,
+        "active_cars": int(is_active),
+    }
+
+
+def _apply(before, after):
+    deltas = {}
+    for name in COUNTER_FIELDS:
+        delta = after.get(name, 0) - before.get(name, 0)
+        if delta:
+            deltas[name] = F(name) + delta
+    if not deltas:
+        return
+
+    # Callers run this inside the same transaction as the row change it describes.
+    if not DashboardCounters.objects.filter(pk=DashboardCounters.SINGLETON_ID).update(**deltas):
+        rebuild_dashboard_counters()
+
+
+def record_booking_change(before, after):
+    """before/after are booking_state() snapshots, or None when the row did not/no longer exists."""
+    record_booking_changes([(before, after)])
+
+
+def record_booking_changes(changes):
+    """record_booking_change for many (before, after) pairs with a single counter and rollup update."""
+    changes = list(changes)
+    before, after = {}, {}
+    for before_state, after_state in changes:
+        for totals, state in ((before, before_state), (after, after_state)):
+            for name, value in _booking_contribution(state).items():
+                totals[name] = totals.get(name, 0) + value
+    _apply(before, after)
+    apply_rollup_changes(changes)
+
+
+def record_user_change(before_role, after_role):
+    _apply(_user_contribution(before_role), _user_contribution(after_role))
+
+
+def record_car_change(before_is_active, after_is_active):
+    _apply(_car_contribution(before_is_active), _car_contribution(after_is_active))
+
+
+def record_cars_added(count, active_count):
+    """One counter update for a bulk insert of count cars, active_count of them active."""
+    _apply({}, {"total_cars": count, "active_cars": active_count})
+
+
+def compute_dashboard_counters():
+    """Count everything from the source tables (what the dashboard used to do per request)."""
+    completed = Booking.objects.filter(order_stage="completed").aggregate(total=Sum("total_price"))
+    return {
+        "total_users": User.objects.filter(role="customer").count(),
+        "total_admins": User.objects.filter(role="admin").count(),
+        "total_cars": Car.objects.count(),
+        "active_cars": Car.objects.filter(is_active=True).count(),
+        "total_orders": Booking.objects.count(),
+        "incoming_orders": Booking.objects.exclude(order_stage="completed").exclude(status="rejected").count(),
+        "pending_orders": Booking.objects.filter(status="pending").count(),
+        "completed_orders": Booking.objects.filter(order_stage="completed").count(),
+        "completed_revenue": completed["total"] or 0,
+    }
+
+
+def rebuild_dashboard_counters():
+    with transaction.atomic():
+        # Lock the row first so concurrent increments wait for the rebuilt values.
+        DashboardCounters.objects.select_for_update().filter(pk=DashboardCounters.SINGLETON_ID).first()
+        values = compute_dashboard_counters()
+        DashboardCounters.objects.update_or_create(pk=DashboardCounters.SINGLETON_ID, defaults=values)
+    return values
+
+
+def read_dashboard_counters():
+    row = DashboardCounters.objects.filter(pk=DashboardCounters.SINGLETON_ID).values(*COUNTER_FIELDS).first()
+    if row is None:
+        return rebuild_dashboard_counters()
+    return row
@@ -0,0 +1,45 @@
+import os
+
+from django.conf import settings
+from django.db import connections
+
+
+def connection_stats(alias="default"):
+    """How this worker connects to the database, plus live psycopg pool numbers when pooling."""
+    settings_dict = connections[alias].settings_dict
+    stats = {
+        "mode": getattr(settings, "DB_CONNECTION_MODE", "per_request"),
+        "pid": os.getpid(),
+        "conn_max_age": settings_dict.get("CONN_MAX_AGE", 0),
+        "health_checks": settings_dict.get("CONN_HEALTH_CHECKS", False),
+        "server_side_cursors": not settings_dict.get("DISABLE_SERVER_SIDE_CURSORS", False),
+        "pool": None,
+    }
+
+    pool = getattr(connections[alias], "pool", None)
+    if pool is None:
+        return stats
+
+    # psycopg_pool leaves counters that are still zero out of get_stats().
+    raw = pool.get_stats()
+    requests = raw.get("requests_num", 0)
+    wait_ms = raw.get("requests_wait_ms", 0)
+    stats["pool"] = {
+        "min_size": raw.get("pool_min", 0),
+        "max_size": raw.get("pool_max", 0),
+        "size": raw.get("pool_size", 0),
+        "in_use": raw.get("pool_size", 0) - raw.get("pool_available", 0),
+        "available": raw.get("pool_available", 0),
+        "waiting": raw.get("requests_waiting", 0),
+        "requests": requests,
+        # Requests that found no free connection and had to wait for one.
+        "queued": raw.get("requests_queued", 0),
+        "wait_ms_total": wait_ms,
+        "wait_ms_mean": round(wait_ms / requests, 3) if requests else 0.0,
+        "timeouts": raw.get("requests_errors", 0),
+        "connections_opened": raw.get("connections_num", 0),
+        "connect_ms_total": raw.get("connections_ms", 0),
+        "connections_lost": raw.get("connections_lost", 0),
+        "bad_returns": raw.get("returns_bad", 0),
+    }
+    return stats
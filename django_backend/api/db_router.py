@@ -0,0 +1,135 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+
+PRIMARY = "default"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PIN_COOKIE = "db_primary_until"
+# Never read stale: a session saved by the login POST must exist on the very next GET,
+# and a DatabaseCache entry (app label "django_cache") carries invalidation versions.
+PRIMARY_ONLY_APPS = {"sessions", "django_cache"}
+
+
+class _RequestRouting:
+    """Per-request routing state, shared (by reference) with the threads an async view hops to."""
+
+    def __init__(self, replica):
+        self.replica = replica
+        self.wrote = False
+
+
+_request_routing = ContextVar("api_db_request_routing", default=None)
+
+
+def replica_aliases():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def _pinned_until(request):
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0))
+    except ValueError:
+        return 0.0
+
+
+def begin_request(request):
+    """Decide where this request reads from; returns the token end_request() needs.
+
+    Only safe methods from clients that have not written in the last
+    DB_REPLICA_PIN_SECONDS read from a replica (one per request, so every query
+    of a page sees the same snapshot). Everything else stays on the primary.
+    """
+    replica = None
+    aliases = replica_aliases()
+    if aliases and request.method in SAFE_METHODS and _pinned_until(request) < time.time():
+        replica = random.choice(aliases)
+    return _request_routing.set(_RequestRouting(replica))
+
+
+def end_request(token):
+    routing = _request_routing.get()
+    _request_routing.reset(token)
+    return routing
+
+
+def pin_after_write(routing, response):
+    """Send the client's reads to the primary for a while if this request wrote anything."""
+    if routing.wrote:
+        seconds = getattr(settings, "DB_REPLICA_PIN_SECONDS", 5.0)
+        response.set_cookie(
+            PIN_COOKIE,
+            f"{time.time() + seconds:.3f}",
+            max_age=max(1, round(seconds)),
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary inside this block, e.g. while filling a shared cache."""
+    routing = _request_routing.get()
+    if routing is None or routing.replica is None:
+        yield
+        return
+    replica = routing.replica
+    routing.replica = None
+    try:
+        yield
+    finally:
+        routing.replica = replica
+
+
+def use_primary(view):
+    """For the few views that write on a GET: keep all of their reads on the primary."""
+
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        with primary_reads():
+            return view(request, *args, **kwargs)
+
+    return wrapped
+
+
+class PrimaryReplicaRouter:
+    """Writes go to "default"; safe requests read from the replica begin_request() picked.
+
+    Outside a request (management commands, background threads), after the
+    request's first write, and inside a transaction on the primary, reads stay
+    on the primary too, so read-then-write code never acts on a stale row.
+    """
+
+    def db_for_read(self, model, **hints):
+        routing = _request_routing.get()
+        if routing is None or routing.replica is None or routing.wrote:
+            return PRIMARY
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return PRIMARY
+        if connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        return routing.replica
+
+    def db_for_write(self, model, **hints):
+        routing = _request_routing.get()
+        if routing is not None:
+            routing.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {PRIMARY, *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication.
+        if db in replica_aliases():
+            return False
+        return None
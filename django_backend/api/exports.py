@@ -0,0 +1,117 @@
+import csv
+import json
+from datetime import date, datetime
+
+from django.db import connections
+from django.db.models import F, Q
+
+
+# (column name, values_list() lookup) for one exported booking.
+HISTORY_EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("completed_at", "completed_at"),
+    ("created_at", "created_at"),
+    ("status", "status"),
+    ("order_stage", "order_stage"),
+    ("customer_id", "user_id"),
+    ("customer_name", "user__fullName"),
+    ("customer_username", "user__username"),
+    ("customer_phone", "user__phoneNumber"),
+    ("car_id", "car_id"),
+    ("car_name", "car__name"),
+    ("start_date", "start_date"),
+    ("end_date", "end_date"),
+    ("pickup_type", "pickup_type"),
+    ("current_province", "current_province"),
+    ("destination_province", "destination_province"),
+    ("delivery_address", "delivery_address"),
+    ("contact_number", "contact_number"),
+    ("total_price", "total_price"),
+]
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+EXPORT_CHUNK_SIZE = 2000
+# Rows joined into one chunk of the response body, so the server is not flushing tiny writes.
+ROWS_PER_WRITE = 500
+
+
+class _Line:
+    """csv.writer target that hands back the line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _plain(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _csv_lines(rows, header):
+    writer = csv.writer(_Line())
+    for row in rows:
+        yield writer.writerow([_plain(value) for value in row])
+
+
+def _ndjson_lines(rows, header):
+    for row in rows:
+        record = {name: _plain(value) for name, value in zip(header, row)}
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def history_export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Closed bookings as plain tuples, oldest completion first, read through a server-side cursor."""
+    if connections[queryset.db].settings_dict.get("DISABLE_SERVER_SIDE_CURSORS"):
+        return _history_export_pages(queryset, chunk_size)
+    return (
+        queryset.order_by(F("completed_at").asc(nulls_first=True), "id")
+        .values_list(*[lookup for _, lookup in HISTORY_EXPORT_COLUMNS])
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _history_export_pages(queryset, chunk_size):
+    # Without server-side cursors (pgbouncer transaction mode) iterator() would load the
+    # whole result, so read keyset pages instead: NULL completed_at rows first, then
+    # (completed_at, id) ascending.
+    lookups = [lookup for _, lookup in HISTORY_EXPORT_COLUMNS]
+    id_index = lookups.index("id")
+    completed_index = lookups.index("completed_at")
+    queryset = queryset.order_by(F("completed_at").asc(nulls_first=True), "id").values_list(*lookups)
+
+    page = queryset
+    while True:
+        rows = list(page[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+
+        last_id = rows[-1][id_index]
+        last_completed = rows[-1][completed_index]
+        if last_completed is None:
+            after = Q(completed_at__isnull=True, id__gt=last_id) | Q(completed_at__isnull=False)
+        else:
+            after = Q(completed_at__gt=last_completed) | Q(completed_at=last_completed, id__gt=last_id)
+        page = queryset.filter(after)
+
+
+def stream_history_export(queryset, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the export body in chunks; nothing is read from the database until the first chunk is asked for."""
+    header = [name for name, _ in HISTORY_EXPORT_COLUMNS]
+    lines = _ndjson_lines
+    if export_format == "csv":
+        lines = _csv_lines
+        # The header goes out before the query runs; the BOM lets Excel read UTF-8 (Thai) text.
+        yield "\ufeff" + csv.writer(_Line()).writerow(header)
+
+    pending = []
+    for line in lines(history_export_rows(queryset, chunk_size), header):
+        pending.append(line)
+        if len(pending) >= ROWS_PER_WRITE:
+            yield "".join(pending)
+            pending = []
+    if pending:
+        yield "".join(pending)
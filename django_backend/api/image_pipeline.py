@@ -0,0 +1,137 @@
+import logging
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+
+from .catalog import bump_catalog_version
+from .imaging import render_variants
+from .models import CarImage
+
+
+VARIANT_DIR = "car_images/variants"
+
+logger = logging.getLogger(__name__)
+
+
+class ImageVariantPipeline:
+    """Renders car image derivatives off the request thread.
+
+    Resizing runs in a spawned process pool so it never holds the GIL of a web
+    worker; a small thread pool waits on each job and writes the result back
+    to CarImage.variants, then bumps the catalog version.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._processes = None
+        self._threads = None
+
+    def _pools(self):
+        with self._lock:
+            if self._processes is None:
+                workers = getattr(settings, "IMAGE_VARIANT_WORKERS", 2)
+                self._processes = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                self._threads = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="image-variants",
+                )
+            return self._processes, self._threads
+
+    def schedule(self, image):
+        """Queue derivatives for image once the current transaction commits.
+
+        Returns False when its source is not a local file.
+        """
+        source_path = local_image_path(image.image_url)
+        if source_path is None:
+            return False
+
+        transaction.on_commit(lambda: self.submit(image.id, image.image_url, source_path))
+        return True
+
+    def submit(self, image_id, image_url, source_path):
+        _, threads = self._pools()
+        return threads.submit(self._render_and_store, image_id, image_url, source_path)
+
+    def _render_and_store(self, image_id, image_url, source_path):
+        processes, _ = self._pools()
+        stem = f"{image_id}-{uuid.uuid4().hex[:8]}"
+        try:
+            rendered = processes.submit(
+                render_variants,
+                source_path,
+                default_storage.path(VARIANT_DIR),
+                stem,
+            ).result()
+            variants = {
+                name: [[f"{VARIANT_DIR}/{file_name}", width] for file_name, width in files]
+                for name, files in rendered.items()
+            }
+
+            with transaction.atomic():
+                image = CarImage.objects.select_for_update().filter(id=image_id, image_url=image_url).first()
+                # The image was deleted or re-pointed while rendering; drop the orphans.
+                if image is None:
+                    _delete_variant_files(variants)
+                    return False
+
+                stale_variants = image.variants
+                image.variants = variants
+                image.save(update_fields=["variants"])
+
+            _delete_variant_files(stale_variants)
+            bump_catalog_version()
+            return True
+        except Exception:
+            logger.exception("Rendering variants for car image %s failed", image_id)
+            return False
+        finally:
+            connections.close_all()
+
+
+def local_image_path(image_url):
+    """Filesystem path of a /media/ or /static/ image URL, or None for remote/missing files."""
+    if not image_url:
+        return None
+
+    if settings.MEDIA_URL and image_url.startswith(settings.MEDIA_URL):
+        relative_path = image_url[len(settings.MEDIA_URL):]
+        if relative_path and default_storage.exists(relative_path):
+            return default_storage.path(relative_path)
+        return None
+
+    if settings.STATIC_URL and image_url.startswith(settings.STATIC_URL):
+        return finders.find(image_url[len(settings.STATIC_URL):])
+
+    return None
+
+
+def image_srcset(image, name):
+    return variants_srcset(image.variants, name)
+
+
+def variants_srcset(variants, name):
+    return ", ".join(f"{default_storage.url(path)} {width}w" for path, width in (variants or {}).get(name, []))
+
+
+def _delete_variant_files(variants):
+    for files in (variants or {}).values():
+        for path, _ in files:
+            if default_storage.exists(path):
+                default_storage.delete(path)
+
+
+def delete_image_variants(image):
+    _delete_variant_files(image.variants)
+
+
+image_variant_pipeline = ImageVariantPipeline()
@@ -0,0 +1,48 @@
+# Runs inside the image variant process pool. Keep it free of Django imports:
+# pool workers are spawned fresh and never call django.setup().
+import os
+
+from PIL import Image, ImageOps
+
+
+# Longest edge of each derivative, in pixels.
+VARIANT_WIDTHS = {
+    "thumb": 320,
+    "card": 800,
+    "full": 1600,
+}
+
+VARIANT_FORMATS = {
+    "webp": ("WEBP", ".webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", ".jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def render_variants(source_path, output_dir, stem):
+    """Write every width/format derivative of source_path into output_dir.
+
+    Returns {format: [[file_name, width], ...]} ordered by width. Widths are
+    never upscaled, so small originals may yield fewer than three sizes.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rendered = {name: [] for name in VARIANT_FORMATS}
+
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original).convert("RGB")
+
+    seen_widths = set()
+    for variant, max_width in sorted(VARIANT_WIDTHS.items(), key=lambda item: item[1]):
+        width = min(max_width, image.width)
+        if width in seen_widths:
+            continue
+        seen_widths.add(width)
+
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+
+        for name, (pil_format, extension, save_options) in VARIANT_FORMATS.items():
+            file_name = f"{stem}-{variant}{extension}"
+            resized.save(os.path.join(output_dir, file_name), pil_format, **save_options)
+            rendered[name].append([file_name, width])
+
+    return rendered
@@ -0,0 +1,34 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is used instead
+    orjson = None
+
+
+_django_default = DjangoJSONEncoder().default
+
+
+def dumps(data):
+    """Encode data as JSON bytes, with orjson when it is installed.
+
+    Both backends accept what JsonResponse accepts (dates, Decimal, UUID, lazy
+    strings) and encode those values through DjangoJSONEncoder, so datetimes get
+    the same millisecond precision either way. orjson writes compact UTF-8
+    rather than ASCII escapes and spaces after separators.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=_django_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+    return json.dumps(data, cls=DjangoJSONEncoder).encode("utf-8")
+
+
+def json_response(data, status=200):
+    """JsonResponse with the fastest available encoder."""
+    return HttpResponse(dumps(data), status=status, content_type="application/json")
@@ -0,0 +1,50 @@
+"""Helpers shared by the bench_* commands (Django skips command modules starting with "_")."""
+
+import json
+from importlib import import_module
+
+from django.conf import settings
+from django.test import Client
+
+from api.views import _session_user
+
+
+def saved_session(user):
+    """A stored session logged in as user, exactly as the login view leaves it."""
+    session = import_module(settings.SESSION_ENGINE).SessionStore()
+    session["user"] = _session_user(user)
+    session.save()
+    return session
+
+
+def session_cookie(user):
+    return f"{settings.SESSION_COOKIE_NAME}={saved_session(user).session_key}"
+
+
+def logged_in_client(user):
+    """A test Client that carries a saved session for user."""
+    client = Client()
+    client.cookies[settings.SESSION_COOKIE_NAME] = saved_session(user).session_key
+    return client
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def add_output_argument(parser):
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+
+
+def write_report(command, report, output):
+    """Print the JSON report, or write it to output and say so on stderr."""
+    encoded = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as handle:
+            handle.write(encoded + "\n")
+        command.stderr.write(f"report written to {output}")
+    else:
+        command.stdout.write(encoded)
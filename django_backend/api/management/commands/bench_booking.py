@@ -0,0 +1,142 @@
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from api.counters import rebuild_dashboard_counters
+from api.models import BOOKING_BLOCKING_STATUSES, Booking, Car, User
+
+from ._bench import logged_in_client
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent POST /api/booking/ requests at throwaway cars and report "
+        "throughput plus any double-booked days that slipped through."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--cars", type=int, default=3)
+        parser.add_argument("--days-ahead", type=int, default=30)
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--keep", action="store_true", help="Keep the benchmark cars, user and bookings")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        tag = f"bench-{uuid.uuid4().hex[:8]}"
+        phone = f"09{rng.randrange(10**8):08d}"
+
+        user = User.objects.create(
+            fullName=tag,
+            phoneNumber=phone,
+            username=tag,
+            password="",
+            role="customer",
+        )
+        cars = [
+            Car.objects.create(
+                name=f"{tag}-{index}",
+                price_per_day=1000,
+                fuel_type="Petrol",
+                fuel_consumption="10 km/L",
+                car_type="Sedan",
+            )
+            for index in range(options["cars"])
+        ]
+
+        first_day = date.today() + timedelta(days=1)
+        jobs = []
+        for _ in range(options["requests"]):
+            start_date = first_day + timedelta(days=rng.randrange(options["days_ahead"]))
+            end_date = start_date + timedelta(days=rng.randrange(4))
+            jobs.append((rng.choice(cars).id, start_date, end_date))
+
+        local = threading.local()
+
+        def post_booking(job):
+            client = getattr(local, "client", None)
+            if client is None:
+                client = local.client = logged_in_client(user)
+
+            car_id, start_date, end_date = job
+            started = time.perf_counter()
+            response = client.post(
+                "/api/booking/",
+                {
+                    "car_id": car_id,
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat(),
+                    "pickup_type": "self",
+                    "current_province": "Bangkok",
+                    "destination_province": "Bangkok",
+                    "contact_number": phone,
+                },
+            )
+            elapsed = time.perf_counter() - started
+
+            if response.status_code == 302:
+                return "created", elapsed
+            if b"already booked" in response.content:
+                return "conflict", elapsed
+            return "error", elapsed
+
+        def run(job):
+            try:
+                return post_booking(job)
+            finally:
+                connections.close_all()
+
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+                results = list(executor.map(run, jobs))
+            wall_time = time.perf_counter() - started
+
+            outcomes = {"created": 0, "conflict": 0, "error": 0}
+            for outcome, _ in results:
+                outcomes[outcome] += 1
+            latencies = sorted(elapsed for _, elapsed in results)
+
+            double_booked = self._count_double_booked_days(cars)
+
+            self.stdout.write(f"requests:        {len(jobs)} ({options['concurrency']} concurrent)")
+            self.stdout.write(f"wall time:       {wall_time:.2f}s")
+            self.stdout.write(f"throughput:      {len(jobs) / wall_time:.1f} req/s")
+            self.stdout.write(f"p50 latency:     {latencies[len(latencies) // 2] * 1000:.1f} ms")
+            self.stdout.write(f"p95 latency:     {latencies[int(len(latencies) * 0.95)] * 1000:.1f} ms")
+            self.stdout.write(
+                f"outcomes:        {outcomes['created']} created, "
+                f"{outcomes['conflict']} rejected as overlapping, {outcomes['error']} errors"
+            )
+            if double_booked:
+                self.stdout.write(self.style.ERROR(f"double-booked car-days: {double_booked}"))
+            else:
+                self.stdout.write(self.style.SUCCESS("double-booked car-days: 0"))
+        finally:
+            if not options["keep"]:
+                Car.objects.filter(id__in=[car.id for car in cars]).delete()
+                user.delete()
+                rebuild_dashboard_counters()
+
+    def _count_double_booked_days(self, cars):
+        double_booked = 0
+        for car in cars:
+            booked_days = {}
+            bookings = Booking.objects.filter(
+                car=car,
+                status__in=BOOKING_BLOCKING_STATUSES,
+            ).values_list("start_date", "end_date")
+            for start_date, end_date in bookings:
+                day = start_date
+                while day <= end_date:
+                    booked_days[day] = booked_days.get(day, 0) + 1
+                    day += timedelta(days=1)
+            double_booked += sum(count - 1 for count in booked_days.values() if count > 1)
+        return double_booked
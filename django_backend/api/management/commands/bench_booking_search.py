@@ -0,0 +1,169 @@
+import random
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from api.models import Booking, Car, User
+from api.search import booking_search_text
+from api.views import _apply_booking_search
+
+
+WORDS = [
+    "somchai", "suda", "niran", "malee", "anan", "kanya", "preecha", "wipa",
+    "camry", "civic", "fortuner", "yaris", "hilux", "almera", "mazda", "pajero",
+]
+
+
+def _legacy_search(queryset, query):
+    conditions = (
+        Q(user__fullName__icontains=query)
+        | Q(user__username__icontains=query)
+        | Q(user__phoneNumber__icontains=query)
+        | Q(car__name__icontains=query)
+        | Q(contact_number__icontains=query)
+    )
+    if query.isdigit():
+        conditions |= Q(id=int(query))
+    return queryset.filter(conditions)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed throwaway bookings and compare admin order/history search using the old "
+        "joined icontains filters against the trigram-indexed search_text column."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bookings", type=int, default=200000)
+        parser.add_argument("--users", type=int, default=5000)
+        parser.add_argument("--cars", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded users, cars and bookings")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        tag = f"bench-{uuid.uuid4().hex[:8]}"
+
+        self.stdout.write(f"seeding {options['bookings']} bookings ...")
+        started = time.perf_counter()
+        users, cars = self._seed(rng, tag, options)
+        self.stdout.write(f"seeded in {time.perf_counter() - started:.1f}s")
+
+        try:
+            sample_user = rng.choice(users)
+            terms = [
+                sample_user.fullName.split()[-1],
+                sample_user.phoneNumber[-6:],
+                rng.choice(cars).name[-6:],
+                rng.choice(WORDS),
+                "no-such-customer",
+            ]
+
+            base = Booking.objects.select_related("user", "car")
+            for term in terms:
+                legacy = _legacy_search(base, term)
+                indexed = _apply_booking_search(base, term)
+
+                legacy_ids = set(legacy.values_list("id", flat=True))
+                indexed_ids = set(indexed.values_list("id", flat=True))
+                match = "same rows" if legacy_ids == indexed_ids else "ROWS DIFFER"
+
+                legacy_ms = self._time_page(legacy, options["repeat"])
+                indexed_ms = self._time_page(indexed, options["repeat"])
+                self.stdout.write(
+                    f"{term!r:>22}: {len(indexed_ids):>7} hits, "
+                    f"before {legacy_ms:8.2f} ms, after {indexed_ms:8.2f} ms ({match})"
+                )
+
+            plan = _apply_booking_search(base, terms[0]).order_by("-created_at", "-id")[:50].explain()
+            self.stdout.write("plan for the indexed search:")
+            for line in plan.splitlines():
+                self.stdout.write(f"  {line}")
+        finally:
+            if not options["keep"]:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "DELETE FROM api_booking WHERE car_id = ANY(%s)",
+                        [[car.id for car in cars]],
+                    )
+                Car.objects.filter(id__in=[car.id for car in cars]).delete()
+                User.objects.filter(id__in=[user.id for user in users]).delete()
+
+    def _seed(self, rng, tag, options):
+        taken_phones = set(User.objects.values_list("phoneNumber", flat=True))
+        phones = set()
+        while len(phones) < options["users"]:
+            phone = f"07{rng.randrange(10**8):08d}"
+            if phone not in taken_phones:
+                phones.add(phone)
+
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                User(
+                    fullName=f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}{index}",
+                    phoneNumber=phone,
+                    username=f"{tag}-u{index}",
+                    password="",
+                    role="customer",
+                )
+                for index, phone in enumerate(sorted(phones))
+            )
+            # Inactive so the seeded cars never show up in the catalog or availability.
+            cars = Car.objects.bulk_create(
+                Car(
+                    name=f"{rng.choice(WORDS).title()} {tag}-{index}",
+                    price_per_day=1000,
+                    fuel_type="Petrol",
+                    fuel_consumption="10 km/L",
+                    car_type="Sedan",
+                    is_active=False,
+                )
+                for index in range(options["cars"])
+            )
+
+            first_day = date.today() - timedelta(days=365)
+            batch = []
+            for _ in range(options["bookings"]):
+                user = rng.choice(users)
+                car = rng.choice(cars)
+                start_date = first_day + timedelta(days=rng.randrange(730))
+                # Rejected bookings are outside the overlap constraint, so dates can repeat.
+                batch.append(
+                    Booking(
+                        user=user,
+                        car=car,
+                        start_date=start_date,
+                        end_date=start_date + timedelta(days=rng.randrange(5)),
+                        current_province="Bangkok",
+                        destination_province="Bangkok",
+                        pickup_type="self",
+                        contact_number=user.phoneNumber,
+                        search_text=booking_search_text(user, car, user.phoneNumber),
+                        status="rejected",
+                    )
+                )
+                if len(batch) >= 5000:
+                    Booking.objects.bulk_create(batch)
+                    batch = []
+            if batch:
+                Booking.objects.bulk_create(batch)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE api_user, api_car, api_booking")
+        return users, cars
+
+    def _time_page(self, queryset, repeat):
+        # Same shape as the admin list: newest first, one page.
+        page = queryset.order_by("-created_at", "-id")[:50]
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(page.all())
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
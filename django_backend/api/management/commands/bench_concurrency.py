@@ -0,0 +1,192 @@
+import asyncio
+import time
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from api.models import User
+
+from ._bench import add_output_argument, percentile, session_cookie, write_report
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class Command(BaseCommand):
+    help = (
+        "Open many idle notification streams (SSE) against running servers and report how "
+        "many each one accepts and how fast it still answers availability requests "
+        "meanwhile. Start the same app under WSGI and ASGI and pass both URLs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "targets",
+            nargs="+",
+            help="label=http://host:port, e.g. wsgi=http://127.0.0.1:8001 asgi=http://127.0.0.1:8002",
+        )
+        parser.add_argument("--connections", type=int, default=1000, help="Idle streams to open per target")
+        parser.add_argument("--ramp", type=int, default=100, help="Streams opened at once while ramping up")
+        parser.add_argument("--connect-timeout", type=float, default=10.0, help="Seconds to wait for a stream's first byte")
+        parser.add_argument("--probes", type=int, default=50, help="Availability requests sent while the streams are open")
+        parser.add_argument("--probe-timeout", type=float, default=10.0)
+        add_output_argument(parser)
+
+    def handle(self, *args, **options):
+        targets = []
+        for target in options["targets"]:
+            label, sep, url = target.partition("=")
+            parts = urlsplit(url)
+            if not sep or parts.scheme != "http" or not parts.hostname:
+                raise CommandError(f"Expected label=http://host:port, got {target!r}")
+            targets.append((label, parts.hostname, parts.port or 80))
+
+        customer = User.objects.filter(role="customer").order_by("id").first()
+        if customer is None:
+            raise CommandError("No customer found; run `python manage.py seed_data` first")
+        _raise_open_file_limit(options["connections"] * 2 + 100)
+
+        start_date = date.today() + timedelta(days=7)
+        paths = {
+            "stream": reverse("user_notifications_stream_api"),
+            "probe": (
+                f"{reverse('booking_availability')}?start_date={start_date}"
+                f"&end_date={start_date + timedelta(days=2)}"
+            ),
+        }
+        cookie = session_cookie(customer)
+
+        results = []
+        for label, host, port in targets:
+            result = asyncio.run(_run_target(host, port, paths, cookie, options))
+            result = {"target": label, "url": f"http://{host}:{port}", **result}
+            results.append(result)
+            self.stderr.write(_one_line(result))
+
+        write_report(self, {"connections": options["connections"], "targets": results}, options["output"])
+
+
+def _raise_open_file_limit(wanted):
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < wanted:
+        limit = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+
+
+def _request_bytes(host, path, cookie, keep_alive):
+    return (
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\nCookie: {cookie}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    ).encode("ascii")
+
+
+async def _open_stream(host, port, path, cookie, timeout):
+    """(writer, seconds to the first SSE line) or (None, error) for one stream."""
+    started = time.perf_counter()
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError) as exc:
+        return None, type(exc).__name__
+
+    writer.write(_request_bytes(host, path, cookie, keep_alive=True))
+    received = b""
+    try:
+        while b"retry:" not in received:
+            chunk = await asyncio.wait_for(reader.read(4096), timeout - (time.perf_counter() - started))
+            if not chunk:
+                break
+            received += chunk
+    except (OSError, asyncio.TimeoutError, ValueError) as exc:
+        writer.close()
+        return None, type(exc).__name__
+
+    if b"retry:" not in received:
+        writer.close()
+        return None, received.split(b"\r\n", 1)[0].decode("latin-1") or "closed"
+    return writer, time.perf_counter() - started
+
+
+async def _probe(host, port, path, cookie, timeout):
+    started = time.perf_counter()
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        writer.write(_request_bytes(host, path, cookie, keep_alive=False))
+        body = await asyncio.wait_for(reader.read(), timeout)
+        writer.close()
+    except (OSError, asyncio.TimeoutError) as exc:
+        return None, type(exc).__name__
+    status = body.split(b"\r\n", 1)[0].decode("latin-1")
+    if " 200 " not in status:
+        return None, status or "closed"
+    return time.perf_counter() - started, None
+
+
+async def _run_target(host, port, paths, cookie, options):
+    timeout = options["connect_timeout"]
+    streams = []
+    first_byte = []
+    errors = {}
+
+    # Baseline latency with no streams open.
+    baseline = [await _probe(host, port, paths["probe"], cookie, options["probe_timeout"]) for _ in range(5)]
+
+    started = time.perf_counter()
+    remaining = options["connections"]
+    while remaining > 0:
+        batch = min(options["ramp"], remaining)
+        remaining -= batch
+        for writer, outcome in await asyncio.gather(
+            *[_open_stream(host, port, paths["stream"], cookie, timeout) for _ in range(batch)]
+        ):
+            if writer is None:
+                errors[outcome] = errors.get(outcome, 0) + 1
+            else:
+                streams.append(writer)
+                first_byte.append(outcome)
+    ramp_seconds = time.perf_counter() - started
+
+    # Requests sent while every accepted stream is still open and idle.
+    probe_times = []
+    probe_errors = {}
+    for _ in range(options["probes"]):
+        elapsed, error = await _probe(host, port, paths["probe"], cookie, options["probe_timeout"])
+        if error:
+            probe_errors[error] = probe_errors.get(error, 0) + 1
+        else:
+            probe_times.append(elapsed)
+
+    for writer in streams:
+        writer.close()
+
+    return {
+        "streams_open": len(streams),
+        "stream_errors": errors,
+        "ramp_seconds": round(ramp_seconds, 2),
+        "first_byte_p50_ms": _ms(first_byte, 50),
+        "first_byte_p95_ms": _ms(first_byte, 95),
+        "baseline_probe_p50_ms": _ms([elapsed for elapsed, _ in baseline if elapsed is not None], 50),
+        "probe_ok": len(probe_times),
+        "probe_errors": probe_errors,
+        "probe_p50_ms": _ms(probe_times, 50),
+        "probe_p95_ms": _ms(probe_times, 95),
+    }
+
+
+def _ms(values, percent):
+    # Seconds in, milliseconds out; None when nothing succeeded.
+    return round(percentile(values, percent) * 1000, 2) if values else None
+
+
+def _one_line(result):
+    return (
+        f"{result['target']:<8} streams {result['streams_open']:>6} open "
+        f"(errors {sum(result['stream_errors'].values())})  "
+        f"probe p50 {result['probe_p50_ms']} ms  p95 {result['probe_p95_ms']} ms  "
+        f"ok {result['probe_ok']}/{result['probe_ok'] + sum(result['probe_errors'].values())}"
+    )
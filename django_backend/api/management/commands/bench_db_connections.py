@@ -0,0 +1,177 @@
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.urls import reverse
+
+from api.db_pool import connection_stats
+from api.models import User
+
+from ._bench import add_output_argument, percentile, session_cookie, write_report
+
+
+DEFAULT_MODES = "per_request,persistent,pool"
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the customer APIs through the real WSGI request cycle under each "
+        "DB_CONNECTION_MODE (one subprocess per mode) and report latency and how many "
+        "database connections were opened."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modes", default=DEFAULT_MODES, help="Comma-separated DB_CONNECTION_MODE values")
+        parser.add_argument("--threads", type=int, default=8, help="Concurrent request threads")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per thread")
+        add_output_argument(parser)
+        parser.add_argument("--worker", action="store_true", help="Internal: run one mode in this process")
+
+    def handle(self, *args, **options):
+        if options["worker"]:
+            self.stdout.write(json.dumps(_run_worker(options["threads"], options["requests"])))
+            return
+
+        results = []
+        for mode in [mode.strip() for mode in options["modes"].split(",") if mode.strip()]:
+            # Settings are read once per process, so each mode gets a fresh interpreter.
+            completed = subprocess.run(
+                [
+                    sys.executable,
+                    sys.argv[0],
+                    "bench_db_connections",
+                    "--worker",
+                    "--threads",
+                    str(options["threads"]),
+                    "--requests",
+                    str(options["requests"]),
+                ],
+                env={**os.environ, "DB_CONNECTION_MODE": mode},
+                capture_output=True,
+                text=True,
+            )
+            if completed.returncode != 0:
+                raise CommandError(f"{mode} run failed:\n{completed.stderr}")
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            results.append(result)
+            self.stderr.write(_one_line(result))
+
+        write_report(
+            self,
+            {"threads": options["threads"], "requests": options["requests"], "modes": results},
+            options["output"],
+        )
+
+
+def _session_cookie():
+    customer = User.objects.filter(role="customer").order_by("id").first()
+    if customer is None:
+        raise CommandError("No customer found; run `python manage.py seed_data` first")
+    cookie = session_cookie(customer)
+    connections.close_all()
+    return cookie
+
+
+def _run_worker(thread_count, request_count):
+    start_date = date.today() + timedelta(days=7)
+    paths = [
+        (reverse("user_notifications_api"), ""),
+        (
+            reverse("booking_availability"),
+            f"start_date={start_date}&end_date={start_date + timedelta(days=2)}",
+        ),
+    ]
+    cookie = _session_cookie()
+    handler = WSGIHandler()
+
+    opened = []
+    connection_created.connect(lambda sender, connection, **kwargs: opened.append(1), weak=False)
+
+    def request(path, query):
+        # The full WSGI cycle: request_started/request_finished close or recycle connections.
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": "testserver",
+            "SERVER_PORT": "80",
+            "HTTP_HOST": "testserver",
+            "HTTP_COOKIE": cookie,
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(b""),
+            "wsgi.errors": sys.stderr,
+        }
+        statuses = []
+        response = handler(environ, lambda status, headers: statuses.append(status))
+        try:
+            for _ in response:
+                pass
+        finally:
+            response.close()
+        return statuses[0]
+
+    for path, query in paths:
+        request(path, query)
+    opened.clear()
+    if connections["default"].pool is not None:
+        connections["default"].pool.pop_stats()
+
+    timings = []
+    errors = []
+    lock = threading.Lock()
+
+    def run():
+        mine = []
+        for number in range(request_count):
+            path, query = paths[number % len(paths)]
+            started = time.perf_counter()
+            status = request(path, query)
+            mine.append((time.perf_counter() - started) * 1000)
+            if not status.startswith("200"):
+                with lock:
+                    errors.append(status)
+        connections.close_all()
+        with lock:
+            timings.extend(mine)
+
+    threads = [threading.Thread(target=run) for _ in range(thread_count)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    stats = connection_stats()
+    pool = stats["pool"]
+    return {
+        "mode": stats["mode"],
+        "requests": len(timings),
+        "errors": len(errors),
+        "requests_per_second": round(len(timings) / elapsed, 1),
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        # Django signals every checkout from a pool too, so pools report their own count.
+        "connections_opened": pool["connections_opened"] if pool else len(opened),
+        "pool": pool,
+    }
+
+
+def _one_line(result):
+    return (
+        f"{result['mode']:<12} {result['requests_per_second']:>8} req/s  p50 {result['p50_ms']:7.2f} ms  "
+        f"p95 {result['p95_ms']:7.2f} ms  connections opened {result['connections_opened']:>6}  "
+        f"errors {result['errors']}"
+    )
@@ -0,0 +1,283 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+
+from api import urls as api_urls
+from api.availability import availability_index
+from api.models import Booking, Car, CarImage, Notification, User
+
+from ._bench import add_output_argument, logged_in_client, percentile, write_report
+
+
+# How each route in api/urls.py is driven: (who, method, body kind, mutates).
+# Routes missing here are benchmarked as a customer GET, so new URLs are never silently skipped.
+ROUTES = {
+    "index": ("anonymous", "GET", None, False),
+    "login": ("anonymous", "GET", None, False),
+    "signup": ("anonymous", "GET", None, False),
+    "public_cars_api": ("anonymous", "GET", None, False),
+    "admin": ("admin", "GET", None, False),
+    "model": ("admin", "GET", None, False),
+    "admin_dashboard_api": ("admin", "GET", None, False),
+    "admin_db_pool_api": ("admin", "GET", None, False),
+    "admin_reports_api": ("admin", "GET", None, False),
+    "admin_occupancy_api": ("admin", "GET", None, False),
+    "admin_users_api": ("admin", "GET", None, False),
+    "admin_user_detail_api": ("admin", "GET", None, False),
+    "admin_admins_api": ("admin", "GET", None, False),
+    "admin_admin_detail_api": ("admin", "GET", None, False),
+    "admin_cars_api": ("admin", "GET", None, False),
+    "admin_car_detail_api": ("admin", "GET", None, False),
+    "admin_orders_api": ("admin", "GET", None, False),
+    "admin_history_api": ("admin", "GET", None, False),
+    "admin_history_export_api": ("admin", "GET", "download", False),
+    "admin_car_images_api": ("admin", "POST", "image", True),
+    "admin_car_image_detail_api": ("admin", "PATCH", "caption", True),
+    "admin_order_stage_approve_api": ("admin", "POST", None, True),
+    "admin_order_cancel_api": ("admin", "POST", None, True),
+    "admin_orders_batch_approve_stage_api": ("admin", "POST", "order_ids", True),
+    "admin_orders_batch_cancel_api": ("admin", "POST", "order_ids", True),
+    "approve_booking": ("admin", "GET", None, True),
+    "reject_booking": ("admin", "GET", None, True),
+    "user_notifications_api": ("customer", "GET", None, False),
+    "user_notifications_mark_read_api": ("customer", "POST", "notification_ids", True),
+    "booking_availability": ("customer", "GET", "date_range", False),
+    "booking_next_available": ("customer", "GET", "window_length", False),
+    "booking": ("customer", "GET", None, False),
+    "order": ("customer", "GET", None, False),
+    "history": ("customer", "GET", None, False),
+    "profile": ("customer", "GET", None, False),
+    "advance_order_stage": ("customer", "POST", None, True),
+    "cancel_order": ("customer", "POST", None, True),
+}
+
+# Never driven: they stream forever, need a real file upload, or change the
+# benchmark user's own credentials/session.
+SKIPPED = {
+    "user_notifications_stream_api": "streams until the client disconnects",
+    "admin_car_image_upload_api": "needs a multipart image upload",
+    "admin_cars_import_api": "needs a multipart CSV/XLSX upload",
+    "profile_update_phone": "changes the benchmark user's phone number",
+    "profile_change_password": "changes the benchmark user's password",
+    "logout": "ends the benchmark session",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every URL in api/urls.py with the Django test client and report "
+        "p50/p95/p99 latency and SQL query counts as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="Measured requests per endpoint")
+        parser.add_argument("--warmup", type=int, default=3, help="Unmeasured requests per endpoint first")
+        parser.add_argument("--include-writes", action="store_true", help="Also drive mutating endpoints (rolled back)")
+        parser.add_argument("--only", default="", help="Comma-separated route names to run")
+        add_output_argument(parser)
+
+    def handle(self, *args, **options):
+        only = {name.strip() for name in options["only"].split(",") if name.strip()}
+        fixtures = self._fixtures()
+        clients = self._clients(fixtures)
+
+        results = []
+        for pattern in api_urls.urlpatterns:
+            if not isinstance(pattern, URLPattern) or not pattern.name:
+                continue
+            name = pattern.name
+            if only and name not in only:
+                continue
+
+            who, method, body, mutates = ROUTES.get(name, ("customer", "GET", None, False))
+            if name in SKIPPED:
+                results.append({"name": name, "skipped": SKIPPED[name]})
+                continue
+            if mutates and not options["include_writes"]:
+                results.append({"name": name, "skipped": "mutating endpoint (use --include-writes)"})
+                continue
+
+            url = reverse(name, kwargs=self._kwargs(pattern, fixtures))
+            request = self._request(clients[who], method, url, body, fixtures)
+            results.append(
+                self._measure(name, method, url, request, mutates, options["requests"], options["warmup"])
+            )
+            self.stderr.write(_one_line(results[-1]))
+
+        if options["include_writes"]:
+            # Rolled-back writes may still have touched this process's in-memory index.
+            availability_index.invalidate()
+
+        report = {
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "session_engine": settings.SESSION_ENGINE,
+            "requests_per_endpoint": options["requests"],
+            "dataset": {
+                "users": User.objects.count(),
+                "cars": Car.objects.count(),
+                "car_images": CarImage.objects.count(),
+                "bookings": Booking.objects.count(),
+                "notifications": Notification.objects.count(),
+            },
+            "endpoints": results,
+        }
+        write_report(self, report, options["output"])
+
+    def _fixtures(self):
+        # The customer with the most open bookings exercises the heaviest customer pages.
+        booking = (
+            Booking.objects.exclude(status="rejected")
+            .exclude(order_stage="completed")
+            .order_by("-created_at")
+            .select_related("user")
+            .first()
+        ) or Booking.objects.select_related("user").order_by("-id").first()
+        if booking is None:
+            raise CommandError("No bookings found; run `python manage.py seed_data` first")
+
+        admin = User.objects.filter(role="admin").order_by("id").first()
+        if admin is None:
+            raise CommandError("No admin user found; create one before benchmarking")
+
+        image = CarImage.objects.order_by("id").first()
+        notification_ids = list(
+            Notification.objects.filter(user_id=booking.user_id).values_list("id", flat=True)[:20]
+        )
+        # A typical batch an admin ticks through: the 50 newest open orders.
+        order_ids = list(
+            Booking.objects.exclude(status="rejected")
+            .exclude(order_stage="completed")
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)[:50]
+        )
+        return {
+            "booking": booking,
+            "customer": booking.user,
+            "admin": admin,
+            "car_id": booking.car_id,
+            "image": image,
+            "notification_ids": notification_ids,
+            "order_ids": order_ids,
+        }
+
+    def _clients(self, fixtures):
+        return {
+            "anonymous": Client(),
+            "customer": logged_in_client(fixtures["customer"]),
+            "admin": logged_in_client(fixtures["admin"]),
+        }
+
+    def _kwargs(self, pattern, fixtures):
+        values = {
+            "booking_id": fixtures["booking"].id,
+            "car_id": fixtures["image"].car_id if fixtures["image"] else fixtures["car_id"],
+            "user_id": fixtures["customer"].id,
+            "image_id": fixtures["image"].id if fixtures["image"] else 0,
+        }
+        if pattern.name == "admin_admin_detail_api":
+            values["user_id"] = fixtures["admin"].id
+        return {name: values[name] for name in pattern.pattern.converters}
+
+    def _request(self, client, method, url, body, fixtures):
+        if body == "date_range":
+            start_date = date.today() + timedelta(days=7)
+            params = {"start_date": start_date.isoformat(), "end_date": (start_date + timedelta(days=2)).isoformat()}
+            return lambda: client.get(url, params)
+        if body == "window_length":
+            return lambda: client.get(url, {"days": 3, "limit": 3})
+        if body == "notification_ids":
+            payload = json.dumps({"ids": fixtures["notification_ids"]})
+            return lambda: client.post(url, payload, content_type="application/json")
+        if body == "order_ids":
+            payload = json.dumps({"ids": fixtures["order_ids"]})
+            return lambda: client.post(url, payload, content_type="application/json")
+        if body == "image":
+            payload = json.dumps({"image_url": "/static/Image/GR86.jpg", "caption": "bench"})
+            return lambda: client.post(url, payload, content_type="application/json")
+        if body == "caption":
+            return lambda: client.patch(url, json.dumps({"caption": "bench"}), content_type="application/json")
+        if body == "download":
+            return lambda: _download(client, url)
+        return lambda: getattr(client, method.lower())(url)
+
+    def _measure(self, name, method, url, request, mutates, repeat, warmup):
+        def run():
+            if not mutates:
+                return request()
+            # Every write is undone so the dataset stays the same between runs.
+            with transaction.atomic():
+                response = request()
+                transaction.set_rollback(True)
+            return response
+
+        for _ in range(warmup):
+            run()
+
+        timings = []
+        queries = []
+        statuses = {}
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = run()
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(captured.captured_queries))
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+        return {
+            "name": name,
+            "method": method,
+            "url": url,
+            "requests": repeat,
+            "status_codes": statuses,
+            "p50_ms": round(percentile(timings, 50), 3),
+            "p95_ms": round(percentile(timings, 95), 3),
+            "p99_ms": round(percentile(timings, 99), 3),
+            "mean_ms": round(statistics.fmean(timings), 3),
+            "queries_mean": round(statistics.fmean(queries), 2),
+            "queries_max": max(queries),
+        }
+
+
+def _download(client, url):
+    # A streamed body is only produced while it is read, so time the whole download.
+    response = client.get(url)
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+        response.close()
+    return response
+
+
+def _one_line(result):
+    if "skipped" in result:
+        return f"{result['name']:<34} skipped: {result['skipped']}"
+    return (
+        f"{result['name']:<34} p50 {result['p50_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f} ms  "
+        f"p99 {result['p99_ms']:8.2f} ms  queries {result['queries_mean']:6.2f}  {result['status_codes']}"
+    )
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,145 @@
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.http import JsonResponse
+from django.utils import timezone
+
+from api.json_response import dumps, orjson
+from api.models import Booking, Car, User
+from api.views import BOOKING_ROW_FIELDS, _booking_rows, _serialize_booking
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed throwaway bookings (rolled back afterwards) and compare the CPU cost of "
+        "serializing them for the admin order list: model instances + _serialize_booking + "
+        "JsonResponse against .values() rows + _booking_rows + json_response."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bookings", type=int, default=10000)
+        parser.add_argument("--users", type=int, default=500)
+        parser.add_argument("--cars", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=7)
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                ids = self._seed(random.Random(options["seed"]), options)
+                self._compare(ids, options["repeat"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _compare(self, ids, repeat):
+        models = Booking.objects.select_related("user", "car").filter(id__in=ids).order_by("-created_at", "-id")
+        values = Booking.objects.filter(id__in=ids).order_by("-created_at", "-id").values(*BOOKING_ROW_FIELDS)
+
+        before_rows = list(models)
+        after_rows = list(values)
+        before_data = [_serialize_booking(booking) for booking in before_rows]
+        after_data = _booking_rows(after_rows)
+        match = "same JSON" if json.loads(json.dumps(before_data)) == after_data else "JSON DIFFERS"
+
+        # CPU seconds of this process only, so Postgres' own work is left out.
+        phases = [
+            ("load rows", lambda: list(models.all()), lambda: list(values.all())),
+            (
+                "serialize",
+                lambda: [_serialize_booking(booking) for booking in before_rows],
+                lambda: _booking_rows(after_rows),
+            ),
+            (
+                "encode",
+                lambda: JsonResponse({"success": True, "data": before_data}).content,
+                lambda: dumps({"success": True, "data": after_data}),
+            ),
+        ]
+
+        self.stdout.write(
+            f"{len(ids)} bookings, median of {repeat} runs, CPU ms "
+            f"(encoder: {'orjson' if orjson is not None else 'json'}, {match})"
+        )
+        self.stdout.write(f"{'phase':<10} {'before':>10} {'after':>10} {'saved':>8}")
+        before_total = after_total = 0.0
+        for name, before, after in phases:
+            before_ms = _cpu_ms(before, repeat)
+            after_ms = _cpu_ms(after, repeat)
+            before_total += before_ms
+            after_total += after_ms
+            self.stdout.write(f"{name:<10} {before_ms:>10.1f} {after_ms:>10.1f} {_saved(before_ms, after_ms):>8}")
+        self.stdout.write(
+            f"{'total':<10} {before_total:>10.1f} {after_total:>10.1f} {_saved(before_total, after_total):>8}"
+        )
+
+    def _seed(self, rng, options):
+        tag = f"bench-{rng.randrange(16**8):08x}"
+        taken_phones = set(User.objects.values_list("phoneNumber", flat=True))
+        phones = set()
+        while len(phones) < options["users"]:
+            phone = f"07{rng.randrange(10**8):08d}"
+            if phone not in taken_phones:
+                phones.add(phone)
+
+        users = User.objects.bulk_create(
+            User(fullName=f"Customer {index}", phoneNumber=phone, username=f"{tag}-u{index}", password="")
+            for index, phone in enumerate(sorted(phones))
+        )
+        cars = Car.objects.bulk_create(
+            Car(name=f"Car {tag}-{index}", price_per_day=1000, car_type="Sedan", is_active=False)
+            for index in range(options["cars"])
+        )
+
+        stages = [stage for stage, _ in Booking.ORDER_STAGE_CHOICES]
+        now = timezone.now()
+        first_day = date.today() - timedelta(days=365)
+        bookings = []
+        for _ in range(options["bookings"]):
+            user = rng.choice(users)
+            start_date = first_day + timedelta(days=rng.randrange(730))
+            # Rejected bookings are outside the overlap constraint, so dates can repeat.
+            bookings.append(
+                Booking(
+                    user=user,
+                    car=rng.choice(cars),
+                    start_date=start_date,
+                    end_date=start_date + timedelta(days=rng.randrange(5)),
+                    current_province="Bangkok",
+                    destination_province="Chiang Mai",
+                    pickup_type="delivery",
+                    delivery_lat=13.7 + rng.random(),
+                    delivery_lng=100.5 + rng.random(),
+                    delivery_address="99 Sukhumvit Road",
+                    contact_number=user.phoneNumber,
+                    status="rejected",
+                    order_stage=rng.choice(stages),
+                    total_price=rng.randrange(1000, 20000),
+                    completed_at=now - timedelta(minutes=rng.randrange(10**6)),
+                )
+            )
+        return [booking.id for booking in Booking.objects.bulk_create(bookings, batch_size=5000)]
+
+
+def _cpu_ms(run, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.process_time()
+        run()
+        timings.append((time.process_time() - started) * 1000)
+    return statistics.median(timings)
+
+
+def _saved(before_ms, after_ms):
+    if not before_ms:
+        return "-"
+    return f"{(1 - after_ms / before_ms) * 100:.0f}%"
@@ -0,0 +1,90 @@
+import time
+import uuid
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.models import User
+from api.views import _hash_password_sha256
+
+
+SESSION_ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Log a throwaway customer in under each session mode and report the average "
+        "SQL queries and latency per request for the customer pages and APIs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="Requests per endpoint and mode")
+        parser.add_argument(
+            "--modes",
+            default=",".join(SESSION_ENGINES),
+            help="Comma-separated session modes to compare",
+        )
+
+    def handle(self, *args, **options):
+        tag = f"bench-{uuid.uuid4().hex[:8]}"
+        password = uuid.uuid4().hex
+        user = User.objects.create(
+            fullName=tag,
+            phoneNumber=f"06{uuid.uuid4().int % 10**8:08d}",
+            username=tag,
+            password=_hash_password_sha256(password),
+            role="customer",
+        )
+
+        start_date = date.today() + timedelta(days=7)
+        endpoints = [
+            ("notifications poll", "/api/notifications/"),
+            (
+                "availability",
+                f"/api/booking/availability/?start_date={start_date}&end_date={start_date + timedelta(days=2)}",
+            ),
+            ("profile page", "/api/profile/"),
+            ("history page", "/api/history/"),
+        ]
+
+        try:
+            modes = [mode.strip() for mode in options["modes"].split(",") if mode.strip()]
+            self.stdout.write(f"{'endpoint':<20}" + "".join(f"{mode:>26}" for mode in modes))
+
+            results = {mode: self._measure(mode, user, password, endpoints, options["requests"]) for mode in modes}
+            for label, _ in endpoints:
+                row = "".join(
+                    f"{results[mode][label][0]:>9.2f} queries {results[mode][label][1]:>6.2f} ms"
+                    for mode in modes
+                )
+                self.stdout.write(f"{label:<20}{row}")
+        finally:
+            user.delete()
+
+    def _measure(self, mode, user, password, endpoints, repeat):
+        with override_settings(SESSION_ENGINE=SESSION_ENGINES[mode]):
+            client = Client()
+            response = client.post("/api/login/", {"username": user.username, "password": password})
+            if response.status_code != 302:
+                raise RuntimeError(f"Login failed under {mode} sessions")
+
+            results = {}
+            for label, url in endpoints:
+                # Warm up caches (session, availability index) before measuring.
+                client.get(url)
+                queries = 0
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    with CaptureQueriesContext(connection) as captured:
+                        client.get(url)
+                    queries += len(captured.captured_queries)
+                elapsed = time.perf_counter() - started
+                results[label] = (queries / repeat, elapsed * 1000 / repeat)
+            return results
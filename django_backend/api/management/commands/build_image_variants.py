@@ -0,0 +1,52 @@
+import os
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from api.image_pipeline import image_variant_pipeline, local_image_path
+from api.models import CarImage
+
+
+class Command(BaseCommand):
+    help = (
+        "Render thumbnail/card/full WebP and JPEG variants for car images that do not "
+        "have them yet, including the bundled /static/Image originals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Re-render images that already have variants")
+
+    def handle(self, *args, **options):
+        images = CarImage.objects.order_by("id")
+        if not options["all"]:
+            images = images.filter(variants={})
+
+        jobs = []
+        skipped = 0
+        for image in images:
+            source_path = local_image_path(image.image_url)
+            if source_path is None:
+                skipped += 1
+            else:
+                jobs.append((image.id, image_variant_pipeline.submit(image.id, image.image_url, source_path)))
+
+        rendered = sum(1 for _, job in jobs if job.result())
+        failed = len(jobs) - rendered
+
+        original_bytes = 0
+        card_bytes = 0
+        for image in CarImage.objects.filter(id__in=[image_id for image_id, _ in jobs]):
+            source_path = local_image_path(image.image_url)
+            webp = image.variants.get("webp") or []
+            if source_path and webp:
+                original_bytes += os.path.getsize(source_path)
+                # The card size (or the largest one, for small originals) is what catalog pages show.
+                card_path, _ = webp[1] if len(webp) > 1 else webp[-1]
+                card_bytes += default_storage.size(card_path)
+
+        self.stdout.write(f"rendered: {rendered}, failed: {failed}, skipped (remote or missing file): {skipped}")
+        if original_bytes:
+            self.stdout.write(
+                f"originals {original_bytes / 1024:.0f} KiB -> card WebP {card_bytes / 1024:.0f} KiB "
+                f"({100 * card_bytes / original_bytes:.0f}%)"
+            )
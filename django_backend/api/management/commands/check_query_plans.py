@@ -0,0 +1,139 @@
+import json
+import uuid
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from api.availability import blocking_bookings
+from api.models import Booking, Car
+from api.pagination import decode_cursor, keyset_page, keyset_queryset
+from api.seeding import seed_dataset
+from api.views import (
+    _apply_booking_search,
+    _closed_orders,
+    _customer_history,
+    _customer_orders,
+    _open_orders,
+    _visible_notifications,
+)
+
+
+# Tables that grow without bound; a sequential scan on them is a regression.
+WATCHED_TABLES = {"api_booking", "api_notification"}
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the hot querysets from api.views against a seeded database and fail "
+        "when any of them falls back to a sequential scan on bookings or notifications."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=2000)
+        parser.add_argument("--cars", type=int, default=60)
+        parser.add_argument("--bookings", type=int, default=60000)
+        parser.add_argument("--notifications", type=int, default=60000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--existing",
+            action="store_true",
+            help="Check the current data instead of seeding (and rolling back) a synthetic dataset",
+        )
+        parser.add_argument("--skip", default="", help="Comma-separated check names to skip")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan in full")
+
+    def handle(self, *args, **options):
+        skip = {name.strip() for name in options["skip"].split(",") if name.strip()}
+        failures = []
+
+        with transaction.atomic():
+            if not options["existing"]:
+                self.stdout.write(f"seeding {options['bookings']} bookings / {options['notifications']} notifications ...")
+                seed_dataset(
+                    users=options["users"],
+                    cars=options["cars"],
+                    bookings=options["bookings"],
+                    notifications=options["notifications"],
+                    seed=options["seed"],
+                    tag=f"plan-{uuid.uuid4().hex[:8]}",
+                )
+
+            for name, queryset in self._hot_querysets():
+                if name in skip:
+                    self.stdout.write(f"skip  {name}")
+                    continue
+
+                plan = self._explain(queryset)
+                scans = sorted(
+                    {node["Relation Name"] for node in _plan_nodes(plan) if node["Node Type"] == "Seq Scan"}
+                    & WATCHED_TABLES
+                )
+                summary = _summarize(plan)
+                if scans:
+                    failures.append(name)
+                    self.stdout.write(self.style.ERROR(f"FAIL  {name}: seq scan on {', '.join(scans)}"))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"ok    {name}") + f"  {summary}")
+                if scans or options["verbose_plans"]:
+                    self.stdout.write(json.dumps(plan, indent=2))
+
+            # Never keep the synthetic rows.
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"{len(failures)} hot queries fall back to sequential scans: {', '.join(failures)}")
+
+    def _hot_querysets(self):
+        sample = Booking.objects.order_by("-id").values_list("user_id", "car_id").first()
+        if sample is None:
+            raise CommandError("No bookings to explain against; drop --existing or seed data first")
+        user_id, car_id = sample
+        search_term = Booking.objects.filter(user_id=user_id).values_list("search_text", flat=True).first()
+        search_term = search_term.split("\n")[0][:8]
+
+        _, orders_cursor = keyset_page(_open_orders(), None, 50, field="created_at")
+        _, history_cursor = keyset_page(_closed_orders(), None, 50, field="completed_at")
+        car_ids = list(Car.objects.filter(is_active=True).values_list("id", flat=True))
+        last_notification_id = _visible_notifications(user_id).values_list("id", flat=True).first() or 0
+
+        return [
+            ("admin_orders", keyset_queryset(_open_orders(), None, 50, "created_at")),
+            ("admin_orders_next_page", keyset_queryset(_open_orders(), decode_cursor(orders_cursor), 50, "created_at")),
+            ("admin_orders_by_status", keyset_queryset(_open_orders().filter(status="pending"), None, 50, "created_at")),
+            ("admin_orders_search", keyset_queryset(_apply_booking_search(_open_orders(), search_term), None, 50, "created_at")),
+            ("admin_history", keyset_queryset(_closed_orders(), None, 50, "completed_at")),
+            ("admin_history_next_page", keyset_queryset(_closed_orders(), decode_cursor(history_cursor), 50, "completed_at")),
+            ("customer_orders", _customer_orders(user_id)),
+            ("customer_history", _customer_history(user_id)),
+            ("customer_has_bookings", Booking.objects.filter(user_id=user_id)[:1]),
+            ("car_has_bookings", Booking.objects.filter(car_id=car_id)[:1]),
+            ("availability_rebuild", blocking_bookings(date.today(), car_ids)),
+            ("notifications_list", _visible_notifications(user_id)[:20]),
+            ("notifications_unread", _visible_notifications(user_id).filter(is_read=False)),
+            ("notifications_stream", _visible_notifications(user_id).filter(id__gt=last_notification_id).order_by("id")[:50]),
+        ]
+
+    def _explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            result = cursor.fetchone()[0]
+        if isinstance(result, str):
+            result = json.loads(result)
+        return result[0]["Plan"]
+
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _summarize(plan):
+    scans = [
+        f"{node['Node Type']} {node.get('Index Name') or node.get('Relation Name')}"
+        for node in _plan_nodes(plan)
+        if "Relation Name" in node or "Index Name" in node
+    ]
+    return "; ".join(scans)
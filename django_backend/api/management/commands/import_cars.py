@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.car_import import IMPORT_BATCH_SIZE, CarImportError, import_car_rows, read_car_rows
+from api.views import _car_fields_from_payload
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-import cars from a .csv or .xlsx file (columns: name, price_per_day, fuel_type, "
+        "fuel_consumption, car_type, seat_capacity, engine_cc, horsepower, is_active, images)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Validate every row without writing anything")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options["path"], "rb") as fileobj:
+                result = import_car_rows(
+                    read_car_rows(fileobj, options["path"]),
+                    _car_fields_from_payload,
+                    batch_size=max(1, options["batch_size"]),
+                    dry_run=options["dry_run"],
+                    error_limit=None,
+                )
+        except (OSError, CarImportError) as exc:
+            raise CommandError(str(exc))
+
+        for error in result["errors"]:
+            self.stderr.write(f"row {error['row'] or '?'}: {error['message']}")
+        self.stdout.write(
+            f"{result['rows']} rows, {result['valid']} valid, {result['error_count']} errors; "
+            f"created {result['created']} cars and {result['images']} images "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
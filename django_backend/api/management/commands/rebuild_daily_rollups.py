@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.rollups import rebuild_daily_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily revenue/utilization rollups from the bookings table."
+
+    def handle(self, *args, **options):
+        rows = rebuild_daily_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Daily rollups rebuilt ({rows} car-day rows)"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from api.counters import read_dashboard_counters, rebuild_dashboard_counters
+
+
+class Command(BaseCommand):
+    help = "Recount the admin dashboard counters from the users, cars and bookings tables."
+
+    def handle(self, *args, **options):
+        previous = read_dashboard_counters()
+        current = rebuild_dashboard_counters()
+
+        for name, value in current.items():
+            drift = value - previous.get(name, 0)
+            note = f" (was {previous.get(name, 0)}, drift {drift:+d})" if drift else ""
+            self.stdout.write(f"{name}: {value}{note}")
+        self.stdout.write(self.style.SUCCESS("Dashboard counters rebuilt"))
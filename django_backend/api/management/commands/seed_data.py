@@ -0,0 +1,76 @@
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.availability import availability_index
+from api.catalog import bump_catalog_version
+from api.counters import rebuild_dashboard_counters
+from api.models import Booking, Car, Notification, User
+from api.rollups import rebuild_daily_rollups
+from api.seeding import seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-insert a synthetic dataset (customers, cars, images, bookings, notifications) "
+        "for benchmarks, or remove a previously seeded one with --purge."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--cars", type=int, default=50)
+        parser.add_argument("--images-per-car", type=int, default=3)
+        parser.add_argument("--bookings", type=int, default=20000)
+        parser.add_argument("--notifications", type=int, default=20000)
+        parser.add_argument("--seed", type=int, default=None, help="Random seed for a reproducible dataset")
+        parser.add_argument("--tag", default=None, help="Prefix for seeded usernames and car names")
+        parser.add_argument("--purge", metavar="TAG", help="Delete the rows seeded under TAG instead of seeding")
+
+    def handle(self, *args, **options):
+        if options["purge"]:
+            self._purge(options["purge"])
+        else:
+            tag = options["tag"] or f"seed-{uuid.uuid4().hex[:6]}"
+            if User.objects.filter(username__startswith=f"{tag}-").exists():
+                raise CommandError(f"Tag {tag!r} is already in use; pick another or --purge it first")
+
+            started = time.perf_counter()
+            users, cars = seed_dataset(
+                users=options["users"],
+                cars=options["cars"],
+                bookings=options["bookings"],
+                notifications=options["notifications"],
+                images_per_car=options["images_per_car"],
+                seed=options["seed"],
+                tag=tag,
+            )
+            self.stdout.write(
+                f"seeded {len(users)} users, {len(cars)} cars, {options['bookings']} bookings, "
+                f"{options['notifications']} notifications in {time.perf_counter() - started:.1f}s"
+            )
+            self.stdout.write(f"remove them with: python manage.py seed_data --purge {tag}")
+
+        # Bulk writes bypass the incremental counters, rollups and per-worker caches.
+        rebuild_dashboard_counters()
+        rebuild_daily_rollups()
+        availability_index.invalidate()
+        bump_catalog_version()
+        if not settings.SHARED_CACHE:
+            self.stdout.write(
+                "note: no shared cache (CACHE_BACKEND), so running web workers keep their cached "
+                "availability and catalog until AVAILABILITY_INDEX_MAX_AGE/CATALOG_CACHE_TIMEOUT"
+            )
+
+    def _purge(self, tag):
+        users = User.objects.filter(username__startswith=f"{tag}-")
+        cars = Car.objects.filter(name__startswith=f"{tag} ")
+        Notification.objects.filter(user__in=users).delete()
+        _, booking_counts = Booking.objects.filter(car__in=cars).delete()
+        _, car_counts = cars.delete()
+        _, user_counts = users.delete()
+        self.stdout.write(
+            f"removed {booking_counts.get('api.Booking', 0)} bookings, "
+            f"{car_counts.get('api.Car', 0)} cars, {user_counts.get('api.User', 0)} users"
+        )
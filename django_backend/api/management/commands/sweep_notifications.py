@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.notifications import sweep_closed_booking_notifications
+
+
+class Command(BaseCommand):
+    help = "Delete notifications that belong to completed or cancelled bookings, in bounded batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.NOTIFICATION_SWEEP_BATCH_SIZE)
+        parser.add_argument("--max-batches", type=int, default=None)
+
+    def handle(self, *args, **options):
+        deleted_count = sweep_closed_booking_notifications(
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted_count} notifications"))
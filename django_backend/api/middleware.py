@@ -0,0 +1,220 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .db_router import begin_request, end_request, pin_after_write, replica_aliases
+from .streaming import aiter_sync
+
+
+logger = logging.getLogger("api.sql")
+
+# Collapse "IN (%s, %s, %s)" and multi-row VALUES so batches of different sizes share a shape.
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_TABLE = re.compile(r'\bFROM\s+"?(\w+)"?', re.IGNORECASE)
+
+
+def _sql_shape(sql):
+    return _WHITESPACE.sub(" ", _PLACEHOLDER_LIST.sub("(%s...)", sql)).strip()
+
+
+def _shorten(sql, limit=200):
+    return sql if len(sql) <= limit else f"{sql[:limit]}..."
+
+
+class _QueryRecorder:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, (time.perf_counter() - started) * 1000))
+
+
+class QueryInstrumentationMiddleware:
+    """Opt-in (SQL_INSTRUMENTATION=1) per-request SQL stats.
+
+    Adds a Server-Timing header with the query count and DB time, logs one
+    JSON line per request to the "api.sql" logger, and flags SQL shapes that
+    repeat SQL_REPEATED_QUERY_THRESHOLD or more times (usually an N+1 loop).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "SQL_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slowest_count = getattr(settings, "SQL_SLOWEST_QUERIES", 3)
+        self.repeat_threshold = getattr(settings, "SQL_REPEATED_QUERY_THRESHOLD", 5)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        recorder = _QueryRecorder()
+        started = time.perf_counter()
+        wrappers = self._start(recorder)
+        try:
+            response = self.get_response(request)
+        finally:
+            self._stop(wrappers)
+
+        self._report(request, response, recorder.queries, (time.perf_counter() - started) * 1000)
+        return response
+
+    async def __acall__(self, request):
+        recorder = _QueryRecorder()
+        started = time.perf_counter()
+        # Async ORM calls run on this request's sync worker thread, whose connections these are.
+        wrappers = await sync_to_async(self._start)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(self._stop)(wrappers)
+
+        self._report(request, response, recorder.queries, (time.perf_counter() - started) * 1000)
+        return response
+
+    def _start(self, recorder):
+        wrappers = [connections[alias].execute_wrapper(recorder) for alias in connections]
+        for wrapper in wrappers:
+            wrapper.__enter__()
+        return wrappers
+
+    def _stop(self, wrappers):
+        for wrapper in reversed(wrappers):
+            wrapper.__exit__(None, None, None)
+
+    def _report(self, request, response, queries, total_ms):
+        db_ms = sum(duration for _, duration in queries)
+        shapes = Counter(_sql_shape(sql) for sql, _ in queries)
+        repeated = [
+            {"count": count, "table": _table(shape), "sql": _shorten(shape)}
+            for shape, count in shapes.most_common()
+            if count >= self.repeat_threshold
+        ]
+        slowest = [
+            {"ms": round(duration, 2), "sql": _shorten(_sql_shape(sql))}
+            for sql, duration in sorted(queries, key=lambda item: item[1], reverse=True)[: self.slowest_count]
+        ]
+
+        timings = [
+            f'db;dur={db_ms:.1f};desc="{len(queries)} queries"',
+            f"app;dur={total_ms:.1f}",
+        ]
+        if repeated:
+            timings.append(f'nplusone;desc="{repeated[0]["table"]} x{repeated[0]["count"]}"')
+        existing = response.get("Server-Timing")
+        response["Server-Timing"] = ", ".join(([existing] if existing else []) + timings)
+
+        match = getattr(request, "resolver_match", None)
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "queries": len(queries),
+            "db_ms": round(db_ms, 2),
+            "total_ms": round(total_ms, 2),
+            "slowest": slowest,
+            "repeated": repeated,
+        }
+        # Repeated shapes are worth attention even when INFO is filtered out.
+        logger.log(logging.WARNING if repeated else logging.INFO, json.dumps(record))
+
+
+def _table(shape):
+    found = _TABLE.search(shape)
+    return found.group(1) if found else "?"
+
+
+class ReplicaRoutingMiddleware:
+    """Lets PrimaryReplicaRouter send this request's reads to a replica (see api.db_router).
+
+    Sits outside SessionMiddleware so a session saved on the way out also
+    counts as a write and pins the client to the primary. Streaming bodies are
+    read after this returns, so they always come from the primary.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_aliases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        token = begin_request(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing = end_request(token)
+        return pin_after_write(routing, response)
+
+    async def __acall__(self, request):
+        token = begin_request(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing = end_request(token)
+        return pin_after_write(routing, response)
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise that also runs natively under ASGI.
+
+    WhiteNoiseMiddleware is sync-only. Under ASGI, Django would run it on its
+    single shared sync thread, which stays blocked for the whole request.
+    That would serialize every async view behind it. File bodies are streamed
+    through an async iterator, since Django would read a sync one into memory.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file, thread_sensitive=False)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            response = await sync_to_async(self.serve, thread_sensitive=False)(static_file, request)
+            if response.streaming and not response.is_async:
+                # WhiteNoise returns a sync FileResponse; read it chunk by chunk, not whole.
+                response.streaming_content = aiter_sync(iter(response.streaming_content), thread_sensitive=False)
+            return response
+        return await self.get_response(request)
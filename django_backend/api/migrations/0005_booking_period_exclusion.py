@@ -0,0 +1,95 @@
+# Generated by Django 5.2.10 on 2026-10-17 17:32
+
+import logging
+
+import api.models
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def reject_overlapping_bookings(apps, schema_editor):
+    """Clear existing double bookings so the exclusion constraint can be added.
+
+    Per car, approved bookings are kept first, then pending ones oldest first; a
+    pending booking that overlaps a kept one is rejected, as the booking form
+    would have done, and its customer is notified. Two overlapping approved
+    bookings need a person to decide, so the migration stops and lists them.
+    """
+    Booking = apps.get_model('api', 'Booking')
+    Notification = apps.get_model('api', 'Notification')
+    # 'approved' sorts before 'pending'.
+    active = Booking.objects.filter(status__in=['pending', 'approved']).order_by('car_id', 'status', 'created_at', 'id')
+
+    kept = {}
+    rejected = []
+    approved_conflicts = []
+    for booking in active.only('id', 'user_id', 'car_id', 'status', 'start_date', 'end_date').iterator():
+        clash = next(
+            (
+                other
+                for other in kept.get(booking.car_id, ())
+                if other.start_date <= booking.end_date and booking.start_date <= other.end_date
+            ),
+            None,
+        )
+        if clash is None:
+            kept.setdefault(booking.car_id, []).append(booking)
+        elif booking.status == 'approved':
+            approved_conflicts.append((clash.id, booking.id))
+        else:
+            rejected.append(booking)
+
+    if approved_conflicts:
+        pairs = ', '.join(f'#{first} and #{second}' for first, second in approved_conflicts)
+        raise RuntimeError(
+            f'Approved bookings overlap on the same car: {pairs}. Reject or move one of each pair, then migrate again.'
+        )
+
+    if rejected:
+        Booking.objects.filter(id__in=[booking.id for booking in rejected]).update(
+            status='rejected', completed_at=timezone.now()
+        )
+        # Not linked to the booking: notifications of rejected bookings are hidden from the customer.
+        Notification.objects.bulk_create(
+            Notification(
+                user_id=booking.user_id,
+                title=f'Order #{booking.id}: Cancelled',
+                message=(
+                    f'The car was already booked for {booking.start_date:%Y-%m-%d} - {booking.end_date:%Y-%m-%d}, '
+                    'so this order was cancelled. Please book other dates or another car.'
+                ),
+            )
+            for booking in rejected
+        )
+        logger.warning(
+            'Rejected %d overlapping pending booking(s): %s',
+            len(rejected),
+            ', '.join(f'#{booking.id}' for booking in rejected),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_booking_delivery_address_booking_delivery_lat_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(reject_overlapping_bookings, migrations.RunPython.noop),
+        # Needed so the plain car_id column can take part in a GiST exclusion constraint.
+        BtreeGistExtension(),
+        migrations.AddField(
+            model_name='booking',
+            name='period',
+            field=models.GeneratedField(db_persist=True, expression=api.models.DateRange('start_date', 'end_date', django.contrib.postgres.fields.ranges.RangeBoundary(inclusive_lower=True, inclusive_upper=True)), output_field=django.contrib.postgres.fields.ranges.DateRangeField()),
+        ),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('status__in', ['pending', 'approved'])), expressions=[('car', '='), ('period', '&&')], name='booking_no_overlapping_period'),
+        ),
+    ]
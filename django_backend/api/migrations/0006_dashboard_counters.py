@@ -0,0 +1,53 @@
+# Generated by Django 5.2.10 on 2026-10-17 17:37
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def seed_counters(apps, schema_editor):
+    User = apps.get_model('api', 'User')
+    Car = apps.get_model('api', 'Car')
+    Booking = apps.get_model('api', 'Booking')
+    DashboardCounters = apps.get_model('api', 'DashboardCounters')
+
+    completed = Booking.objects.filter(order_stage='completed')
+    DashboardCounters.objects.update_or_create(
+        pk=1,
+        defaults={
+            'total_users': User.objects.filter(role='customer').count(),
+            'total_admins': User.objects.filter(role='admin').count(),
+            'total_cars': Car.objects.count(),
+            'active_cars': Car.objects.filter(is_active=True).count(),
+            'total_orders': Booking.objects.count(),
+            'incoming_orders': Booking.objects.exclude(order_stage='completed').exclude(status='rejected').count(),
+            'pending_orders': Booking.objects.filter(status='pending').count(),
+            'completed_orders': completed.count(),
+            'completed_revenue': completed.aggregate(total=Sum('total_price'))['total'] or 0,
+        },
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_booking_period_exclusion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounters',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_users', models.IntegerField(default=0)),
+                ('total_admins', models.IntegerField(default=0)),
+                ('total_cars', models.IntegerField(default=0)),
+                ('active_cars', models.IntegerField(default=0)),
+                ('total_orders', models.IntegerField(default=0)),
+                ('incoming_orders', models.IntegerField(default=0)),
+                ('pending_orders', models.IntegerField(default=0)),
+                ('completed_orders', models.IntegerField(default=0)),
+                ('completed_revenue', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
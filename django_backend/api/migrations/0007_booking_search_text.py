@@ -0,0 +1,36 @@
+# Generated by Django 5.2.10 on 2026-10-17 17:41
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+BACKFILL_SEARCH_TEXT = """
+    UPDATE api_booking AS booking
+    SET search_text = lower(concat_ws(
+        chr(10), u."fullName", u.username, u."phoneNumber", car.name, booking.contact_number
+    ))
+    FROM api_user AS u, api_car AS car
+    WHERE u.id = booking.user_id AND car.id = booking.car_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_dashboard_counters'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='booking',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_SEARCH_TEXT, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='booking',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_text'], name='booking_search_text_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
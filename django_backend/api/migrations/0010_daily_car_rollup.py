@@ -0,0 +1,57 @@
+# Generated by Django 5.2.10 on 2026-10-17 18:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+BACKFILL_ROLLUPS = """
+    INSERT INTO api_dailycarrollup (day, car_id, completed_bookings, cancellations, revenue, deposits, car_days)
+    SELECT day, car_id, SUM(completed_bookings), SUM(cancellations), SUM(revenue), SUM(deposits), SUM(car_days)
+    FROM (
+        SELECT (COALESCE(completed_at, created_at) AT TIME ZONE %(tz)s)::date AS day, car_id,
+               (order_stage = 'completed')::int AS completed_bookings,
+               (order_stage <> 'completed')::int AS cancellations,
+               CASE WHEN order_stage = 'completed' THEN total_price ELSE 0 END AS revenue,
+               CASE WHEN order_stage = 'completed' THEN FLOOR(total_price * 0.30::float8)::bigint ELSE 0 END AS deposits,
+               0 AS car_days
+        FROM api_booking
+        WHERE order_stage = 'completed' OR status = 'rejected'
+        UNION ALL
+        SELECT rented.day::date, car_id, 0, 0, 0, 0, 1
+        FROM api_booking, generate_series(start_date, end_date, interval '1 day') AS rented(day)
+        WHERE order_stage = 'completed'
+    ) AS contributions
+    GROUP BY day, car_id
+"""
+
+
+def backfill_rollups(apps, schema_editor):
+    schema_editor.execute(BACKFILL_ROLLUPS, {'tz': settings.TIME_ZONE})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCarRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('completed_bookings', models.IntegerField(default=0)),
+                ('cancellations', models.IntegerField(default=0)),
+                ('revenue', models.BigIntegerField(default=0)),
+                ('deposits', models.BigIntegerField(default=0)),
+                ('car_days', models.IntegerField(default=0)),
+                ('car', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='api.car')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'car'), name='daily_car_rollup_day_car')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,19 @@
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateRangeField, RangeBoundary, RangeOperators
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models import F
+
+
+BOOKING_BLOCKING_STATUSES = ["pending", "approved"]
+# Completed or cancelled; these only show up in history.
+BOOKING_CLOSED = models.Q(order_stage="completed") | models.Q(status="rejected")
+BOOKING_OVERLAP_CONSTRAINT = "booking_no_overlapping_period"
+
+
+class DateRange(models.Func):
+    function = "DATERANGE"
+    output_field = DateRangeField()
 
 
 class User(models.Model):
@@ -36,6 +51,8 @@ class CarImage(models.Model):
     car = models.ForeignKey(Car, on_delete=models.CASCADE, related_name="images")
     image_url = models.CharField(max_length=500)
     caption = models.CharField(max_length=100, blank=True, default="")
+    # {"webp"|"jpeg": [[storage path, width], ...]} written by api.image_pipeline.
+    variants = models.JSONField(blank=True, default=dict)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -73,6 +90,55 @@ class Booking(models.Model):
     order_stage = models.CharField(max_length=30, choices=ORDER_STAGE_CHOICES, default="awaiting_contact")
     completed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    period = models.GeneratedField(
+        expression=DateRange(
+            "start_date",
+            "end_date",
+            RangeBoundary(inclusive_lower=True, inclusive_upper=True),
+        ),
+        output_field=DateRangeField(),
+        db_persist=True,
+    )
+    # Customer name/username/phone, car name and contact number, lowercased; see api.search.
+    search_text = models.TextField(blank=True, default="", editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(name="booking_search_text_trgm", fields=["search_text"], opclasses=["gin_trgm_ops"]),
+            # Admin orders: open bookings, newest first.
+            models.Index(
+                F("created_at").desc(),
+                F("id").desc(),
+                name="booking_open_created_idx",
+                condition=~models.Q(order_stage="completed") & ~models.Q(status="rejected"),
+            ),
+            # Admin history and the notification sweeper: closed bookings by completion time.
+            models.Index(
+                F("completed_at").desc(nulls_last=True),
+                F("id").desc(),
+                name="booking_closed_completed_idx",
+                condition=BOOKING_CLOSED,
+            ),
+            # Customer order and history pages.
+            models.Index(fields=["user", "-created_at"], name="booking_user_created_idx"),
+            # Availability index rebuild: blocking bookings that have not ended yet.
+            models.Index(
+                fields=["end_date", "car"],
+                name="booking_blocking_end_idx",
+                condition=models.Q(status__in=BOOKING_BLOCKING_STATUSES),
+            ),
+        ]
+        constraints = [
+            # A car cannot hold two pending/approved bookings on the same day.
+            ExclusionConstraint(
+                name=BOOKING_OVERLAP_CONSTRAINT,
+                expressions=[
+                    ("car", RangeOperators.EQUAL),
+                    ("period", RangeOperators.OVERLAPS),
+                ],
+                condition=models.Q(status__in=BOOKING_BLOCKING_STATUSES),
+            ),
+        ]
 
     @property
     def deposit(self):
@@ -99,6 +165,51 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["user", "-created_at", "-id"], name="notification_user_created_idx"),
+            models.Index(
+                fields=["user"],
+                name="notification_user_unread_idx",
+                condition=models.Q(is_read=False),
+            ),
+        ]
 
     def __str__(self):
         return f"Notification #{self.id} for {self.user.username}"
+
+
+class DashboardCounters(models.Model):
+    """Single row of admin dashboard totals, kept in step with every write."""
+
+    SINGLETON_ID = 1
+
+    total_users = models.IntegerField(default=0)
+    total_admins = models.IntegerField(default=0)
+    total_cars = models.IntegerField(default=0)
+    active_cars = models.IntegerField(default=0)
+    total_orders = models.IntegerField(default=0)
+    incoming_orders = models.IntegerField(default=0)
+    pending_orders = models.IntegerField(default=0)
+    completed_orders = models.IntegerField(default=0)
+    completed_revenue = models.BigIntegerField(default=0)
+
+
+class DailyCarRollup(models.Model):
+    """Per car and day totals for reports, kept in step with booking writes (see api.rollups).
+
+    Completions and cancellations count on the day the booking was closed;
+    car_days count on each day the car was out on a completed booking.
+    """
+
+    day = models.DateField()
+    car = models.ForeignKey(Car, on_delete=models.CASCADE, related_name="daily_rollups")
+    completed_bookings = models.IntegerField(default=0)
+    cancellations = models.IntegerField(default=0)
+    revenue = models.BigIntegerField(default=0)
+    deposits = models.BigIntegerField(default=0)
+    car_days = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "car"], name="daily_car_rollup_day_car"),
+        ]
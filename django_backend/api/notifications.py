@@ -0,0 +1,232 @@
+import asyncio
+import logging
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, connections
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from django.db.models import Q
+
+from .models import Notification
+
+
+NOTIFICATION_CHANNEL = "api_notification"
+CLOSED_BOOKING_NOTIFICATIONS = Q(booking__order_stage="completed") | Q(booking__status="rejected")
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationHub:
+    """Wakes up notification streams in this worker when a user gets a new row.
+
+    New notifications are announced with Postgres NOTIFY, so every worker hears
+    about rows created by any other worker. One listener thread per process
+    holds the LISTEN connection; idle streams just wait on a condition variable
+    (or, under ASGI, an asyncio.Event) and hold no database connection of their own.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._versions = {}
+        # Bumped when the listener reconnects: anything announced meanwhile was missed.
+        self._epoch = 0
+        self._listener = None
+        # user_id -> {(event loop, asyncio.Event)} of async streams waiting for news.
+        self._async_waiters = {}
+
+    def version(self, user_id):
+        with self._condition:
+            return self._version(user_id)
+
+    def _version(self, user_id):
+        return self._epoch, self._versions.get(user_id, 0)
+
+    def wait(self, user_id, seen_version, timeout):
+        """Block until user_id has news after seen_version; return the current version."""
+        self._ensure_listener()
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._version(user_id) == seen_version:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            return self._version(user_id)
+
+    async def await_news(self, user_id, seen_version, timeout):
+        """wait() for async streams: parks a coroutine, not a thread."""
+        self._ensure_listener()
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._condition:
+            if self._version(user_id) != seen_version:
+                return self._version(user_id)
+            self._async_waiters.setdefault(user_id, set()).add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._condition:
+                waiters = self._async_waiters.get(user_id)
+                if waiters is not None:
+                    waiters.discard(waiter)
+                    if not waiters:
+                        del self._async_waiters[user_id]
+        return self.version(user_id)
+
+    def wake(self, user_id):
+        with self._condition:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            self._condition.notify_all()
+            for loop, event in self._async_waiters.get(user_id, ()):
+                loop.call_soon_threadsafe(event.set)
+
+    def wake_all(self):
+        with self._condition:
+            self._epoch += 1
+            self._condition.notify_all()
+            for waiters in self._async_waiters.values():
+                for loop, event in waiters:
+                    loop.call_soon_threadsafe(event.set)
+
+    def _ensure_listener(self):
+        if self._listener is not None and self._listener.is_alive():
+            return
+        with self._condition:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(
+                target=self._listen_forever,
+                name="notification-listener",
+                daemon=True,
+            )
+            self._listener.start()
+
+    def _listen_forever(self):
+        backoff = 1
+        reconnecting = False
+        while True:
+            wrapper = connections.create_connection(getattr(settings, "NOTIFICATION_LISTEN_DATABASE", "default"))
+            try:
+                wrapper.ensure_connection()
+                wrapper.set_autocommit(True)
+                raw = wrapper.connection
+                with raw.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFICATION_CHANNEL}")
+                backoff = 1
+                if reconnecting:
+                    # Streams only re-read on news, so make them all catch up on the gap.
+                    self.wake_all()
+                reconnecting = True
+
+                while True:
+                    for payload in _received_payloads(raw, 30):
+                        self._dispatch(payload)
+            except Exception:
+                logger.exception("Notification listener lost its connection; reconnecting")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                wrapper.close()
+
+    def _dispatch(self, payload):
+        try:
+            user_id = int(payload)
+        except (TypeError, ValueError):
+            return
+        self.wake(user_id)
+
+
+def _received_payloads(raw, timeout):
+    """Yield NOTIFY payloads as they arrive on a LISTEN connection, for up to timeout seconds."""
+    if is_psycopg3:
+        for notify in raw.notifies(timeout=timeout):
+            yield notify.payload
+        return
+
+    if select.select([raw], [], [], timeout) == ([], [], []):
+        return
+    raw.poll()
+    while raw.notifies:
+        yield raw.notifies.pop(0).payload
+
+
+def announce_notification(user_id):
+    """Tell every worker that user_id has a new notification (sent on commit)."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_notify(%s, %s)", [NOTIFICATION_CHANNEL, str(user_id)])
+
+
+def announce_notifications(user_ids):
+    """announce_notification for several users in one statement."""
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_notify(%s, user_id::text) FROM unnest(%s::integer[]) AS user_id",
+            [NOTIFICATION_CHANNEL, user_ids],
+        )
+
+
+notification_hub = NotificationHub()
+
+
+def closed_booking_notification_ids(batch_size):
+    return (
+        Notification.objects.filter(CLOSED_BOOKING_NOTIFICATIONS)
+        .order_by()
+        .values_list("id", flat=True)[:batch_size]
+    )
+
+
+def sweep_closed_booking_notifications(batch_size=1000, max_batches=None):
+    """Delete notifications of completed/cancelled bookings in bounded chunks."""
+    total_deleted = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = list(closed_booking_notification_ids(batch_size))
+        if not ids:
+            break
+
+        deleted_count, _ = Notification.objects.filter(id__in=ids).delete()
+        total_deleted += deleted_count
+        batches += 1
+    return total_deleted
+
+
+class NotificationSweeper:
+    """Optional in-process scheduler that runs the sweep every `interval` seconds."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, interval, batch_size):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run_forever,
+                args=(interval, batch_size),
+                name="notification-sweeper",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run_forever(self, interval, batch_size):
+        while True:
+            time.sleep(interval)
+            try:
+                deleted_count = sweep_closed_booking_notifications(batch_size=batch_size)
+                if deleted_count:
+                    logger.info("Swept %s closed-booking notifications", deleted_count)
+            except Exception:
+                logger.exception("Notification sweep failed")
+            finally:
+                connections.close_all()
+
+
+notification_sweeper = NotificationSweeper()
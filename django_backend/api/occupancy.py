@@ -0,0 +1,123 @@
+import base64
+import calendar
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.backends.postgresql.psycopg_any import DateRange
+
+from .db_router import primary_reads
+from .models import BOOKING_BLOCKING_STATUSES, Booking
+
+
+OCCUPANCY_GENERATION_KEY = "api:occupancy:generation"
+OCCUPANCY_CACHE_TIMEOUT = 86400
+
+
+def _cache_timeout():
+    # A per-process cache never hears other workers' forget_car(), so keep its months short-lived.
+    if getattr(settings, "SHARED_CACHE", False):
+        return OCCUPANCY_CACHE_TIMEOUT
+    return getattr(settings, "AVAILABILITY_INDEX_MAX_AGE", 300)
+
+
+def _car_version_key(car_id):
+    return f"api:occupancy:car:{car_id}"
+
+
+def _month_key(generation, car_id, version, month_start):
+    return f"api:occupancy:{generation}:{car_id}:{version}:{month_start:%Y-%m}"
+
+
+def _generation():
+    generation = cache.get(OCCUPANCY_GENERATION_KEY)
+    if generation is None:
+        # Seed from the clock so a lost counter never reuses an old generation's entries.
+        cache.add(OCCUPANCY_GENERATION_KEY, time.time_ns() // 1_000_000, timeout=None)
+        generation = cache.get(OCCUPANCY_GENERATION_KEY, 0)
+    return generation
+
+
+def _incr(key):
+    cache.add(key, 0, timeout=None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+        return 1
+
+
+def month_end(month_start):
+    return month_start.replace(day=calendar.monthrange(month_start.year, month_start.month)[1])
+
+
+def day_bitmap(start_date, end_date, window_start, window_end):
+    """Bits for the days of [start_date, end_date] inside the window; bit 0 is window_start."""
+    first = max(start_date, window_start)
+    last = min(end_date, window_end)
+    if first > last:
+        return 0
+    return ((1 << ((last - first).days + 1)) - 1) << (first - window_start).days
+
+
+def _month_bitmaps(car_ids, month_start):
+    last_day = month_end(month_start)
+    bitmaps = dict.fromkeys(car_ids, 0)
+    # period && month is answered by the booking overlap constraint's GiST index.
+    bookings = Booking.objects.filter(
+        status__in=BOOKING_BLOCKING_STATUSES,
+        car_id__in=car_ids,
+        period__overlap=DateRange(month_start, last_day, "[]"),
+    ).values_list("car_id", "start_date", "end_date")
+    for car_id, start_date, end_date in bookings:
+        bitmaps[car_id] |= day_bitmap(start_date, end_date, month_start, last_day)
+    return bitmaps
+
+
+def occupancy_bitmaps(car_ids, first_month, months):
+    """{car_id: int} with one bit per day from first_month's 1st through the end of the last month.
+
+    Each (car, month) bitmap is cached and keyed by the car's version, which
+    forget_car() bumps whenever one of its blocking bookings changes.
+    """
+    generation = _generation()
+    versions = cache.get_many([_car_version_key(car_id) for car_id in car_ids])
+    window = dict.fromkeys(car_ids, 0)
+
+    month_start = first_month
+    offset = 0
+    for index in range(months):
+        if index:
+            offset += (month_end(month_start) - month_start).days + 1
+            month_start = date(month_start.year + month_start.month // 12, month_start.month % 12 + 1, 1)
+        keys = {
+            car_id: _month_key(generation, car_id, versions.get(_car_version_key(car_id), 0), month_start)
+            for car_id in car_ids
+        }
+        cached = cache.get_many(keys.values())
+        missing = [car_id for car_id, key in keys.items() if key not in cached]
+        if missing:
+            # Cached until the car's version changes, so never fill from a lagging replica.
+            with primary_reads():
+                fresh = _month_bitmaps(missing, month_start)
+            cache.set_many({keys[car_id]: bits for car_id, bits in fresh.items()}, _cache_timeout())
+            cached.update({keys[car_id]: bits for car_id, bits in fresh.items()})
+
+        for car_id, key in keys.items():
+            window[car_id] |= cached[key] << offset
+    return window
+
+
+def encode_bitmap(bits, days):
+    """Little-endian base64: day i is bit i % 8 of byte i // 8."""
+    return base64.b64encode(bits.to_bytes((days + 7) // 8, "little")).decode("ascii")
+
+
+def forget_car(car_id):
+    """Drop the cached months of one car (on every worker when settings.SHARED_CACHE)."""
+    _incr(_car_version_key(car_id))
+
+
+def forget_all():
+    _incr(OCCUPANCY_GENERATION_KEY)
@@ -0,0 +1,123 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db.models import F, Q
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Ids are AutoField (Postgres integer); anything outside this range would fail in the query (DataError).
+MIN_ID = -(2**31)
+MAX_ID = 2**31 - 1
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    if not token:
+        return None
+
+    padded = token + "=" * (-len(token) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeEncodeError):
+        raise InvalidCursor(token)
+
+    if not isinstance(values, list) or not values or not _is_id(values[-1]):
+        raise InvalidCursor(token)
+    return values
+
+
+def _is_id(value):
+    return isinstance(value, int) and not isinstance(value, bool) and MIN_ID <= value <= MAX_ID
+
+
+def parse_page_size(value):
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def _row_value(row, name):
+    if isinstance(row, dict):
+        return row[name]
+    return getattr(row, name)
+
+
+def _cursor_for(row, field):
+    if field is None:
+        return [_row_value(row, "id")]
+
+    value = _row_value(row, field)
+    return [value.isoformat() if value is not None else None, _row_value(row, "id")]
+
+
+def _after_cursor(cursor, field):
+    if field is None:
+        if len(cursor) != 1 or not _is_id(cursor[0]):
+            raise InvalidCursor(cursor)
+        return Q(id__lt=cursor[0])
+
+    if len(cursor) != 2:
+        raise InvalidCursor(cursor)
+
+    raw_value, last_id = cursor
+    if raw_value is None:
+        # NULLs sort last, so only the remaining NULL rows come after this one.
+        return Q(**{f"{field}__isnull": True, "id__lt": last_id})
+
+    try:
+        value = datetime.fromisoformat(raw_value)
+    except (TypeError, ValueError):
+        raise InvalidCursor(cursor)
+
+    return (
+        Q(**{f"{field}__lt": value})
+        | Q(**{field: value, "id__lt": last_id})
+        | Q(**{f"{field}__isnull": True})
+    )
+
+
+def keyset_queryset(queryset, cursor, limit, field=None):
+    """The sliced queryset behind keyset_page (one extra row to detect a next page)."""
+    if field is None:
+        queryset = queryset.order_by("-id")
+    else:
+        queryset = queryset.order_by(F(field).desc(nulls_last=True), "-id")
+
+    if cursor is not None:
+        queryset = queryset.filter(_after_cursor(cursor, field))
+    return queryset[: limit + 1]
+
+
+def keyset_page(queryset, cursor, limit, field=None):
+    """Return one page ordered newest first by (field, id), plus the cursor of the next page.
+
+    With field=None the page is keyed on id alone. Raises InvalidCursor for a
+    cursor that does not match the key shape.
+    """
+    return _page(list(keyset_queryset(queryset, cursor, limit, field=field)), limit, field)
+
+
+async def akeyset_page(queryset, cursor, limit, field=None):
+    """keyset_page for async views."""
+    return _page([row async for row in keyset_queryset(queryset, cursor, limit, field=field)], limit, field)
+
+
+def _page(rows, limit, field):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(_cursor_for(rows[-1], field))
+    return rows, next_cursor
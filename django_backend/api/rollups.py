@@ -0,0 +1,165 @@
+import calendar
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from .models import Car, DailyCarRollup
+
+
+ROLLUP_FIELDS = ["completed_bookings", "cancellations", "revenue", "deposits", "car_days"]
+REPORT_BUCKETS = ["day", "week", "month"]
+# Extra values() keys per report grouping; car_type comes from the (small) cars table.
+REPORT_GROUPS = {
+    "total": [],
+    "car": ["car_id", "car__name"],
+    "car_type": ["car__car_type"],
+}
+
+# Same buckets as _rollup_contribution, recomputed from api_booking.
+# FLOOR(... * 0.30::float8) matches Booking.deposit (int(total_price * 0.30)).
+_REBUILD_ROLLUPS_SQL = """
+    INSERT INTO api_dailycarrollup (day, car_id, completed_bookings, cancellations, revenue, deposits, car_days)
+    SELECT day, car_id, SUM(completed_bookings), SUM(cancellations), SUM(revenue), SUM(deposits), SUM(car_days)
+    FROM (
+        SELECT (COALESCE(completed_at, created_at) AT TIME ZONE %(tz)s)::date AS day, car_id,
+               (order_stage = 'completed')::int AS completed_bookings,
+               (order_stage <> 'completed')::int AS cancellations,
+               CASE WHEN order_stage = 'completed' THEN total_price ELSE 0 END AS revenue,
+               CASE WHEN order_stage = 'completed' THEN FLOOR(total_price * 0.30::float8)::bigint ELSE 0 END AS deposits,
+               0 AS car_days
+        FROM api_booking
+        WHERE order_stage = 'completed' OR status = 'rejected'
+        UNION ALL
+        SELECT rented.day::date, car_id, 0, 0, 0, 0, 1
+        FROM api_booking, generate_series(start_date, end_date, interval '1 day') AS rented(day)
+        WHERE order_stage = 'completed'
+    ) AS contributions
+    GROUP BY day, car_id
+"""
+
+
+def _rollup_contribution(state):
+    """{(day, car_id): {field: amount}} for one booking_state() snapshot; open bookings add nothing."""
+    if state is None:
+        return {}
+
+    if state.order_stage == "completed":
+        closed = {"completed_bookings": 1, "revenue": state.total_price, "deposits": state.deposit}
+    elif state.status == "rejected":
+        closed = {"cancellations": 1}
+    else:
+        return {}
+
+    # Bookings cancelled before completed_at was recorded fall back to their creation day.
+    closed_day = timezone.localdate(state.completed_at or state.created_at)
+    rows = {(closed_day, state.car_id): closed}
+    if state.order_stage == "completed":
+        day = state.start_date
+        while day <= state.end_date:
+            row = rows.setdefault((day, state.car_id), {})
+            row["car_days"] = row.get("car_days", 0) + 1
+            day += timedelta(days=1)
+    return rows
+
+
+def apply_rollup_changes(changes):
+    """Add after minus before for (before, after) booking_state() pairs in one upsert.
+
+    Callers run this inside the same transaction as the booking change it describes.
+    """
+    deltas = {}
+    for before, after in changes:
+        for sign, state in ((-1, before), (1, after)):
+            for key, amounts in _rollup_contribution(state).items():
+                row = deltas.setdefault(key, dict.fromkeys(ROLLUP_FIELDS, 0))
+                for name, amount in amounts.items():
+                    row[name] += sign * amount
+
+    rows = [
+        (day, car_id, *[row[name] for name in ROLLUP_FIELDS])
+        for (day, car_id), row in deltas.items()
+        if any(row.values())
+    ]
+    if not rows:
+        return
+
+    # A fixed row order keeps two concurrent upserts from deadlocking on each other.
+    rows.sort()
+    columns = ", ".join(ROLLUP_FIELDS)
+    values = ", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * len(rows))
+    updates = ", ".join(f"{name} = api_dailycarrollup.{name} + EXCLUDED.{name}" for name in ROLLUP_FIELDS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO api_dailycarrollup (day, car_id, {columns}) VALUES {values} "
+            f"ON CONFLICT (day, car_id) DO UPDATE SET {updates}",
+            [value for row in rows for value in row],
+        )
+
+
+def rebuild_daily_rollups():
+    """Recompute every rollup row from the bookings table; returns the number of rows written."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Concurrent booking writes wait for the rebuilt rows instead of adding to rows being replaced.
+        cursor.execute("LOCK TABLE api_dailycarrollup IN EXCLUSIVE MODE")
+        cursor.execute("DELETE FROM api_dailycarrollup")
+        cursor.execute(_REBUILD_ROLLUPS_SQL, {"tz": timezone.get_current_timezone_name()})
+        return cursor.rowcount
+
+
+def _bucket_days(period, bucket, date_from, date_to):
+    """Days of the bucket starting at period that fall inside [date_from, date_to]."""
+    if bucket == "day":
+        period_end = period
+    elif bucket == "week":
+        period_end = period + timedelta(days=6)
+    else:
+        period_end = period.replace(day=calendar.monthrange(period.year, period.month)[1])
+    return (min(period_end, date_to) - max(period, date_from)).days + 1
+
+
+def rollup_report(date_from, date_to, bucket="day", group="total"):
+    """Rollup totals per bucket (and per car or car_type) for days in [date_from, date_to].
+
+    Utilization is car_days over the days in the bucket times the cars currently
+    active (in that car_type for group="car_type"; one car for group="car").
+    """
+    keys = REPORT_GROUPS[group]
+    rows = (
+        DailyCarRollup.objects.filter(day__gte=date_from, day__lte=date_to)
+        .annotate(period=Trunc("day", bucket, output_field=DateField()))
+        .values("period", *keys)
+        .annotate(**{f"sum_{name}": Sum(name) for name in ROLLUP_FIELDS})
+        .order_by("period", *keys)
+    )
+
+    fleet = {}
+    if group != "car":
+        active_cars = Car.objects.filter(is_active=True)
+        if group == "car_type":
+            fleet = dict(active_cars.values_list("car_type").annotate(cars=Count("id")).order_by())
+        else:
+            fleet = {None: active_cars.count()}
+
+    periods = []
+    for row in rows:
+        entry = {"period": row["period"].isoformat()}
+        if group == "car":
+            entry.update({"car_id": row["car_id"], "car_name": row["car__name"]})
+            cars = 1
+        elif group == "car_type":
+            entry["car_type"] = row["car__car_type"]
+            cars = fleet.get(row["car__car_type"], 0)
+        else:
+            cars = fleet[None]
+        for name in ROLLUP_FIELDS:
+            entry[name] = row[f"sum_{name}"]
+
+        capacity = cars * _bucket_days(row["period"], bucket, date_from, date_to)
+        entry["utilization"] = round(entry["car_days"] / capacity, 4) if capacity else None
+        periods.append(entry)
+
+    totals = {name: sum(entry[name] for entry in periods) for name in ROLLUP_FIELDS}
+    return {"periods": periods, "totals": totals}
@@ -0,0 +1,36 @@
+from django.db import connection
+
+
+# Fields are joined with a newline so a search term never matches across two of them.
+SEARCH_TEXT_SEPARATOR = "\n"
+
+_REFRESH_SEARCH_TEXT_SQL = """
+    UPDATE api_booking AS booking
+    SET search_text = lower(concat_ws(
+        chr(10), u."fullName", u.username, u."phoneNumber", car.name, booking.contact_number
+    ))
+    FROM api_user AS u, api_car AS car
+    WHERE u.id = booking.user_id AND car.id = booking.car_id
+"""
+
+
+def booking_search_text(user, car, contact_number):
+    """Lowercased text that admin order/history search matches against."""
+    parts = [user.fullName, user.username, user.phoneNumber, car.name, contact_number]
+    return SEARCH_TEXT_SEPARATOR.join(parts).lower()
+
+
+def refresh_booking_search_text(user_id=None, car_id=None):
+    """Recompute search_text for the bookings of one user or car (all bookings if neither)."""
+    sql = _REFRESH_SEARCH_TEXT_SQL
+    params = []
+    if user_id is not None:
+        sql += " AND booking.user_id = %s"
+        params.append(user_id)
+    if car_id is not None:
+        sql += " AND booking.car_id = %s"
+        params.append(car_id)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
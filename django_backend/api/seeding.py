@@ -0,0 +1,190 @@
+import random
+from datetime import date, timedelta
+
+from django.db import connection, transaction
+
+from .models import Booking, Car, CarImage, Notification, User
+from .search import booking_search_text
+
+
+FIRST_NAMES = ["Somchai", "Suda", "Niran", "Malee", "Anan", "Kanya", "Preecha", "Wipa", "Arthit", "Ratana"]
+LAST_NAMES = ["Srisuk", "Wongsa", "Chaiyo", "Boonmee", "Kaewkla", "Thongdee", "Saelim", "Phromma"]
+CAR_MODELS = [
+    ("Toyota Camry", "Sedan", "Hybrid"),
+    ("Honda Civic", "Sedan", "Petrol"),
+    ("Toyota Fortuner", "SUV", "Diesel"),
+    ("Mazda MX-5", "Convertible", "Petrol"),
+    ("Toyota GR86", "Coupe", "Petrol"),
+    ("Tesla Model 3", "Sedan", "EV"),
+    ("Honda Jazz", "Hatchback", "Petrol"),
+    ("Mitsubishi Pajero", "SUV", "Diesel"),
+]
+PROVINCES = ["Bangkok", "Chiang Mai", "Udon Thani", "Khon Kaen", "Phuket", "Nong Khai"]
+OPEN_STAGES = ["awaiting_contact", "awaiting_deposit", "awaiting_handover", "awaiting_full_payment"]
+
+BATCH_SIZE = 5000
+
+
+def _unused_phone_numbers(rng, count, prefix):
+    taken = set(User.objects.filter(phoneNumber__startswith=prefix).values_list("phoneNumber", flat=True))
+    phones = set()
+    while len(phones) < count:
+        phone = f"{prefix}{rng.randrange(10**8):08d}"
+        if phone not in taken:
+            phones.add(phone)
+    return sorted(phones)
+
+
+def _booking_rows(rng, cars, total, today):
+    """Yield (car, start, end, status, order_stage) with no overlapping pending/approved periods per car."""
+    first_day = today - timedelta(days=730)
+    last_day = today + timedelta(days=90)
+    cursors = {car.id: first_day + timedelta(days=rng.randrange(7)) for car in cars}
+
+    for _ in range(total):
+        car = rng.choice(cars)
+        start_date = cursors[car.id]
+        if start_date > last_day:
+            # This car's calendar is full; pile the rest up as cancelled requests.
+            start_date = first_day + timedelta(days=rng.randrange(820))
+            yield car, start_date, start_date + timedelta(days=rng.randrange(5)), "rejected", "awaiting_contact"
+            continue
+
+        end_date = start_date + timedelta(days=rng.randrange(5))
+        cursors[car.id] = end_date + timedelta(days=1 + rng.randrange(4))
+
+        if rng.random() < 0.1:
+            yield car, start_date, end_date, "rejected", "awaiting_contact"
+        elif end_date < today:
+            yield car, start_date, end_date, "approved", "completed"
+        else:
+            stage = rng.choice(OPEN_STAGES)
+            status = "pending" if stage == "awaiting_contact" else "approved"
+            yield car, start_date, end_date, status, stage
+
+
+def seed_dataset(users=1000, cars=50, bookings=20000, notifications=20000, images_per_car=0, seed=None, tag="seed"):
+    """Bulk-insert a synthetic fleet, customers, bookings and notifications.
+
+    Rows are tagged (usernames and car names start with tag) so they can be
+    told apart from real data. Returns the created users and cars.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+
+    with transaction.atomic():
+        customers = User.objects.bulk_create(
+            (
+                User(
+                    fullName=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    phoneNumber=phone,
+                    username=f"{tag}-u{index}",
+                    password="",
+                    role="customer",
+                )
+                for index, phone in enumerate(_unused_phone_numbers(rng, users, "06"))
+            ),
+            batch_size=BATCH_SIZE,
+        )
+
+        fleet = []
+        for index in range(cars):
+            name, car_type, fuel_type = rng.choice(CAR_MODELS)
+            fleet.append(
+                Car(
+                    name=f"{tag} {name} #{index}",
+                    price_per_day=rng.randrange(800, 5000, 100),
+                    fuel_type=fuel_type,
+                    fuel_consumption=f"{rng.randrange(8, 25)} km/L",
+                    car_type=car_type,
+                    seat_capacity=rng.choice([2, 4, 5, 7]),
+                    engine_cc=rng.randrange(1200, 3000, 100),
+                    horsepower=rng.randrange(90, 400, 10),
+                )
+            )
+        fleet = Car.objects.bulk_create(fleet, batch_size=BATCH_SIZE)
+
+        if images_per_car:
+            CarImage.objects.bulk_create(
+                (
+                    CarImage(car=car, image_url="/static/Image/GR86.jpg", caption=f"{car.name} {index + 1}")
+                    for car in fleet
+                    for index in range(images_per_car)
+                ),
+                batch_size=BATCH_SIZE,
+            )
+
+        batch = []
+        for car, start_date, end_date, status, stage in _booking_rows(rng, fleet, bookings, today):
+            user = rng.choice(customers)
+            total_price = car.price_per_day * ((end_date - start_date).days + 1)
+            batch.append(
+                Booking(
+                    user=user,
+                    car=car,
+                    start_date=start_date,
+                    end_date=end_date,
+                    current_province=rng.choice(PROVINCES),
+                    destination_province=rng.choice(PROVINCES),
+                    pickup_type="self",
+                    total_price=total_price,
+                    contact_number=user.phoneNumber,
+                    search_text=booking_search_text(user, car, user.phoneNumber),
+                    status=status,
+                    order_stage=stage,
+                )
+            )
+            if len(batch) >= BATCH_SIZE:
+                Booking.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Booking.objects.bulk_create(batch)
+
+        car_ids = [car.id for car in fleet]
+        with connection.cursor() as cursor:
+            # auto_now_add stamps every row with "now"; spread them out like real traffic.
+            cursor.execute(
+                """
+                UPDATE api_booking
+                SET created_at = (start_date - (1 + floor(random() * 30))::int) + time '09:00'
+                        + random() * interval '10 hours',
+                    completed_at = CASE WHEN order_stage = 'completed'
+                        THEN (end_date + 1) + time '12:00' ELSE NULL END
+                WHERE car_id = ANY(%s)
+                """,
+                [car_ids],
+            )
+
+        if notifications:
+            booking_rows = list(
+                Booking.objects.filter(car_id__in=car_ids).values_list("id", "user_id", "status", "order_stage")
+            )
+            Notification.objects.bulk_create(
+                (
+                    Notification(
+                        user_id=user_id,
+                        booking_id=booking_id,
+                        title="Order update",
+                        message=f"Booking #{booking_id} is now {status} ({stage})",
+                        is_read=rng.random() < 0.7,
+                    )
+                    for booking_id, user_id, status, stage in (
+                        rng.choice(booking_rows) for _ in range(notifications)
+                    )
+                ),
+                batch_size=BATCH_SIZE,
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    UPDATE api_notification AS n
+                    SET created_at = b.created_at + random() * interval '20 days'
+                    FROM api_booking AS b
+                    WHERE b.id = n.booking_id AND b.car_id = ANY(%s)
+                    """,
+                    [car_ids],
+                )
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE api_user, api_car, api_booking, api_notification")
+    return customers, fleet
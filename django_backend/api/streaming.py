@@ -0,0 +1,23 @@
+from asgiref.sync import sync_to_async
+
+
+async def aiter_sync(iterator, thread_sensitive=True):
+    """Serve a sync iterator to ASGI one item at a time.
+
+    Django's StreamingHttpResponse would otherwise read a sync iterator into a
+    list before sending the first byte. With thread_sensitive=True every step
+    runs on the request's sync thread, so a server-side cursor opened by the
+    iterator keeps using the same connection.
+    """
+    step = sync_to_async(next, thread_sensitive=thread_sensitive)
+    done = object()
+    try:
+        while True:
+            item = await step(iterator, done)
+            if item is done:
+                return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=thread_sensitive)()
@@ -11,7 +11,11 @@
         orders: app.dataset.ordersUrl,
         orderApproveTemplate: app.dataset.orderApproveUrlTemplate,
         orderCancelTemplate: app.dataset.orderCancelUrlTemplate,
+        orderBatchApprove: app.dataset.orderBatchApproveUrl,
+        orderBatchCancel: app.dataset.orderBatchCancelUrl,
         history: app.dataset.historyUrl,
+        historyExport: app.dataset.historyExportUrl,
+        occupancy: app.dataset.occupancyUrl,
         model: app.dataset.modelUrl,
     };
 
@@ -34,6 +38,14 @@
         history: [],
     };
 
+    // Keyset pagination state per list; nextCursor is null once the last page is loaded.
+    const pages = {
+        users: { url: urls.users, render: () => renderUsers(), query: "", nextCursor: null, loading: false, requestId: 0 },
+        admins: { url: urls.admins, render: () => renderAdmins(), query: "", nextCursor: null, loading: false, requestId: 0 },
+        orders: { url: urls.orders, render: () => renderOrders(), query: "", nextCursor: null, loading: false, requestId: 0 },
+        history: { url: urls.history, render: () => renderHistory(), query: "", nextCursor: null, loading: false, requestId: 0 },
+    };
+
     function getCSRFToken() {
         const cookie = document.cookie
             .split(";")
@@ -68,6 +80,20 @@
         return payload.data ?? payload;
     }
 
+    async function apiRequestPage(url) {
+        const response = await fetch(url, {
+            headers: {
+                Accept: "application/json",
+            },
+            credentials: "same-origin",
+        });
+        const payload = await response.json().catch(() => ({}));
+        if (!response.ok || payload.success === false) {
+            throw new Error(payload.message || `Request failed (${response.status})`);
+        }
+        return { items: payload.data || [], nextCursor: payload.next_cursor || null };
+    }
+
     function formatMoney(value) {
         const parsed = Number(value || 0);
         return `${parsed.toLocaleString("en-US")} THB`;
@@ -147,6 +173,7 @@
         if (targetButton) {
             targetButton.classList.add("active");
         }
+        loadMoreForActiveSection();
     }
 
     function setDashboard(data) {
@@ -217,7 +244,7 @@
     function renderOrders() {
         const tbody = document.getElementById("ordersTableBody");
         if (!state.orders.length) {
-            tbody.innerHTML = `<tr><td colspan="9" class="empty-row">No incoming orders found</td></tr>`;
+            tbody.innerHTML = `<tr><td colspan="10" class="empty-row">No incoming orders found</td></tr>`;
             return;
         }
 
@@ -253,8 +280,13 @@
                     ? `<div class="inline-actions">${actionButtons.join("")}</div>`
                     : "-";
 
+                const selectHtml = !isCancelled && !isCompleted
+                    ? `<input type="checkbox" class="order-select" value="${order.id}" aria-label="Select order #${order.id}">`
+                    : "";
+
                 return `
                 <tr>
+                    <td>${selectHtml}</td>
                     <td>#${order.id}</td>
                     <td>${order.customer.fullName} (${order.customer.username})</td>
                     <td>${order.car.name}</td>
@@ -304,32 +336,66 @@
         }
     }
 
-    async function loadUsers(query = "") {
-        const endpoint = query ? `${urls.users}?q=${encodeURIComponent(query)}` : urls.users;
-        const data = await apiRequest(endpoint);
-        state.users = data;
-        renderUsers();
+    async function loadList(name, query = "", append = false) {
+        const page = pages[name];
+        if (append && (!page.nextCursor || page.loading)) {
+            return;
+        }
+
+        const params = new URLSearchParams();
+        const activeQuery = append ? page.query : query;
+        if (activeQuery) {
+            params.set("q", activeQuery);
+        }
+        if (append) {
+            params.set("cursor", page.nextCursor);
+        }
+
+        // A newer search supersedes any page still in flight for this list.
+        const requestId = ++page.requestId;
+        page.loading = true;
+        try {
+            const search = params.toString();
+            const { items, nextCursor } = await apiRequestPage(search ? `${page.url}?${search}` : page.url);
+            if (requestId !== page.requestId) {
+                return;
+            }
+            state[name] = append ? state[name].concat(items) : items;
+            page.query = activeQuery;
+            page.nextCursor = nextCursor;
+            page.render();
+        } finally {
+            if (requestId === page.requestId) {
+                page.loading = false;
+            }
+        }
+    }
+
+    function loadUsers(query = "") {
+        return loadList("users", query);
     }
 
-    async function loadAdmins(query = "") {
-        const endpoint = query ? `${urls.admins}?q=${encodeURIComponent(query)}` : urls.admins;
-        const data = await apiRequest(endpoint);
-        state.admins = data;
-        renderAdmins();
+    function loadAdmins(query = "") {
+        return loadList("admins", query);
     }
 
-    async function loadOrders(query = "") {
-        const endpoint = query ? `${urls.orders}?q=${encodeURIComponent(query)}` : urls.orders;
-        const data = await apiRequest(endpoint);
-        state.orders = data;
-        renderOrders();
+    function loadOrders(query = "") {
+        return loadList("orders", query);
     }
 
-    async function loadHistory(query = "") {
-        const endpoint = query ? `${urls.history}?q=${encodeURIComponent(query)}` : urls.history;
-        const data = await apiRequest(endpoint);
-        state.history = data;
-        renderHistory();
+    function loadHistory(query = "") {
+        return loadList("history", query);
+    }
+
+    function loadMoreForActiveSection() {
+        const section = document.querySelector(".section.active");
+        if (!section || !pages[section.id]) {
+            return;
+        }
+        const nearBottom = window.innerHeight + window.scrollY >= document.documentElement.scrollHeight - 300;
+        if (nearBottom) {
+            loadList(section.id, "", true).catch((error) => alert(error.message));
+        }
     }
 
     function resetUserForm() {
@@ -472,6 +538,53 @@
         }
     }
 
+    function selectedOrderIds() {
+        return Array.from(document.querySelectorAll("#ordersTableBody .order-select:checked")).map((input) =>
+            Number(input.value)
+        );
+    }
+
+    async function handleOrderBatch(url, verb) {
+        const ids = selectedOrderIds();
+        if (!ids.length) {
+            alert("Select at least one order first");
+            return;
+        }
+
+        if (!window.confirm(`${verb} ${ids.length} selected order(s)?`)) {
+            return;
+        }
+
+        try {
+            // Partial failures still return 200 with a result per ID, so read them directly.
+            const response = await fetch(url, {
+                method: "POST",
+                headers: {
+                    Accept: "application/json",
+                    "Content-Type": "application/json",
+                    "X-CSRFToken": getCSRFToken(),
+                },
+                credentials: "same-origin",
+                body: JSON.stringify({ ids }),
+            });
+            const payload = await response.json().catch(() => ({}));
+            if (!response.ok) {
+                throw new Error(payload.message || `Request failed (${response.status})`);
+            }
+            const failed = ((payload.data && payload.data.results) || []).filter((result) => !result.success);
+            if (failed.length) {
+                const details = failed.slice(0, 10).map((result) => `#${result.id}: ${result.message}`);
+                alert([payload.message, ...details].join("\n"));
+            }
+        } catch (error) {
+            alert(error.message);
+        }
+
+        document.getElementById("selectAllOrders").checked = false;
+        await loadOrders(document.getElementById("orderSearchInput").value.trim()).catch((error) => alert(error.message));
+        await loadDashboard().catch((error) => alert(error.message));
+    }
+
     async function handleOrderAction(action, id) {
         const selected = state.orders.find((order) => String(order.id) === String(id));
         if (!selected) {
@@ -522,10 +635,56 @@
         }
     }
 
+    function isDayBooked(bytes, day) {
+        return (bytes[day >> 3] >> (day & 7)) & 1;
+    }
+
+    async function loadCalendar() {
+        const month = document.getElementById("calendarMonthInput").value;
+        const data = await apiRequest(`${urls.occupancy}?${new URLSearchParams(month ? { month } : {}).toString()}`);
+        const start = new Date(`${data.start_date}T00:00:00`);
+        const dayNumbers = Array.from({ length: data.days }, (_, day) => {
+            const current = new Date(start);
+            current.setDate(start.getDate() + day);
+            return current.getDate();
+        });
+
+        document.getElementById("calendarMonthInput").value = data.start_date.slice(0, 7);
+        document.getElementById("calendarTableHead").innerHTML = `
+            <tr>
+                <th>Car</th>
+                ${dayNumbers.map((dayNumber) => `<th>${dayNumber}</th>`).join("")}
+            </tr>`;
+
+        const tbody = document.getElementById("calendarTableBody");
+        if (!data.cars.length) {
+            tbody.innerHTML = `<tr><td colspan="${data.days + 1}" class="empty-row">No cars found</td></tr>`;
+            return;
+        }
+
+        tbody.innerHTML = data.cars
+            .map((car) => {
+                // One bit per day, day 0 = lowest bit of the first byte.
+                const bytes = Uint8Array.from(atob(car.bitmap), (char) => char.charCodeAt(0));
+                const cells = dayNumbers
+                    .map((_, day) => `<td class="${isDayBooked(bytes, day) ? "booked" : ""}"></td>`)
+                    .join("");
+                return `
+                <tr class="${car.is_active ? "" : "inactive"}">
+                    <td>${car.name} (${car.booked_days}/${data.days})</td>
+                    ${cells}
+                </tr>`;
+            })
+            .join("");
+    }
+
     function bindEvents() {
         document.querySelectorAll(".nav-btn").forEach((button) => {
             button.addEventListener("click", () => {
                 showSection(button.dataset.target);
+                if (button.dataset.target === "calendar") {
+                    loadCalendar().catch((error) => alert(error.message));
+                }
             });
         });
 
@@ -534,6 +693,9 @@
         });
 
         document.getElementById("refreshDashboardBtn").addEventListener("click", loadDashboard);
+        document.getElementById("loadCalendarBtn").addEventListener("click", () => {
+            loadCalendar().catch((error) => alert(error.message));
+        });
 
         document.getElementById("userForm").addEventListener("submit", saveUser);
         document.getElementById("adminForm").addEventListener("submit", saveAdmin);
@@ -549,9 +711,29 @@
         document.getElementById("searchOrdersBtn").addEventListener("click", () => {
             loadOrders(document.getElementById("orderSearchInput").value.trim()).catch((error) => alert(error.message));
         });
+        document.getElementById("approveSelectedOrdersBtn").addEventListener("click", () => {
+            handleOrderBatch(urls.orderBatchApprove, "Approve the current stage of");
+        });
+        document.getElementById("cancelSelectedOrdersBtn").addEventListener("click", () => {
+            handleOrderBatch(urls.orderBatchCancel, "Cancel");
+        });
+        document.getElementById("selectAllOrders").addEventListener("change", (event) => {
+            document.querySelectorAll("#ordersTableBody .order-select").forEach((input) => {
+                input.checked = event.target.checked;
+            });
+        });
         document.getElementById("searchHistoryBtn").addEventListener("click", () => {
             loadHistory(document.getElementById("historySearchInput").value.trim()).catch((error) => alert(error.message));
         });
+        document.getElementById("exportHistoryBtn").addEventListener("click", () => {
+            // Streamed download of every matching row, not just the pages loaded so far.
+            const params = new URLSearchParams({ format: "csv" });
+            const query = document.getElementById("historySearchInput").value.trim();
+            if (query) {
+                params.set("q", query);
+            }
+            window.location.href = `${urls.historyExport}?${params.toString()}`;
+        });
 
         document.getElementById("usersTableBody").addEventListener("click", (event) => {
             const target = event.target.closest("button[data-action]");
@@ -595,6 +777,8 @@
                 }
             });
         });
+
+        window.addEventListener("scroll", loadMoreForActiveSection, { passive: true });
     }
 
     async function init() {
@@ -502,6 +502,38 @@ function renderCars(cars) {
     }
 }
 
+function formatWindow(window) {
+    return window.start_date === window.end_date ? window.start_date : `${window.start_date} - ${window.end_date}`;
+}
+
+async function showNextAvailable(cars, startDate, days, requestId) {
+    // One request for every full car instead of the customer probing other dates one by one.
+    const fullIds = cars.filter((car) => !car.is_available).map((car) => car.id);
+    if (!fullIds.length) {
+        return;
+    }
+
+    const query = new URLSearchParams({
+        car_id: fullIds.join(","),
+        after: startDate,
+        days: String(days),
+        limit: "1",
+    });
+    const response = await fetch(`${elements.form.dataset.nextAvailableUrl}?${query.toString()}`);
+    if (requestId !== availabilityFetchId || !response.ok) {
+        return;
+    }
+
+    const data = await response.json();
+    (data.cars || []).forEach((car) => {
+        const card = elements.carCards.find((item) => Number(item.dataset.carId) === car.id);
+        const statusTag = card && card.querySelector(".car-status");
+        if (statusTag && card.classList.contains("full") && car.windows.length) {
+            statusTag.textContent = `Full · next free ${formatWindow(car.windows[0])}`;
+        }
+    });
+}
+
 function setCarsLoadingState(message) {
     elements.carCards.forEach((card) => {
         const statusTag = card.querySelector(".car-status");
@@ -550,6 +582,7 @@ async function refreshAvailability() {
         }
 
         renderCars(data.cars || []);
+        showNextAvailable(data.cars || [], startDate, data.days, requestId).catch(() => {});
     } catch (error) {
         clearCarSelection();
         setCarsLoadingState("Load failed");
@@ -204,6 +204,25 @@
         document.getElementById("carImageCaption").value = "";
     }
 
+    function renderPicture(image, fallbackUrl, alt) {
+        // Variants are rendered in the background after upload; until then only the original exists.
+        if (!image.srcset) {
+            return `<img src="${fallbackUrl}" alt="${alt}" loading="lazy">`;
+        }
+
+        // Matches .image-row img in model.css: full width on narrow screens, 120px otherwise.
+        const sizes = "(max-width: 760px) 100vw, 120px";
+        const webpSource = image.srcset_webp
+            ? `<source type="image/webp" srcset="${image.srcset_webp}" sizes="${sizes}">`
+            : "";
+        return `
+            <picture>
+                ${webpSource}
+                <img src="${fallbackUrl}" srcset="${image.srcset}" sizes="${sizes}" alt="${alt}" loading="lazy">
+            </picture>
+        `;
+    }
+
     function renderImages(car) {
         if (!car.images.length) {
             return `<div class="empty-state">No images</div>`;
@@ -223,7 +242,7 @@
 
                 return `
                     <div class="image-row">
-                        <img src="${preview}" alt="${image.caption || car.name}" loading="lazy">
+                        ${renderPicture(image, preview, image.caption || car.name)}
                         <div class="image-info">
                             <strong>${image.caption || "-"}</strong>
                             <small>${image.image_url}</small>
@@ -347,11 +366,35 @@
             .join("");
     }
 
+    async function fetchAllCars(url) {
+        // The admin list is keyset-paginated; filtering and sorting here need every page.
+        const cars = [];
+        let cursor = null;
+        do {
+            const pageUrl = cursor ? `${url}${url.includes("?") ? "&" : "?"}cursor=${encodeURIComponent(cursor)}` : url;
+            const response = await fetch(pageUrl, {
+                headers: {
+                    Accept: "application/json",
+                },
+                credentials: "same-origin",
+            });
+            const payload = await response.json().catch(() => ({}));
+            if (!response.ok || payload.success === false) {
+                throw new Error(payload.message || `Request failed (${response.status})`);
+            }
+            if (Array.isArray(payload.data)) {
+                cars.push(...payload.data);
+            }
+            cursor = payload.next_cursor || null;
+        } while (cursor);
+        return cars;
+    }
+
     async function loadCars(query = "") {
         const safeQuery = String(query || "").trim();
-        const data = await apiRequest(carsCollectionUrl(safeQuery));
+        const data = await fetchAllCars(carsCollectionUrl(safeQuery));
         state.searchQuery = safeQuery;
-        state.cars = Array.isArray(data) ? data : [];
+        state.cars = data;
         refreshFilterOptions();
         applyFiltersAndSort();
     }
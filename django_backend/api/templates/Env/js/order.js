@@ -73,6 +73,7 @@ function initNotifications() {
     }
 
     const notificationsUrl = orderPage.dataset.notificationsUrl;
+    const notificationsStreamUrl = orderPage.dataset.notificationsStreamUrl;
     const markReadUrl = orderPage.dataset.markNotificationsReadUrl;
     const notificationList = document.getElementById("notificationList");
     const unreadBadge = document.getElementById("notificationUnreadBadge");
@@ -81,7 +82,11 @@ function initNotifications() {
         return;
     }
 
+    // Same as the default page size of the notifications API.
+    const notificationLimit = 20;
     const announcedNotificationIds = new Set();
+    let renderedNotifications = [];
+    let unreadCount = 0;
 
     function getCSRFToken() {
         const cookie = document.cookie
@@ -307,44 +312,114 @@ function initNotifications() {
     }
 
     function setUnreadBadge(count) {
-        unreadBadge.textContent = `${count} unread`;
+        unreadCount = Math.max(0, count);
+        unreadBadge.textContent = `${unreadCount} unread`;
+    }
+
+    async function announceNotifications(items) {
+        const newItems = items.filter(
+            (item) => !item.is_read && !announcedNotificationIds.has(item.id)
+        );
+
+        if (!newItems.length) {
+            return 0;
+        }
+
+        newItems.forEach((item) => {
+            announcedNotificationIds.add(item.id);
+            showToast(item.title || "Notification", item.message || "");
+            showPopupNotification(item);
+        });
+
+        await requestJson(markReadUrl, "POST", {
+            ids: newItems.map((item) => item.id),
+        });
+        newItems.forEach((item) => {
+            item.is_read = true;
+        });
+
+        return newItems.length;
     }
 
     async function refreshNotifications() {
+        let loaded = false;
         try {
             const data = await requestJson(notificationsUrl);
             const notifications = Array.isArray(data.notifications) ? data.notifications : [];
-            const unreadCount = Number(data.unread_count || 0);
 
+            renderedNotifications = notifications;
+            loaded = true;
             renderNotifications(notifications);
-            setUnreadBadge(unreadCount);
+            setUnreadBadge(Number(data.unread_count || 0));
+
+            const announcedCount = await announceNotifications(notifications);
+            if (announcedCount) {
+                setUnreadBadge(unreadCount - announcedCount);
+                renderNotifications(renderedNotifications);
+            }
+        } catch (error) {
+            // Keep the page usable even if notification polling fails.
+            console.error("Notification polling failed:", error);
+        }
+        return loaded;
+    }
 
-            const newItems = notifications.filter(
-                (item) => !item.is_read && !announcedNotificationIds.has(item.id)
-            );
+    function startPolling() {
+        const pollTimer = window.setInterval(refreshNotifications, 8000);
+        window.addEventListener("beforeunload", () => window.clearInterval(pollTimer));
+    }
 
-            if (!newItems.length) {
+    function startStream() {
+        // Resume right after the newest notification already rendered; EventSource then
+        // reconnects by itself and resumes from the last event id it saw.
+        const lastSeenId = renderedNotifications.reduce((maxId, item) => Math.max(maxId, Number(item.id) || 0), 0);
+        const separator = notificationsStreamUrl.includes("?") ? "&" : "?";
+        const source = new EventSource(`${notificationsStreamUrl}${separator}last_event_id=${lastSeenId}`);
+
+        source.addEventListener("notification", async (event) => {
+            let item;
+            try {
+                item = JSON.parse(event.data);
+            } catch (error) {
                 return;
             }
 
-            newItems.forEach((item) => {
-                announcedNotificationIds.add(item.id);
-                showToast(item.title || "Notification", item.message || "");
-                showPopupNotification(item);
-            });
+            const isNew = !renderedNotifications.some((existing) => existing.id === item.id);
+            renderedNotifications = [
+                item,
+                ...renderedNotifications.filter((existing) => existing.id !== item.id),
+            ].slice(0, notificationLimit);
+            renderNotifications(renderedNotifications);
+            if (isNew && !item.is_read) {
+                setUnreadBadge(unreadCount + 1);
+            }
 
-            await requestJson(markReadUrl, "POST", {
-                ids: newItems.map((item) => item.id),
-            });
+            try {
+                const announcedCount = await announceNotifications([item]);
+                if (announcedCount) {
+                    setUnreadBadge(unreadCount - announcedCount);
+                    renderNotifications(renderedNotifications);
+                }
+            } catch (error) {
+                console.error("Notification update failed:", error);
+            }
+        });
 
-            setUnreadBadge(Math.max(0, unreadCount - newItems.length));
-        } catch (error) {
-            // Keep the page usable even if notification polling fails.
-            console.error("Notification polling failed:", error);
-        }
+        source.addEventListener("error", () => {
+            if (source.readyState === EventSource.CLOSED) {
+                startPolling();
+            }
+        });
+
+        window.addEventListener("beforeunload", () => source.close());
     }
 
-    refreshNotifications();
-    const pollTimer = window.setInterval(refreshNotifications, 8000);
-    window.addEventListener("beforeunload", () => window.clearInterval(pollTimer));
+    if (notificationsStreamUrl && window.EventSource) {
+        // The stream resumes after the newest rendered notification, so it may only start
+        // from a list that actually loaded; otherwise it would replay every notification.
+        refreshNotifications().then((loaded) => (loaded ? startStream() : startPolling()));
+    } else {
+        refreshNotifications();
+        startPolling();
+    }
 }
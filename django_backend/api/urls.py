@@ -8,23 +8,32 @@ urlpatterns = [
     path('admin/', views.admin_page, name='admin'),
     path('model/', views.model_page, name='model'),
     path('admin/api/dashboard/', views.admin_dashboard_api, name='admin_dashboard_api'),
+    path('admin/api/db-pool/', views.admin_db_pool_api, name='admin_db_pool_api'),
+    path('admin/api/reports/', views.admin_reports_api, name='admin_reports_api'),
+    path('admin/api/occupancy/', views.admin_occupancy_api, name='admin_occupancy_api'),
     path('admin/api/users/', views.admin_users_api, name='admin_users_api'),
     path('admin/api/users/<int:user_id>/', views.admin_user_detail_api, name='admin_user_detail_api'),
     path('admin/api/admins/', views.admin_admins_api, name='admin_admins_api'),
     path('admin/api/admins/<int:user_id>/', views.admin_admin_detail_api, name='admin_admin_detail_api'),
     path('admin/api/cars/', views.admin_cars_api, name='admin_cars_api'),
+    path('admin/api/cars/import/', views.admin_cars_import_api, name='admin_cars_import_api'),
     path('admin/api/cars/<int:car_id>/', views.admin_car_detail_api, name='admin_car_detail_api'),
     path('admin/api/cars/<int:car_id>/images/', views.admin_car_images_api, name='admin_car_images_api'),
     path('admin/api/cars/<int:car_id>/images/upload/', views.admin_car_image_upload_api, name='admin_car_image_upload_api'),
     path('admin/api/cars/<int:car_id>/images/<int:image_id>/', views.admin_car_image_detail_api, name='admin_car_image_detail_api'),
     path('admin/api/orders/', views.admin_orders_api, name='admin_orders_api'),
+    path('admin/api/orders/batch/approve-stage/', views.admin_orders_batch_approve_stage_api, name='admin_orders_batch_approve_stage_api'),
+    path('admin/api/orders/batch/cancel/', views.admin_orders_batch_cancel_api, name='admin_orders_batch_cancel_api'),
     path('admin/api/orders/<int:booking_id>/approve-stage/', views.admin_order_stage_approve_api, name='admin_order_stage_approve_api'),
     path('admin/api/orders/<int:booking_id>/cancel/', views.admin_order_cancel_api, name='admin_order_cancel_api'),
     path('admin/api/history/', views.admin_history_api, name='admin_history_api'),
+    path('admin/api/history/export/', views.admin_history_export_api, name='admin_history_export_api'),
     path('notifications/', views.user_notifications_api, name='user_notifications_api'),
+    path('notifications/stream/', views.user_notifications_stream_api, name='user_notifications_stream_api'),
     path('notifications/mark-read/', views.user_notifications_mark_read_api, name='user_notifications_mark_read_api'),
     path('cars/public/', views.public_cars_api, name='public_cars_api'),
     path('booking/availability/', views.booking_availability, name='booking_availability'),
+    path('booking/next-available/', views.booking_next_available, name='booking_next_available'),
     path('booking/', views.booking, name='booking'),
     path('order/', views.order, name='order'),
     path('order/<int:booking_id>/advance/', views.advance_order_stage, name='advance_order_stage'),
@@ -1,22 +1,65 @@
 import hashlib
 import json
 import os
+import time
 import uuid
 from datetime import date, datetime, timedelta
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
 from django.core.files.storage import default_storage
-from django.db.models import Q, Sum
-from django.http import HttpResponse, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, connection, connections, transaction
+from django.db.backends.postgresql.psycopg_any import DateRange
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.functions import JSONObject
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from django.utils.text import get_valid_filename
 
-from .models import Booking, Car, CarImage, Notification, User
+from .availability import availability_index
+from .car_import import CarImportError, import_car_rows, read_car_rows
+from .catalog import bump_catalog_version, cached_catalog_cars, cached_catalog_response
+from .image_pipeline import delete_image_variants, image_srcset, image_variant_pipeline, variants_srcset
+from .counters import (
+    booking_state,
+    read_dashboard_counters,
+    record_booking_change,
+    record_booking_changes,
+    record_car_change,
+    record_user_change,
+)
+from .db_pool import connection_stats
+from .db_router import replica_aliases, use_primary
+from .exports import EXPORT_FORMATS, stream_history_export
+from .json_response import json_response
+from .models import (
+    BOOKING_BLOCKING_STATUSES,
+    BOOKING_CLOSED,
+    BOOKING_OVERLAP_CONSTRAINT,
+    Booking,
+    Car,
+    CarImage,
+    Notification,
+    User,
+)
+from .notifications import (
+    CLOSED_BOOKING_NOTIFICATIONS,
+    announce_notification,
+    announce_notifications,
+    notification_hub,
+)
+from .occupancy import encode_bitmap, month_end, occupancy_bitmaps
+from .pagination import InvalidCursor, akeyset_page, decode_cursor, keyset_page, parse_page_size
+from .rollups import REPORT_BUCKETS, REPORT_GROUPS, rollup_report
+from .search import booking_search_text, refresh_booking_search_text
+from .streaming import aiter_sync
 
 
-BOOKING_BLOCKING_STATUSES = ["pending", "approved"]
 ORDER_STAGE_FLOW = [
     ("awaiting_contact", "1. Waiting for callback"),
     ("awaiting_deposit", "2. Pay 30% deposit"),
@@ -34,6 +77,54 @@ ORDER_STAGE_ACTION_TEXT = {
     "awaiting_full_payment": "Confirm full payment and move to History",
 }
 
+# Stages an admin approves, with the stage/status they move to and what the customer is told.
+ADMIN_STAGE_APPROVALS = {
+    "awaiting_contact": {
+        "update": {"order_stage": "awaiting_deposit", "status": "approved"},
+        "title": "Callback approved",
+        "notification": "Admin approved callback confirmation. You can now pay 30% deposit.",
+        "message": "Callback approved. Customer can proceed to 30% deposit.",
+    },
+    "awaiting_handover": {
+        "update": {"order_stage": "awaiting_full_payment"},
+        "title": "Pickup/Delivery approved",
+        "notification": "Admin confirmed pickup or delivery. You can now pay the full amount.",
+        "message": "Pickup/delivery confirmed. Customer can proceed to full payment.",
+    },
+}
+ADMIN_CANCEL_TITLE = "Cancelled by admin"
+ADMIN_CANCEL_NOTIFICATION = "Admin cancelled this order. Please contact support if you need more details."
+# Query parameters that switch booking_availability to the filtered free-cars search.
+AVAILABILITY_FILTER_PARAMS = ["car_type", "fuel_type", "seat_capacity", "min_price", "max_price", "sort"]
+AVAILABILITY_SORTS = {
+    "price": ["price_per_day", "id"],
+    "-price": ["-price_per_day", "id"],
+    "name": ["name", "id"],
+    "seats": ["seat_capacity", "price_per_day", "id"],
+    "-seats": ["-seat_capacity", "price_per_day", "id"],
+}
+# Largest values the integer and smallint car columns hold.
+INTEGER_MAX = 2**31 - 1
+SMALLINT_MAX = 2**15 - 1
+# Bounds for the next-available-window search.
+NEXT_AVAILABLE_MAX_DAYS = 60
+NEXT_AVAILABLE_MAX_WINDOWS = 10
+NEXT_AVAILABLE_MAX_CARS = 100
+# How far ahead `after` may start the search; also keeps the window end a valid date.
+NEXT_AVAILABLE_MAX_AHEAD_DAYS = 365
+# Most months one fleet occupancy request may span.
+OCCUPANCY_MAX_MONTHS = 6
+OCCUPANCY_MIN_YEAR = 2000
+OCCUPANCY_MAX_YEAR = 2100
+# Most order IDs one batch approve/cancel request may carry.
+ORDER_BATCH_LIMIT = 200
+
+# Seconds between keep-alive comments and before the server ends a notification
+# stream (EventSource reconnects on its own and resumes from Last-Event-ID).
+NOTIFICATION_STREAM_HEARTBEAT = 15
+NOTIFICATION_STREAM_LIFETIME = 300
+NOTIFICATION_STREAM_BATCH = 50
+
 FUEL_TYPE_ALIASES = {
     "diesel": "Diesel",
     "ดีเซล": "Diesel",
@@ -57,13 +148,9 @@ CAR_TYPE_ALIASES = {
 }
 
 
-def _has_overlapping_booking(car, start_date, end_date):
-    return Booking.objects.filter(
-        car=car,
-        status__in=BOOKING_BLOCKING_STATUSES,
-    ).filter(
-        Q(start_date__lte=end_date) & Q(end_date__gte=start_date)
-    ).exists()
+def _is_booking_overlap_error(error):
+    diag = getattr(error.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None) == BOOKING_OVERLAP_CONSTRAINT
 
 
 def _build_order_progress(order_stage):
@@ -159,7 +246,7 @@ def _normalize_car_type(value):
     return _normalize_choice(value, CAR_TYPE_ALIASES)
 
 
-def _to_int(value, field_name, min_value=0, required=True):
+def _to_int(value, field_name, min_value=0, required=True, max_value=None):
     raw = _clean_text(value)
     if raw == "":
         if required:
@@ -174,6 +261,9 @@ def _to_int(value, field_name, min_value=0, required=True):
     if parsed < min_value:
         return None, f"{field_name} must be at least {min_value}"
 
+    if max_value is not None and parsed > max_value:
+        return None, f"{field_name} must be at most {max_value}"
+
     return parsed, None
 
 
@@ -211,15 +301,34 @@ def _parse_payload(request):
     return {}, None
 
 
-def _require_admin_json(request):
-    user = request.session.get("user")
+def _session_user(user):
+    """What login keeps in request.session["user"]."""
+    return {
+        "id": user.id,
+        "fullName": user.fullName,
+        "phoneNumber": user.phoneNumber,
+        "username": user.username,
+        "role": user.role,
+    }
+
+
+def _current_user(request):
+    """The logged-in User row, loaded at most once per request (None when logged out or deleted)."""
+    if not hasattr(request, "_current_user"):
+        user_session = request.session.get("user")
+        request._current_user = (
+            User.objects.filter(id=user_session["id"]).first() if user_session else None
+        )
+    return request._current_user
+
+
+def _check_admin_json(user):
     if not user or user.get("role") != "admin":
         return None, JsonResponse({"success": False, "message": "Unauthorized"}, status=401)
     return user, None
 
 
-def _require_customer_json(request):
-    user = request.session.get("user")
+def _check_customer_json(user):
     if not user:
         return None, JsonResponse({"success": False, "message": "Unauthorized"}, status=401)
     if user.get("role") == "admin":
@@ -227,6 +336,69 @@ def _require_customer_json(request):
     return user, None
 
 
+def _require_admin_json(request):
+    return _check_admin_json(request.session.get("user"))
+
+
+def _require_customer_json(request):
+    return _check_customer_json(request.session.get("user"))
+
+
+# The async views below read the session with aget(): a cached_db/db session
+# load is a query, which the async ORM rules forbid on the event loop.
+async def _arequire_admin_json(request):
+    return _check_admin_json(await request.session.aget("user"))
+
+
+async def _arequire_customer_json(request):
+    return _check_customer_json(await request.session.aget("user"))
+
+
+def _page_json(rows, next_cursor, serialize_rows):
+    return json_response(
+        {
+            "success": True,
+            "data": serialize_rows(rows),
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+def _invalid_cursor():
+    return JsonResponse({"success": False, "message": "Invalid cursor"}, status=400)
+
+
+def _paginated_json(request, queryset, serialize_rows, field=None):
+    """JSON list response for one keyset page, newest first by (field, id).
+
+    serialize_rows turns the page's rows into the "data" list in one call.
+    """
+    try:
+        rows, next_cursor = keyset_page(
+            queryset,
+            decode_cursor(_clean_text(request.GET.get("cursor"))),
+            parse_page_size(request.GET.get("limit")),
+            field=field,
+        )
+    except InvalidCursor:
+        return _invalid_cursor()
+    return _page_json(rows, next_cursor, serialize_rows)
+
+
+async def _apaginated_json(request, queryset, serialize_rows, field=None):
+    """_paginated_json for async views."""
+    try:
+        rows, next_cursor = await akeyset_page(
+            queryset,
+            decode_cursor(_clean_text(request.GET.get("cursor"))),
+            parse_page_size(request.GET.get("limit")),
+            field=field,
+        )
+    except InvalidCursor:
+        return _invalid_cursor()
+    return _page_json(rows, next_cursor, serialize_rows)
+
+
 def _serialize_user(user):
     return {
         "id": user.id,
@@ -242,6 +414,8 @@ def _serialize_car_image(image):
         "id": image.id,
         "image_url": image.image_url,
         "caption": image.caption,
+        "srcset": image_srcset(image, "jpeg"),
+        "srcset_webp": image_srcset(image, "webp"),
     }
 
 
@@ -267,6 +441,19 @@ def _format_datetime(value):
     return timezone.localtime(value).strftime("%Y-%m-%d %H:%M")
 
 
+def _datetime_formatter():
+    """_format_datetime for a whole page: the current time zone is looked up once."""
+    zone = timezone.get_current_timezone()
+
+    def format_datetime(value):
+        if not value:
+            return ""
+        value = value.astimezone(zone)
+        return f"{value.year:04d}-{value.month:02d}-{value.day:02d} {value.hour:02d}:{value.minute:02d}"
+
+    return format_datetime
+
+
 def _serialize_booking(booking):
     return {
         "id": booking.id,
@@ -298,6 +485,117 @@ def _serialize_booking(booking):
     }
 
 
+# List endpoints read plain .values() rows instead of model instances; each
+# *_rows() function below returns the same JSON as the _serialize_* above.
+USER_ROW_FIELDS = ("id", "fullName", "phoneNumber", "username", "role")
+CAR_ROW_FIELDS = (
+    "id",
+    "name",
+    "price_per_day",
+    "fuel_type",
+    "fuel_consumption",
+    "car_type",
+    "seat_capacity",
+    "engine_cc",
+    "horsepower",
+    "is_active",
+)
+BOOKING_ROW_FIELDS = (
+    "id",
+    "user_id",
+    "user__fullName",
+    "user__username",
+    "user__phoneNumber",
+    "car_id",
+    "car__name",
+    "start_date",
+    "end_date",
+    "current_province",
+    "destination_province",
+    "pickup_type",
+    "delivery_lat",
+    "delivery_lng",
+    "delivery_address",
+    "contact_number",
+    "status",
+    "order_stage",
+    "total_price",
+    "created_at",
+    "completed_at",
+)
+ORDER_STAGE_LABELS = {stage: str(label) for stage, label in Booking.ORDER_STAGE_CHOICES}
+
+
+def _user_rows(rows):
+    # values(*USER_ROW_FIELDS) already has the API's keys.
+    return rows
+
+
+def _car_values(queryset):
+    """values() rows for _car_rows, with each car's images gathered in the same query."""
+    images = ArraySubquery(
+        CarImage.objects.filter(car_id=OuterRef("id"))
+        .order_by("id")
+        .values(
+            json=JSONObject(id="id", image_url="image_url", caption="caption", variants="variants")
+        )
+    )
+    return queryset.values(*CAR_ROW_FIELDS).annotate(image_rows=images)
+
+
+def _car_rows(rows):
+    cars = []
+    for row in rows:
+        car = {field: row[field] for field in CAR_ROW_FIELDS}
+        car["images"] = [
+            {
+                "id": image["id"],
+                "image_url": image["image_url"],
+                "caption": image["caption"],
+                "srcset": variants_srcset(image["variants"], "jpeg"),
+                "srcset_webp": variants_srcset(image["variants"], "webp"),
+            }
+            for image in row["image_rows"]
+        ]
+        cars.append(car)
+    return cars
+
+
+def _booking_rows(rows):
+    format_datetime = _datetime_formatter()
+    return [
+        {
+            "id": row["id"],
+            "customer": {
+                "id": row["user_id"],
+                "fullName": row["user__fullName"],
+                "username": row["user__username"],
+                "phoneNumber": row["user__phoneNumber"],
+            },
+            "car": {
+                "id": row["car_id"],
+                "name": row["car__name"],
+            },
+            "start_date": row["start_date"].isoformat(),
+            "end_date": row["end_date"].isoformat(),
+            "current_province": row["current_province"],
+            "destination_province": row["destination_province"],
+            "pickup_type": row["pickup_type"],
+            "delivery_lat": row["delivery_lat"],
+            "delivery_lng": row["delivery_lng"],
+            "delivery_address": row["delivery_address"],
+            "contact_number": row["contact_number"],
+            "status": row["status"],
+            "order_stage": row["order_stage"],
+            "order_stage_display": ORDER_STAGE_LABELS.get(row["order_stage"], row["order_stage"]),
+            "total_price": row["total_price"],
+            "created_at": format_datetime(row["created_at"]),
+            "completed_at": format_datetime(row["completed_at"]),
+        }
+        for row in rows
+    ]
+
+
 def _serialize_notification(notification):
     return {
         "id": notification.id,
@@ -319,17 +617,207 @@ def _create_user_notification(user, booking, title, message):
         title=title,
         message=message,
     )
+    announce_notification(user.id)
+
+
+def _format_sse(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _stream_notifications(user_id, last_event_id):
+    yield "retry: 3000\n\n"
+
+    deadline = time.monotonic() + NOTIFICATION_STREAM_LIFETIME
+    while True:
+        # Read the hub version before querying so a row created in between still wakes us.
+        version = notification_hub.version(user_id)
+        items = list(
+            _visible_notifications(user_id).filter(id__gt=last_event_id).order_by("id")[
+                :NOTIFICATION_STREAM_BATCH
+            ]
+        )
+        for item in items:
+            yield _format_sse("notification", _serialize_notification(item), event_id=item.id)
+        if items:
+            last_event_id = items[-1].id
+            if len(items) == NOTIFICATION_STREAM_BATCH:
+                continue
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+
+        # Idle streams should not pin a database connection, nor query again until the hub has news.
+        connection.close()
+        while notification_hub.wait(user_id, version, min(NOTIFICATION_STREAM_HEARTBEAT, remaining)) == version:
+            yield ": keep-alive\n\n"
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+
+
+def _latest_notification_id(user_id):
+    return (
+        Notification.objects.filter(user_id=user_id)
+        .order_by("-id")
+        .values_list("id", flat=True)
+        .first()
+        or 0
+    )
+
+
+def _next_notifications(user_id, last_event_id):
+    """One read of an ASGI stream, closing the connection afterwards.
+
+    Every ASGI request gets its own connection, so thousands of open streams
+    must not each keep one between reads.
+    """
+    try:
+        if last_event_id is None:
+            last_event_id = _latest_notification_id(user_id)
+        items = list(
+            _visible_notifications(user_id).filter(id__gt=last_event_id).order_by("id")[
+                :NOTIFICATION_STREAM_BATCH
+            ]
+        )
+        return last_event_id, items
+    finally:
+        connection.close()
+
+
+async def _astream_notifications(user_id, last_event_id):
+    """_stream_notifications for ASGI: an idle stream is a parked coroutine holding no connection.
+
+    Django still keeps the request's own sync thread (used by the session read and
+    the sync middleware hooks) alive, idle, until the stream ends.
+    """
+    yield "retry: 3000\n\n"
+
+    deadline = time.monotonic() + NOTIFICATION_STREAM_LIFETIME
+    while True:
+        version = notification_hub.version(user_id)
+        # Not thread-sensitive: that would queue every read on the request's own sync thread.
+        last_event_id, items = await sync_to_async(_next_notifications, thread_sensitive=False)(
+            user_id, last_event_id
+        )
+        for item in items:
+            yield _format_sse("notification", _serialize_notification(item), event_id=item.id)
+        if items:
+            last_event_id = items[-1].id
+            if len(items) == NOTIFICATION_STREAM_BATCH:
+                continue
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+
+        while (
+            await notification_hub.await_news(user_id, version, min(NOTIFICATION_STREAM_HEARTBEAT, remaining))
+            == version
+        ):
+            yield ": keep-alive\n\n"
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+
+
+def _visible_notifications(user_id):
+    # Notifications of completed/cancelled bookings are hidden here and deleted
+    # later by the sweep_notifications batch job, so reads never write.
+    return Notification.objects.filter(user_id=user_id).exclude(CLOSED_BOOKING_NOTIFICATIONS)
+
+
+def _open_orders():
+    return (
+        Booking.objects.select_related("user", "car")
+        .exclude(order_stage="completed")
+        .exclude(status="rejected")
+    )
+
+
+def _closed_orders():
+    return Booking.objects.select_related("user", "car").filter(BOOKING_CLOSED)
+
+
+def _customer_orders(user_id):
+    return (
+        Booking.objects.filter(user_id=user_id)
+        .exclude(status="rejected")
+        .select_related("car")
+        .order_by("-created_at")
+    )
+
+
+def _customer_history(user_id):
+    return (
+        Booking.objects.filter(user_id=user_id)
+        .filter(BOOKING_CLOSED)
+        .select_related("car")
+        .order_by("-completed_at", "-created_at")
+    )
+
+
+def _car_filter_q(params):
+    """Q for the catalog filters in params: car_type, fuel_type, seat_capacity (minimum), min_price/max_price per day."""
+    filters = Q()
+    raw_car_type = _clean_text(params.get("car_type"))
+    if raw_car_type:
+        car_type = _normalize_car_type(raw_car_type)
+        if not car_type:
+            return None, "car_type must be one of: Sedan, Coupe, SUV, Hatchback, Convertible"
+        filters &= Q(car_type=car_type)
+
+    raw_fuel_type = _clean_text(params.get("fuel_type"))
+    if raw_fuel_type:
+        fuel_type = _normalize_fuel_type(raw_fuel_type)
+        if not fuel_type:
+            return None, "fuel_type must be one of: Diesel, EV, Petrol, Hybrid"
+        filters &= Q(fuel_type=fuel_type)
+
+    seat_capacity, error_message = _to_int(params.get("seat_capacity"), "seat_capacity", min_value=1, required=False)
+    if error_message:
+        return None, error_message
+    if seat_capacity is not None:
+        filters &= Q(seat_capacity__gte=seat_capacity)
+
+    min_price, error_message = _to_int(params.get("min_price"), "min_price", min_value=0, required=False)
+    if error_message:
+        return None, error_message
+    if min_price is not None:
+        filters &= Q(price_per_day__gte=min_price)
+
+    max_price, error_message = _to_int(params.get("max_price"), "max_price", min_value=0, required=False)
+    if error_message:
+        return None, error_message
+    if max_price is not None:
+        filters &= Q(price_per_day__lte=max_price)
+
+    return filters, None
 
 
-def _cleanup_closed_booking_notifications(user_id):
-    """Remove notifications tied to bookings that are already completed/cancelled."""
-    if not user_id:
-        return 0
+def _catalog_cars_by_id():
+    cars = _car_rows(_car_values(Car.objects.filter(is_active=True).order_by("id")))
+    return {car["id"]: car for car in cars}
 
-    deleted_count, _ = Notification.objects.filter(user_id=user_id).filter(
-        Q(booking__order_stage="completed") | Q(booking__status="rejected")
-    ).delete()
-    return deleted_count
+
+def _free_cars(filters, start_date, end_date, order_by):
+    """Active cars matching filters with no blocking booking overlapping the range, in one NOT EXISTS query."""
+    overlapping = Booking.objects.filter(
+        car=OuterRef("pk"),
+        status__in=BOOKING_BLOCKING_STATUSES,
+        period__overlap=DateRange(start_date, end_date, "[]"),
+    )
+    return (
+        Car.objects.filter(filters, is_active=True)
+        .filter(~Exists(overlapping))
+        .order_by(*order_by)
+        .values("id", "name", "price_per_day")
+    )
 
 
 def _apply_booking_search(queryset, keyword):
@@ -337,13 +825,8 @@ def _apply_booking_search(queryset, keyword):
     if not query:
         return queryset
 
-    conditions = (
-        Q(user__fullName__icontains=query)
-        | Q(user__username__icontains=query)
-        | Q(user__phoneNumber__icontains=query)
-        | Q(car__name__icontains=query)
-        | Q(contact_number__icontains=query)
-    )
+    # search_text is stored lowercased, so a plain LIKE can use its trigram index.
+    conditions = Q(search_text__contains=query.lower())
 
     if query.isdigit():
         conditions |= Q(id=int(query))
@@ -351,6 +834,91 @@ def _apply_booking_search(queryset, keyword):
     return queryset.filter(conditions)
 
 
+def _parse_booking_ids(payload):
+    raw_ids = payload.get("ids")
+    if isinstance(raw_ids, str):
+        raw_ids = raw_ids.split(",")
+    if not isinstance(raw_ids, list) or not raw_ids:
+        return None, "ids must be a non-empty list of order IDs"
+
+    if len(raw_ids) > ORDER_BATCH_LIMIT:
+        return None, f"At most {ORDER_BATCH_LIMIT} orders per request"
+
+    booking_ids = []
+    for raw_id in raw_ids:
+        booking_id, error_message = _to_int(raw_id, "ids", min_value=1)
+        if error_message:
+            return None, "ids must be a non-empty list of order IDs"
+        booking_ids.append(booking_id)
+    return list(dict.fromkeys(booking_ids)), None
+
+
+def _order_batch_request(request):
+    _, error = _require_admin_json(request)
+    if error:
+        return None, error
+
+    if request.method != "POST":
+        return None, JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
+
+    payload, payload_error = _parse_payload(request)
+    if payload_error:
+        return None, payload_error
+
+    booking_ids, error_message = _parse_booking_ids(payload)
+    if error_message:
+        return None, JsonResponse({"success": False, "message": error_message}, status=400)
+    return booking_ids, None
+
+
+def _locked_bookings(booking_ids):
+    # Row locks keep a concurrent single-order action from slipping in between check and UPDATE.
+    bookings = (
+        Booking.objects.select_for_update()
+        .filter(id__in=booking_ids)
+        .only(
+            "id",
+            "user_id",
+            "car_id",
+            "start_date",
+            "end_date",
+            "status",
+            "order_stage",
+            "total_price",
+            "created_at",
+            "completed_at",
+        )
+    )
+    return {booking.id: booking for booking in bookings}
+
+
+def _order_batch_result(booking_id, success, message, booking=None):
+    result = {"id": booking_id, "success": success, "message": message}
+    if booking is not None:
+        result["status"] = booking.status
+        result["order_stage"] = booking.order_stage
+    return result
+
+
+def _finish_order_batch(changed, notifications):
+    """Counters, notifications and NOTIFY for a batch; runs inside its transaction."""
+    record_booking_changes((before, booking_state(booking)) for booking, before in changed)
+    Notification.objects.bulk_create(notifications)
+    announce_notifications(notification.user_id for notification in notifications)
+
+
+def _order_batch_response(booking_ids, results, verb):
+    ordered = [results[booking_id] for booking_id in booking_ids]
+    done = sum(result["success"] for result in ordered)
+    return JsonResponse(
+        {
+            "success": done == len(ordered),
+            "message": f"{done} of {len(ordered)} orders {verb}",
+            "data": {"results": ordered},
+        }
+    )
+
+
 # Index view
 def index(request):
     return render(request, "index.html")
@@ -384,13 +952,7 @@ def login(request):
                     user.password = _hash_password_sha256(password)
                     user.save(update_fields=["password"])
 
-                request.session["user"] = {
-                    "id": user.id,
-                    "fullName": user.fullName,
-                    "phoneNumber": user.phoneNumber,
-                    "username": user.username,
-                    "role": user.role,
-                }
+                request.session["user"] = _session_user(user)
                 request.session.set_expiry(86400)  # 24 hours
 
                 if user.role == "admin":
@@ -474,13 +1036,15 @@ def signup(request):
                 },
             )
 
-        User.objects.create(
-            fullName=fullname,
-            phoneNumber=phone_number,
-            username=username,
-            password=_hash_password_sha256(password),
-            role="customer",
-        )
+        with transaction.atomic():
+            User.objects.create(
+                fullName=fullname,
+                phoneNumber=phone_number,
+                username=username,
+                password=_hash_password_sha256(password),
+                role="customer",
+            )
+            record_user_change(None, "customer")
         return redirect(f"{reverse('login')}?registered=1")
 
     return render(request, "signup.html")
@@ -523,35 +1087,55 @@ def model_page(request):
 
 
 # Approve booking view
+@use_primary
 def approve_booking(request, booking_id):
     user = request.session.get("user")
 
     if not user or user.get("role") != "admin":
         return HttpResponse("Unauthorized", status=401)
 
-    booking = Booking.objects.filter(id=booking_id).first()
-    if booking is None:
-        return HttpResponse("Booking not found", status=404)
+    try:
+        with transaction.atomic():
+            # Locked, so a concurrent transition cannot apply its counter delta from the same "before".
+            booking = Booking.objects.select_for_update().filter(id=booking_id).first()
+            if booking is None:
+                return HttpResponse("Booking not found", status=404)
 
-    booking.status = "approved"
-    booking.save(update_fields=["status"])
+            before = booking_state(booking)
+            booking.status = "approved"
+            booking.save(update_fields=["status"])
+            record_booking_change(before, booking_state(booking))
+    except IntegrityError as error:
+        if not _is_booking_overlap_error(error):
+            raise
+        return HttpResponse("This car is already booked for the selected dates", status=409)
+    availability_index.track_booking(booking)
 
     return redirect("admin")
 
 
 # Reject booking view
+@use_primary
 def reject_booking(request, booking_id):
     user = request.session.get("user")
 
     if not user or user.get("role") != "admin":
         return HttpResponse("Unauthorized", status=401)
 
-    booking = Booking.objects.filter(id=booking_id).first()
-    if booking is None:
-        return HttpResponse("Booking not found", status=404)
+    with transaction.atomic():
+        booking = Booking.objects.select_for_update().filter(id=booking_id).first()
+        if booking is None:
+            return HttpResponse("Booking not found", status=404)
 
-    booking.status = "rejected"
-    booking.save(update_fields=["status"])
+        if booking.status == "rejected" or booking.order_stage == "completed":
+            return redirect("admin")
+
+        before = booking_state(booking)
+        booking.status = "rejected"
+        booking.completed_at = timezone.now()
+        booking.save(update_fields=["status", "completed_at"])
+        record_booking_change(before, booking_state(booking))
+    availability_index.track_booking(booking)
 
     return redirect("admin")
 
@@ -564,34 +1148,138 @@ def admin_dashboard_api(request):
     if request.method != "GET":
         return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
 
-    completed_revenue = (
-        Booking.objects.filter(order_stage="completed").aggregate(total=Sum("total_price"))["total"]
-        or 0
-    )
+    return JsonResponse({"success": True, "data": read_dashboard_counters()})
 
-    data = {
-        "total_users": User.objects.filter(role="customer").count(),
-        "total_admins": User.objects.filter(role="admin").count(),
-        "total_cars": Car.objects.count(),
-        "active_cars": Car.objects.filter(is_active=True).count(),
-        "total_orders": Booking.objects.count(),
-        "incoming_orders": Booking.objects.exclude(order_stage="completed").exclude(status="rejected").count(),
-        "pending_orders": Booking.objects.filter(status="pending").count(),
-        "completed_orders": Booking.objects.filter(order_stage="completed").count(),
-        "completed_revenue": completed_revenue,
-    }
 
+def admin_db_pool_api(request):
+    _, error = _require_admin_json(request)
+    if error:
+        return error
+
+    if request.method != "GET":
+        return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
+
+    # Numbers are for the worker process that answered.
+    data = connection_stats()
+    data["replicas"] = {alias: connection_stats(alias)["pool"] for alias in replica_aliases()}
     return JsonResponse({"success": True, "data": data})
 
 
-def admin_users_api(request):
+def admin_reports_api(request):
+    _, error = _require_admin_json(request)
+    if error:
+        return error
+
+    if request.method != "GET":
+        return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
+
+    bucket = _clean_text(request.GET.get("bucket")).lower() or "day"
+    if bucket not in REPORT_BUCKETS:
+        return JsonResponse({"success": False, "message": "bucket must be day, week or month"}, status=400)
+
+    group = _clean_text(request.GET.get("group")).lower() or "total"
+    if group not in REPORT_GROUPS:
+        return JsonResponse({"success": False, "message": "group must be total, car or car_type"}, status=400)
+
+    try:
+        date_to = _clean_text(request.GET.get("to"))
+        date_to = datetime.strptime(date_to, "%Y-%m-%d").date() if date_to else timezone.localdate()
+        date_from = _clean_text(request.GET.get("from"))
+        date_from = datetime.strptime(date_from, "%Y-%m-%d").date() if date_from else None
+    except ValueError:
+        return JsonResponse({"success": False, "message": "from and to must be YYYY-MM-DD"}, status=400)
+
+    if date_from is None:
+        # Default window: 30 days, 12 weeks or 12 months ending at `to`.
+        if bucket == "day":
+            date_from = date_to - timedelta(days=29)
+        elif bucket == "week":
+            date_from = date_to - timedelta(days=date_to.weekday() + 7 * 11)
+        else:
+            month_index = date_to.year * 12 + date_to.month - 1 - 11
+            date_from = date(month_index // 12, month_index % 12 + 1, 1)
+
+    if date_from > date_to:
+        return JsonResponse({"success": False, "message": "from must not be after to"}, status=400)
+
+    if (date_to - date_from).days > 3660:
+        return JsonResponse({"success": False, "message": "Date range must not exceed 10 years"}, status=400)
+
+    report = rollup_report(date_from, date_to, bucket=bucket, group=group)
+    return JsonResponse(
+        {
+            "success": True,
+            "data": {
+                "bucket": bucket,
+                "group": group,
+                "from": date_from.isoformat(),
+                "to": date_to.isoformat(),
+                **report,
+            },
+        }
+    )
+
+
+def admin_occupancy_api(request):
     _, error = _require_admin_json(request)
     if error:
         return error
 
+    if request.method != "GET":
+        return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
+
+    raw_month = _clean_text(request.GET.get("month"))
+    first_month = timezone.localdate().replace(day=1)
+    try:
+        if raw_month:
+            first_month = datetime.strptime(raw_month, "%Y-%m").date()
+    except ValueError:
+        return JsonResponse({"success": False, "message": "month must be YYYY-MM"}, status=400)
+    if not OCCUPANCY_MIN_YEAR <= first_month.year <= OCCUPANCY_MAX_YEAR:
+        return JsonResponse(
+            {"success": False, "message": f"month must be between {OCCUPANCY_MIN_YEAR} and {OCCUPANCY_MAX_YEAR}"},
+            status=400,
+        )
+
+    months, error_message = _to_int(request.GET.get("months") or 1, "months", min_value=1)
+    if error_message or months > OCCUPANCY_MAX_MONTHS:
+        return JsonResponse(
+            {"success": False, "message": f"months must be between 1 and {OCCUPANCY_MAX_MONTHS}"},
+            status=400,
+        )
+
+    last_month_index = first_month.year * 12 + first_month.month - 1 + months - 1
+    last_day = month_end(date(last_month_index // 12, last_month_index % 12 + 1, 1))
+    days = (last_day - first_month).days + 1
+
+    cars = list(Car.objects.order_by("id").values("id", "name", "car_type", "is_active"))
+    bitmaps = occupancy_bitmaps([car["id"] for car in cars], first_month, months)
+    for car in cars:
+        bits = bitmaps[car["id"]]
+        car["booked_days"] = bits.bit_count()
+        car["bitmap"] = encode_bitmap(bits, days)
+
+    return JsonResponse(
+        {
+            "success": True,
+            "data": {
+                "start_date": first_month.isoformat(),
+                "end_date": last_day.isoformat(),
+                "days": days,
+                "cars": cars,
+            },
+        }
+    )
+
+
+async def admin_users_api(request):
+    _, error = await _arequire_admin_json(request)
+    if error:
+        return error
+
     if request.method == "GET":
         keyword = _clean_text(request.GET.get("q"))
-        users = User.objects.filter(role="customer").order_by("-id")
+        users = User.objects.filter(role="customer")
         if keyword:
             users = users.filter(
                 Q(fullName__icontains=keyword)
@@ -599,11 +1287,15 @@ def admin_users_api(request):
                 | Q(phoneNumber__icontains=keyword)
             )
 
-        return JsonResponse({"success": True, "data": [_serialize_user(user) for user in users]})
+        return await _apaginated_json(request, users.values(*USER_ROW_FIELDS), _user_rows)
 
     if request.method != "POST":
         return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
 
+    return await sync_to_async(_admin_create_customer)(request)
+
+
+def _admin_create_customer(request):
     payload, payload_error = _parse_payload(request)
     if payload_error:
         return payload_error
@@ -631,13 +1323,15 @@ def admin_users_api(request):
     if User.objects.filter(phoneNumber=phone_number).exists():
         return JsonResponse({"success": False, "message": "phoneNumber already exists"}, status=400)
 
-    user = User.objects.create(
-        fullName=full_name,
-        phoneNumber=phone_number,
-        username=username,
-        password=_hash_password_sha256(password),
-        role="customer",
-    )
+    with transaction.atomic():
+        user = User.objects.create(
+            fullName=full_name,
+            phoneNumber=phone_number,
+            username=username,
+            password=_hash_password_sha256(password),
+            role="customer",
+        )
+        record_user_change(None, user.role)
 
     return JsonResponse({"success": True, "data": _serialize_user(user)})
 
@@ -700,7 +1394,10 @@ def admin_user_detail_api(request, user_id):
         if not update_fields:
             return JsonResponse({"success": False, "message": "No valid fields to update"}, status=400)
 
-        user.save(update_fields=update_fields)
+        with transaction.atomic():
+            user.save(update_fields=update_fields)
+            if set(update_fields) & {"fullName", "phoneNumber", "username"}:
+                refresh_booking_search_text(user_id=user.id)
         return JsonResponse({"success": True, "data": _serialize_user(user)})
 
     if request.method == "DELETE":
@@ -713,20 +1410,22 @@ def admin_user_detail_api(request, user_id):
                 status=400,
             )
 
-        user.delete()
+        with transaction.atomic():
+            user.delete()
+            record_user_change(user.role, None)
         return JsonResponse({"success": True})
 
     return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
 
 
-def admin_admins_api(request):
-    _, error = _require_admin_json(request)
+async def admin_admins_api(request):
+    _, error = await _arequire_admin_json(request)
     if error:
         return error
 
     if request.method == "GET":
         keyword = _clean_text(request.GET.get("q"))
-        admins = User.objects.filter(role="admin").order_by("-id")
+        admins = User.objects.filter(role="admin")
         if keyword:
             admins = admins.filter(
                 Q(fullName__icontains=keyword)
@@ -734,11 +1433,15 @@ def admin_admins_api(request):
                 | Q(phoneNumber__icontains=keyword)
             )
 
-        return JsonResponse({"success": True, "data": [_serialize_user(admin) for admin in admins]})
+        return await _apaginated_json(request, admins.values(*USER_ROW_FIELDS), _user_rows)
 
     if request.method != "POST":
         return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
 
+    return await sync_to_async(_admin_create_admin)(request)
+
+
+def _admin_create_admin(request):
     payload, payload_error = _parse_payload(request)
     if payload_error:
         return payload_error
@@ -766,13 +1469,15 @@ def admin_admins_api(request):
     if User.objects.filter(phoneNumber=phone_number).exists():
         return JsonResponse({"success": False, "message": "phoneNumber already exists"}, status=400)
 
-    admin = User.objects.create(
-        fullName=full_name,
-        phoneNumber=phone_number,
-        username=username,
-        password=_hash_password_sha256(password),
-        role="admin",
-    )
+    with transaction.atomic():
+        admin = User.objects.create(
+            fullName=full_name,
+            phoneNumber=phone_number,
+            username=username,
+            password=_hash_password_sha256(password),
+            role="admin",
+        )
+        record_user_change(None, admin.role)
 
     return JsonResponse({"success": True, "data": _serialize_user(admin)})
 
@@ -835,7 +1540,10 @@ def admin_admin_detail_api(request, user_id):
         if not update_fields:
             return JsonResponse({"success": False, "message": "No valid fields to update"}, status=400)
 
-        admin.save(update_fields=update_fields)
+        with transaction.atomic():
+            admin.save(update_fields=update_fields)
+            if set(update_fields) & {"fullName", "phoneNumber", "username"}:
+                refresh_booking_search_text(user_id=admin.id)
 
         if current_user.get("id") == admin.id:
             request.session["user"]["fullName"] = admin.fullName
@@ -858,54 +1566,45 @@ def admin_admin_detail_api(request, user_id):
                 status=400,
             )
 
-        admin.delete()
+        with transaction.atomic():
+            admin.delete()
+            record_user_change(admin.role, None)
         return JsonResponse({"success": True})
 
     return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
 
 
-def public_cars_api(request):
+async def public_cars_api(request):
     if request.method != "GET":
         return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
 
     keyword = _clean_text(request.GET.get("q"))
-    cars = Car.objects.filter(is_active=True).prefetch_related("images").order_by("id")
-
-    if keyword:
-        cars = cars.filter(
-            Q(name__icontains=keyword)
-            | Q(car_type__icontains=keyword)
-            | Q(fuel_type__icontains=keyword)
-        )
-
-    return JsonResponse({"success": True, "data": [_serialize_car(car) for car in cars]})
-
-
-def admin_cars_api(request):
-    _, error = _require_admin_json(request)
-    if error:
-        return error
-
-    if request.method == "GET":
-        keyword = _clean_text(request.GET.get("q"))
-        cars = Car.objects.all().prefetch_related("images").order_by("-id")
 
+    def build_body():
+        cars = Car.objects.filter(is_active=True).order_by("id")
         if keyword:
             cars = cars.filter(
                 Q(name__icontains=keyword)
                 | Q(car_type__icontains=keyword)
                 | Q(fuel_type__icontains=keyword)
             )
+        return json_response({"success": True, "data": _car_rows(_car_values(cars))}).content
 
-        return JsonResponse({"success": True, "data": [_serialize_car(car) for car in cars]})
+    # Served from the cache until an admin car/image write bumps the catalog version.
+    etag, body = await sync_to_async(cached_catalog_response)(keyword, build_body)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        not_modified["Cache-Control"] = "no-cache"
+        return not_modified
 
-    if request.method != "POST":
-        return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
+    response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    return response
 
-    payload, payload_error = _parse_payload(request)
-    if payload_error:
-        return payload_error
 
+# Shared by the admin create form and the bulk import (api.car_import).
+def _car_fields_from_payload(payload):
     name = _clean_text(payload.get("name"))
     raw_fuel_type = _clean_text(payload.get("fuel_type"))
     fuel_type = _normalize_fuel_type(raw_fuel_type)
@@ -913,78 +1612,133 @@ def admin_cars_api(request):
     raw_car_type = _clean_text(payload.get("car_type"))
     car_type = _normalize_car_type(raw_car_type)
 
-    price_per_day, error_message = _to_int(payload.get("price_per_day"), "price_per_day", min_value=0)
+    price_per_day, error_message = _to_int(payload.get("price_per_day"), "price_per_day", min_value=0, max_value=INTEGER_MAX)
     if error_message:
-        return JsonResponse({"success": False, "message": error_message}, status=400)
+        return None, error_message
 
-    seat_capacity, error_message = _to_int(payload.get("seat_capacity"), "seat_capacity", min_value=1)
+    seat_capacity, error_message = _to_int(payload.get("seat_capacity"), "seat_capacity", min_value=1, max_value=SMALLINT_MAX)
     if error_message:
-        return JsonResponse({"success": False, "message": error_message}, status=400)
+        return None, error_message
 
-    engine_cc, error_message = _to_int(payload.get("engine_cc"), "engine_cc", min_value=0)
+    engine_cc, error_message = _to_int(payload.get("engine_cc"), "engine_cc", min_value=0, max_value=INTEGER_MAX)
     if error_message:
-        return JsonResponse({"success": False, "message": error_message}, status=400)
+        return None, error_message
 
-    horsepower, error_message = _to_int(payload.get("horsepower"), "horsepower", min_value=0)
+    horsepower, error_message = _to_int(payload.get("horsepower"), "horsepower", min_value=0, max_value=INTEGER_MAX)
     if error_message:
-        return JsonResponse({"success": False, "message": error_message}, status=400)
+        return None, error_message
 
     if raw_fuel_type and not fuel_type:
-        return JsonResponse(
-            {
-                "success": False,
-                "message": "fuel_type must be one of: Diesel, EV, Petrol, Hybrid",
-            },
-            status=400,
-        )
+        return None, "fuel_type must be one of: Diesel, EV, Petrol, Hybrid"
 
     if raw_car_type and not car_type:
-        return JsonResponse(
-            {
-                "success": False,
-                "message": "car_type must be one of: Sedan, Coupe, SUV, Hatchback, Convertible",
-            },
-            status=400,
-        )
+        return None, "car_type must be one of: Sedan, Coupe, SUV, Hatchback, Convertible"
 
     if not name or not fuel_type or not fuel_consumption or not car_type:
-        return JsonResponse(
-            {
-                "success": False,
-                "message": "name, fuel_type, fuel_consumption and car_type are required",
-            },
-            status=400,
-        )
+        return None, "name, fuel_type, fuel_consumption and car_type are required"
 
-    car = Car.objects.create(
-        name=name,
-        price_per_day=price_per_day,
-        fuel_type=fuel_type,
-        fuel_consumption=fuel_consumption,
-        car_type=car_type,
-        seat_capacity=seat_capacity,
-        engine_cc=engine_cc,
-        horsepower=horsepower,
-        is_active=_to_bool(payload.get("is_active"), default=True),
-    )
+    if len(name) > 100 or len(fuel_consumption) > 50:
+        return None, "name or fuel_consumption is too long"
 
-    raw_images = payload.get("images") or []
-    if isinstance(raw_images, list):
-        for item in raw_images:
-            if isinstance(item, dict):
-                image_url = _clean_text(item.get("image_url"))
-                caption = _clean_text(item.get("caption"))
-            else:
-                image_url = _clean_text(item)
-                caption = ""
+    return {
+        "name": name,
+        "price_per_day": price_per_day,
+        "fuel_type": fuel_type,
+        "fuel_consumption": fuel_consumption,
+        "car_type": car_type,
+        "seat_capacity": seat_capacity,
+        "engine_cc": engine_cc,
+        "horsepower": horsepower,
+        "is_active": _to_bool(payload.get("is_active"), default=True),
+    }, None
+
+
+async def admin_cars_api(request):
+    _, error = await _arequire_admin_json(request)
+    if error:
+        return error
+
+    if request.method == "GET":
+        keyword = _clean_text(request.GET.get("q"))
+        cars = Car.objects.all()
+
+        if keyword:
+            cars = cars.filter(
+                Q(name__icontains=keyword)
+                | Q(car_type__icontains=keyword)
+                | Q(fuel_type__icontains=keyword)
+            )
 
-            if image_url:
-                CarImage.objects.create(car=car, image_url=image_url, caption=caption)
+        return await _apaginated_json(request, _car_values(cars), _car_rows)
 
+    if request.method != "POST":
+        return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
+
+    return await sync_to_async(_admin_create_car)(request)
+
+
+def _admin_create_car(request):
+    payload, payload_error = _parse_payload(request)
+    if payload_error:
+        return payload_error
+
+    fields, error_message = _car_fields_from_payload(payload)
+    if error_message:
+        return JsonResponse({"success": False, "message": error_message}, status=400)
+
+    with transaction.atomic():
+        car = Car.objects.create(**fields)
+        record_car_change(None, car.is_active)
+
+        raw_images = payload.get("images") or []
+        if isinstance(raw_images, list):
+            for item in raw_images:
+                if isinstance(item, dict):
+                    image_url = _clean_text(item.get("image_url"))
+                    caption = _clean_text(item.get("caption"))
+                else:
+                    image_url = _clean_text(item)
+                    caption = ""
+
+                if image_url:
+                    CarImage.objects.create(car=car, image_url=image_url, caption=caption)
+
+    availability_index.invalidate()
+    bump_catalog_version()
     car = Car.objects.prefetch_related("images").get(id=car.id)
+    for image in car.images.all():
+        image_variant_pipeline.schedule(image)
     return JsonResponse({"success": True, "data": _serialize_car(car)})
 
 
+def admin_cars_import_api(request):
+    _, error = _require_admin_json(request)
+    if error:
+        return error
+
+    if request.method != "POST":
+        return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
+
+    uploaded_file = request.FILES.get("file")
+    if uploaded_file is None:
+        return JsonResponse({"success": False, "message": "file is required"}, status=400)
+
+    if uploaded_file.size > 20 * 1024 * 1024:
+        return JsonResponse({"success": False, "message": "Import file must not exceed 20 MB"}, status=400)
+
+    try:
+        rows = read_car_rows(uploaded_file.file, uploaded_file.name)
+    except CarImportError as exc:
+        return JsonResponse({"success": False, "message": str(exc)}, status=400)
+
+    result = import_car_rows(
+        rows,
+        _car_fields_from_payload,
+        dry_run=_to_bool(request.POST.get("dry_run")),
+    )
+    return JsonResponse({"success": not result["error_count"], "data": result})
+
+
 def admin_car_detail_api(request, car_id):
     _, error = _require_admin_json(request)
     if error:
@@ -1002,6 +1756,7 @@ def admin_car_detail_api(request, car_id):
         if payload_error:
             return payload_error
 
+        was_active = car.is_active
         update_fields = []
 
         if "name" in payload:
@@ -1012,7 +1767,7 @@ def admin_car_detail_api(request, car_id):
             update_fields.append("name")
 
         if "price_per_day" in payload:
-            price_per_day, error_message = _to_int(payload.get("price_per_day"), "price_per_day", min_value=0)
+            price_per_day, error_message = _to_int(payload.get("price_per_day"), "price_per_day", min_value=0, max_value=INTEGER_MAX)
             if error_message:
                 return JsonResponse({"success": False, "message": error_message}, status=400)
             car.price_per_day = price_per_day
@@ -1052,21 +1807,21 @@ def admin_car_detail_api(request, car_id):
             update_fields.append("car_type")
 
         if "seat_capacity" in payload:
-            seat_capacity, error_message = _to_int(payload.get("seat_capacity"), "seat_capacity", min_value=1)
+            seat_capacity, error_message = _to_int(payload.get("seat_capacity"), "seat_capacity", min_value=1, max_value=SMALLINT_MAX)
             if error_message:
                 return JsonResponse({"success": False, "message": error_message}, status=400)
             car.seat_capacity = seat_capacity
             update_fields.append("seat_capacity")
 
         if "engine_cc" in payload:
-            engine_cc, error_message = _to_int(payload.get("engine_cc"), "engine_cc", min_value=0)
+            engine_cc, error_message = _to_int(payload.get("engine_cc"), "engine_cc", min_value=0, max_value=INTEGER_MAX)
             if error_message:
                 return JsonResponse({"success": False, "message": error_message}, status=400)
             car.engine_cc = engine_cc
             update_fields.append("engine_cc")
 
         if "horsepower" in payload:
-            horsepower, error_message = _to_int(payload.get("horsepower"), "horsepower", min_value=0)
+            horsepower, error_message = _to_int(payload.get("horsepower"), "horsepower", min_value=0, max_value=INTEGER_MAX)
             if error_message:
                 return JsonResponse({"success": False, "message": error_message}, status=400)
             car.horsepower = horsepower
@@ -1079,14 +1834,25 @@ def admin_car_detail_api(request, car_id):
         if not update_fields:
             return JsonResponse({"success": False, "message": "No valid fields to update"}, status=400)
 
-        car.save(update_fields=update_fields)
+        with transaction.atomic():
+            car.save(update_fields=update_fields)
+            record_car_change(was_active, car.is_active)
+            if "name" in update_fields:
+                refresh_booking_search_text(car_id=car.id)
+        availability_index.invalidate()
+        bump_catalog_version()
         car.refresh_from_db()
         return JsonResponse({"success": True, "data": _serialize_car(car)})
 
     if request.method == "DELETE":
         if Booking.objects.filter(car=car).exists():
+            was_active = car.is_active
             car.is_active = False
-            car.save(update_fields=["is_active"])
+            with transaction.atomic():
+                car.save(update_fields=["is_active"])
+                record_car_change(was_active, car.is_active)
+            availability_index.invalidate()
+            bump_catalog_version()
             return JsonResponse(
                 {
                     "success": True,
@@ -1094,7 +1860,11 @@ def admin_car_detail_api(request, car_id):
                 }
             )
 
-        car.delete()
+        with transaction.atomic():
+            car.delete()
+            record_car_change(car.is_active, None)
+        availability_index.invalidate()
+        bump_catalog_version()
         return JsonResponse({"success": True})
 
     return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
@@ -1123,6 +1893,8 @@ def admin_car_images_api(request, car_id):
         return JsonResponse({"success": False, "message": "image_url is required"}, status=400)
 
     image = CarImage.objects.create(car=car, image_url=image_url, caption=caption)
+    bump_catalog_version()
+    image_variant_pipeline.schedule(image)
     return JsonResponse({"success": True, "data": _serialize_car_image(image)})
 
 
@@ -1172,6 +1944,8 @@ def admin_car_image_upload_api(request, car_id):
 
     caption = _clean_text(request.POST.get("caption"))
     image = CarImage.objects.create(car=car, image_url=image_url, caption=caption)
+    bump_catalog_version()
+    image_variant_pipeline.schedule(image)
 
     return JsonResponse({"success": True, "data": _serialize_car_image(image)})
 
@@ -1196,6 +1970,11 @@ def admin_car_image_detail_api(request, car_id, image_id):
             image_url = _clean_text(payload.get("image_url"))
             if not image_url:
                 return JsonResponse({"success": False, "message": "image_url is required"}, status=400)
+            if image_url != image.image_url:
+                # Derivatives of the old source no longer apply.
+                delete_image_variants(image)
+                image.variants = {}
+                update_fields.append("variants")
             image.image_url = image_url
             update_fields.append("image_url")
 
@@ -1207,6 +1986,9 @@ def admin_car_image_detail_api(request, car_id, image_id):
             return JsonResponse({"success": False, "message": "No valid fields to update"}, status=400)
 
         image.save(update_fields=update_fields)
+        bump_catalog_version()
+        if "variants" in update_fields:
+            image_variant_pipeline.schedule(image)
         return JsonResponse({"success": True, "data": _serialize_car_image(image)})
 
     if request.method == "DELETE":
@@ -1214,7 +1996,9 @@ def admin_car_image_detail_api(request, car_id, image_id):
             relative_path = image.image_url[len(settings.MEDIA_URL):]
             if relative_path and default_storage.exists(relative_path):
                 default_storage.delete(relative_path)
+        delete_image_variants(image)
         image.delete()
+        bump_catalog_version()
         return JsonResponse({"success": True})
 
     return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
@@ -1228,52 +2012,50 @@ def admin_order_stage_approve_api(request, booking_id):
     if request.method != "POST":
         return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
 
-    booking = Booking.objects.select_related("user", "car").filter(id=booking_id).first()
-    if booking is None:
-        return JsonResponse({"success": False, "message": "Order not found"}, status=404)
+    with transaction.atomic():
+        # Checks and "before" come from the locked row, so two concurrent approvals cannot both apply.
+        booking = (
+            Booking.objects.select_related("user", "car")
+            .select_for_update(of=("self",))
+            .filter(id=booking_id)
+            .first()
+        )
+        if booking is None:
+            return JsonResponse({"success": False, "message": "Order not found"}, status=404)
 
-    if booking.status == "rejected":
-        return JsonResponse({"success": False, "message": "This order is rejected"}, status=400)
+        if booking.status == "rejected":
+            return JsonResponse({"success": False, "message": "This order is rejected"}, status=400)
 
-    if booking.order_stage == "completed":
-        return JsonResponse({"success": False, "message": "This order is already completed"}, status=400)
+        if booking.order_stage == "completed":
+            return JsonResponse({"success": False, "message": "This order is already completed"}, status=400)
 
-    message = ""
-    update_fields = []
+        approval = ADMIN_STAGE_APPROVALS.get(booking.order_stage)
+        if approval is None:
+            return JsonResponse(
+                {
+                    "success": False,
+                    "message": "This stage does not require admin approval",
+                },
+                status=400,
+            )
 
-    if booking.order_stage == "awaiting_contact":
-        booking.order_stage = "awaiting_deposit"
-        update_fields.append("order_stage")
-        if booking.status != "approved":
-            booking.status = "approved"
-            update_fields.append("status")
-        _create_user_notification(
-            user=booking.user,
-            booking=booking,
-            title=f"Order #{booking.id}: Callback approved",
-            message="Admin approved callback confirmation. You can now pay 30% deposit.",
-        )
-        message = "Callback approved. Customer can proceed to 30% deposit."
-    elif booking.order_stage == "awaiting_handover":
-        booking.order_stage = "awaiting_full_payment"
-        update_fields.append("order_stage")
+        before = booking_state(booking)
+        update_fields = []
+        for field, value in approval["update"].items():
+            if getattr(booking, field) != value:
+                setattr(booking, field, value)
+                update_fields.append(field)
+        message = approval["message"]
+
+        booking.save(update_fields=update_fields)
+        record_booking_change(before, booking_state(booking))
         _create_user_notification(
             user=booking.user,
             booking=booking,
-            title=f"Order #{booking.id}: Pickup/Delivery approved",
-            message="Admin confirmed pickup or delivery. You can now pay the full amount.",
+            title=f"Order #{booking.id}: {approval['title']}",
+            message=approval["notification"],
         )
-        message = "Pickup/delivery confirmed. Customer can proceed to full payment."
-    else:
-        return JsonResponse(
-            {
-                "success": False,
-                "message": "This stage does not require admin approval",
-            },
-            status=400,
-        )
-
-    booking.save(update_fields=update_fields)
+    availability_index.track_booking(booking)
     booking.refresh_from_db()
 
     return JsonResponse(
@@ -1293,34 +2075,43 @@ def admin_order_cancel_api(request, booking_id):
     if request.method != "POST":
         return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
 
-    booking = Booking.objects.select_related("user", "car").filter(id=booking_id).first()
-    if booking is None:
-        return JsonResponse({"success": False, "message": "Order not found"}, status=404)
-
-    if booking.order_stage == "completed":
-        return JsonResponse(
-            {"success": False, "message": "Completed orders cannot be cancelled"},
-            status=400,
+    with transaction.atomic():
+        booking = (
+            Booking.objects.select_related("user", "car")
+            .select_for_update(of=("self",))
+            .filter(id=booking_id)
+            .first()
         )
+        if booking is None:
+            return JsonResponse({"success": False, "message": "Order not found"}, status=404)
 
-    if booking.status == "rejected":
-        return JsonResponse(
-            {
-                "success": True,
-                "message": "This order is already cancelled",
-                "data": _serialize_booking(booking),
-            }
-        )
+        if booking.order_stage == "completed":
+            return JsonResponse(
+                {"success": False, "message": "Completed orders cannot be cancelled"},
+                status=400,
+            )
 
-    booking.status = "rejected"
-    booking.completed_at = timezone.now()
-    booking.save(update_fields=["status", "completed_at"])
+        if booking.status == "rejected":
+            return JsonResponse(
+                {
+                    "success": True,
+                    "message": "This order is already cancelled",
+                    "data": _serialize_booking(booking),
+                }
+            )
+
+        before = booking_state(booking)
+        booking.status = "rejected"
+        booking.completed_at = timezone.now()
+        booking.save(update_fields=["status", "completed_at"])
+        record_booking_change(before, booking_state(booking))
+    availability_index.track_booking(booking)
 
     _create_user_notification(
         user=booking.user,
         booking=booking,
-        title=f"Order #{booking.id}: Cancelled by admin",
-        message="Admin cancelled this order. Please contact support if you need more details.",
+        title=f"Order #{booking.id}: {ADMIN_CANCEL_TITLE}",
+        message=ADMIN_CANCEL_NOTIFICATION,
     )
 
     booking.refresh_from_db()
@@ -1333,20 +2124,120 @@ def admin_order_cancel_api(request, booking_id):
     )
 
 
-def admin_orders_api(request):
-    _, error = _require_admin_json(request)
+def admin_orders_batch_approve_stage_api(request):
+    booking_ids, error = _order_batch_request(request)
+    if error:
+        return error
+
+    results = {}
+    changed = []
+    with transaction.atomic():
+        bookings = _locked_bookings(booking_ids)
+        by_stage = {}
+        for booking_id in booking_ids:
+            booking = bookings.get(booking_id)
+            if booking is None:
+                results[booking_id] = _order_batch_result(booking_id, False, "Order not found")
+            elif booking.status == "rejected":
+                results[booking_id] = _order_batch_result(booking_id, False, "This order is rejected", booking)
+            elif booking.order_stage == "completed":
+                results[booking_id] = _order_batch_result(booking_id, False, "This order is already completed", booking)
+            elif booking.order_stage not in ADMIN_STAGE_APPROVALS:
+                results[booking_id] = _order_batch_result(
+                    booking_id, False, "This stage does not require admin approval", booking
+                )
+            else:
+                by_stage.setdefault(booking.order_stage, []).append(booking)
+
+        notifications = []
+        for stage, stage_bookings in by_stage.items():
+            approval = ADMIN_STAGE_APPROVALS[stage]
+            Booking.objects.filter(
+                id__in=[booking.id for booking in stage_bookings],
+                order_stage=stage,
+            ).exclude(status="rejected").update(**approval["update"])
+
+            for booking in stage_bookings:
+                changed.append((booking, booking_state(booking)))
+                for field, value in approval["update"].items():
+                    setattr(booking, field, value)
+                notifications.append(
+                    Notification(
+                        user_id=booking.user_id,
+                        booking_id=booking.id,
+                        title=f"Order #{booking.id}: {approval['title']}",
+                        message=approval["notification"],
+                    )
+                )
+                results[booking.id] = _order_batch_result(booking.id, True, approval["message"], booking)
+
+        _finish_order_batch(changed, notifications)
+
+    for booking, _ in changed:
+        availability_index.track_booking(booking)
+    return _order_batch_response(booking_ids, results, "approved")
+
+
+def admin_orders_batch_cancel_api(request):
+    booking_ids, error = _order_batch_request(request)
+    if error:
+        return error
+
+    results = {}
+    changed = []
+    with transaction.atomic():
+        bookings = _locked_bookings(booking_ids)
+        to_cancel = []
+        for booking_id in booking_ids:
+            booking = bookings.get(booking_id)
+            if booking is None:
+                results[booking_id] = _order_batch_result(booking_id, False, "Order not found")
+            elif booking.order_stage == "completed":
+                results[booking_id] = _order_batch_result(
+                    booking_id, False, "Completed orders cannot be cancelled", booking
+                )
+            elif booking.status == "rejected":
+                results[booking_id] = _order_batch_result(booking_id, True, "This order is already cancelled", booking)
+            else:
+                to_cancel.append(booking)
+
+        completed_at = timezone.now()
+        if to_cancel:
+            Booking.objects.filter(id__in=[booking.id for booking in to_cancel]).exclude(
+                order_stage="completed"
+            ).exclude(status="rejected").update(status="rejected", completed_at=completed_at)
+
+        notifications = []
+        for booking in to_cancel:
+            changed.append((booking, booking_state(booking)))
+            booking.status = "rejected"
+            booking.completed_at = completed_at
+            notifications.append(
+                Notification(
+                    user_id=booking.user_id,
+                    booking_id=booking.id,
+                    title=f"Order #{booking.id}: {ADMIN_CANCEL_TITLE}",
+                    message=ADMIN_CANCEL_NOTIFICATION,
+                )
+            )
+            results[booking.id] = _order_batch_result(booking.id, True, "Order cancelled successfully", booking)
+
+        _finish_order_batch(changed, notifications)
+
+    for booking, _ in changed:
+        availability_index.track_booking(booking)
+    return _order_batch_response(booking_ids, results, "cancelled")
+
+
+async def admin_orders_api(request):
+    _, error = await _arequire_admin_json(request)
     if error:
         return error
 
     if request.method != "GET":
         return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
 
-    bookings = (
-        Booking.objects.select_related("user", "car")
-        .exclude(order_stage="completed")
-        .exclude(status="rejected")
-        .order_by("-created_at")
-    )
+    bookings = _open_orders()
 
     status = _clean_text(request.GET.get("status"))
     stage = _clean_text(request.GET.get("stage"))
@@ -1359,29 +2250,74 @@ def admin_orders_api(request):
 
     bookings = _apply_booking_search(bookings, request.GET.get("q"))
 
-    return JsonResponse({"success": True, "data": [_serialize_booking(booking) for booking in bookings]})
+    return await _apaginated_json(
+        request, bookings.values(*BOOKING_ROW_FIELDS), _booking_rows, field="created_at"
+    )
 
 
-def admin_history_api(request):
-    _, error = _require_admin_json(request)
+async def admin_history_api(request):
+    _, error = await _arequire_admin_json(request)
     if error:
         return error
 
     if request.method != "GET":
         return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
 
-    bookings = (
-        Booking.objects.select_related("user", "car")
-        .filter(Q(order_stage="completed") | Q(status="rejected"))
-        .order_by("-completed_at", "-created_at")
+    bookings = _closed_orders()
+    bookings = _apply_booking_search(bookings, request.GET.get("q"))
+
+    return await _apaginated_json(
+        request, bookings.values(*BOOKING_ROW_FIELDS), _booking_rows, field="completed_at"
     )
+
+
+def admin_history_export_api(request):
+    _, error = _require_admin_json(request)
+    if error:
+        return error
+
+    if request.method != "GET":
+        return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
+
+    export_format = _clean_text(request.GET.get("format")).lower() or "csv"
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse({"success": False, "message": "format must be csv or ndjson"}, status=400)
+
+    # Optional completion date range (YYYY-MM-DD, inclusive, shop-local days).
+    try:
+        date_from = _clean_text(request.GET.get("from"))
+        date_from = datetime.strptime(date_from, "%Y-%m-%d").date() if date_from else None
+        date_to = _clean_text(request.GET.get("to"))
+        date_to = datetime.strptime(date_to, "%Y-%m-%d").date() if date_to else None
+    except ValueError:
+        return JsonResponse({"success": False, "message": "from and to must be YYYY-MM-DD"}, status=400)
+
+    if date_from and date_to and date_from > date_to:
+        return JsonResponse({"success": False, "message": "from must not be after to"}, status=400)
+
+    bookings = Booking.objects.filter(BOOKING_CLOSED)
+    if date_from:
+        day_start = datetime.combine(date_from, datetime.min.time())
+        bookings = bookings.filter(completed_at__gte=timezone.make_aware(day_start))
+    if date_to:
+        next_day_start = datetime.combine(date_to + timedelta(days=1), datetime.min.time())
+        bookings = bookings.filter(completed_at__lt=timezone.make_aware(next_day_start))
     bookings = _apply_booking_search(bookings, request.GET.get("q"))
 
-    return JsonResponse({"success": True, "data": [_serialize_booking(booking) for booking in bookings]})
+    stream = stream_history_export(bookings, export_format)
+    if isinstance(request, ASGIRequest):
+        # ASGI would otherwise read the whole export into a list before sending a byte.
+        stream = aiter_sync(stream)
 
+    response = StreamingHttpResponse(stream, content_type=EXPORT_FORMATS[export_format])
+    file_name = f"order-history-{timezone.localdate():%Y%m%d}.{export_format}"
+    response["Content-Disposition"] = f'attachment; filename="{file_name}"'
+    response["Cache-Control"] = "no-store"
+    return response
 
-def user_notifications_api(request):
-    user_session, error = _require_customer_json(request)
+
+async def user_notifications_api(request):
+    user_session, error = await _arequire_customer_json(request)
     if error:
         return error
 
@@ -1395,10 +2331,9 @@ def user_notifications_api(request):
         limit = 20
 
     limit = max(1, min(limit, 50))
-    _cleanup_closed_booking_notifications(user_session["id"])
-    queryset = Notification.objects.filter(user_id=user_session["id"]).select_related("booking")
-    notifications = list(queryset[:limit])
-    unread_count = queryset.filter(is_read=False).count()
+    queryset = _visible_notifications(user_session["id"])
+    notifications = [item async for item in queryset[:limit]]
+    unread_count = await queryset.filter(is_read=False).acount()
 
     return JsonResponse(
         {
@@ -1411,6 +2346,42 @@ def user_notifications_api(request):
     )
 
 
+def _notifications_stream_enabled(request):
+    return isinstance(request, ASGIRequest) or settings.NOTIFICATION_STREAM_WSGI
+
+
+async def user_notifications_stream_api(request):
+    user_session, error = await _arequire_customer_json(request)
+    if error:
+        return error
+
+    if request.method != "GET":
+        return JsonResponse({"success": False, "message": "Method not allowed"}, status=405)
+
+    raw_cursor = _clean_text(request.headers.get("Last-Event-ID") or request.GET.get("last_event_id"))
+    # Without a cursor, only stream notifications created from now on.
+    last_event_id = int(raw_cursor) if raw_cursor.isdigit() else None
+
+    # WSGI buffers an async iterator whole, and ASGI would drain a sync one in a thread.
+    if isinstance(request, ASGIRequest):
+        # The session read above may have opened a connection on this request's sync
+        # thread; it would otherwise stay open until the stream ends.
+        await sync_to_async(connections.close_all)()
+        stream = _astream_notifications(user_session["id"], last_event_id)
+    elif not settings.NOTIFICATION_STREAM_WSGI:
+        # 204 makes EventSource give up, and the page falls back to polling.
+        return HttpResponse(status=204)
+    else:
+        if last_event_id is None:
+            last_event_id = await sync_to_async(_latest_notification_id)(user_session["id"])
+        stream = _stream_notifications(user_session["id"], last_event_id)
+
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 def user_notifications_mark_read_api(request):
     user_session, error = _require_customer_json(request)
     if error:
@@ -1499,10 +2470,9 @@ def booking(request):
             if not (-90 <= delivery_lat <= 90 and -180 <= delivery_lng <= 180):
                 return HttpResponse("Delivery map coordinates are out of range")
 
-        try:
-            user = User.objects.get(id=user_session["id"])
-            car = Car.objects.get(id=car_id, is_active=True)
-        except (User.DoesNotExist, Car.DoesNotExist):
+        user = _current_user(request)
+        car = Car.objects.filter(id=car_id, is_active=True).first()
+        if user is None or car is None:
             return HttpResponse("User or selected car not found")
 
         try:
@@ -1517,28 +2487,36 @@ def booking(request):
         if end_date < start_date:
             return HttpResponse("End date must be greater than or equal to start date")
 
-        if _has_overlapping_booking(car, start_date, end_date):
-            return HttpResponse("This car is already booked for the selected dates")
-
         total_days = (end_date - start_date).days + 1
         total_price = car.price_per_day * total_days
 
-        new_booking = Booking.objects.create(
-            user=user,
-            car=car,
-            start_date=start_date,
-            end_date=end_date,
-            current_province=current_province,
-            destination_province=destination_province,
-            pickup_type=pickup_type,
-            delivery_lat=delivery_lat,
-            delivery_lng=delivery_lng,
-            delivery_address=delivery_address,
-            total_price=total_price,
-            contact_number=contact_number,
-            status="pending",
-            order_stage="awaiting_contact",
-        )
+        # The exclusion constraint on (car, period) rejects overlapping bookings
+        # atomically, so concurrent requests cannot double-book the same car.
+        try:
+            with transaction.atomic():
+                new_booking = Booking.objects.create(
+                    user=user,
+                    car=car,
+                    start_date=start_date,
+                    end_date=end_date,
+                    current_province=current_province,
+                    destination_province=destination_province,
+                    pickup_type=pickup_type,
+                    delivery_lat=delivery_lat,
+                    delivery_lng=delivery_lng,
+                    delivery_address=delivery_address,
+                    total_price=total_price,
+                    contact_number=contact_number,
+                    search_text=booking_search_text(user, car, contact_number),
+                    status="pending",
+                    order_stage="awaiting_contact",
+                )
+                record_booking_change(None, booking_state(new_booking))
+        except IntegrityError as error:
+            if not _is_booking_overlap_error(error):
+                raise
+            return HttpResponse("This car is already booked for the selected dates")
+        availability_index.track_booking(new_booking)
 
         return redirect(f"{reverse('order')}?booking_id={new_booking.id}")
 
@@ -1558,8 +2536,8 @@ def booking(request):
 
 
 # API for availability by date range
-def booking_availability(request):
-    user_session = request.session.get("user")
+async def booking_availability(request):
+    user_session = await request.session.aget("user")
     if not user_session:
         return JsonResponse({"error": "Unauthorized"}, status=401)
 
@@ -1581,37 +2559,88 @@ def booking_availability(request):
     if end_date < start_date:
         return JsonResponse({"error": "end_date must be greater than or equal to start_date"}, status=400)
 
-    cars = list(Car.objects.filter(is_active=True).order_by("id"))
-    overlapping_car_ids = set(
-        Booking.objects.filter(
-            status__in=BOOKING_BLOCKING_STATUSES,
-            start_date__lte=end_date,
-            end_date__gte=start_date,
-            car__in=cars,
-        ).values_list("car_id", flat=True)
-    )
+    days = (end_date - start_date).days + 1
+    if any(request.GET.get(name) for name in AVAILABILITY_FILTER_PARAMS):
+        filters, error_message = _car_filter_q(request.GET)
+        if error_message:
+            return JsonResponse({"error": error_message}, status=400)
 
-    payload = []
-    for car in cars:
-        payload.append(
+        sort = _clean_text(request.GET.get("sort")) or "price"
+        if sort not in AVAILABILITY_SORTS:
+            return JsonResponse({"error": f"sort must be one of: {', '.join(AVAILABILITY_SORTS)}"}, status=400)
+
+        # Only free matching cars; details (images, specs) come from the cached catalog.
+        catalog = await sync_to_async(cached_catalog_cars)(_catalog_cars_by_id)
+        payload = [
             {
-                "id": car.id,
-                "name": car.name,
-                "price_per_day": car.price_per_day,
-                "is_available": car.id not in overlapping_car_ids,
+                **catalog.get(car["id"], {}),
+                **car,
+                "is_available": True,
+                "total_price": car["price_per_day"] * days,
             }
-        )
+            async for car in _free_cars(filters, start_date, end_date, AVAILABILITY_SORTS[sort])
+        ]
+    else:
+        # A stale index rebuilds from the database, so it runs off the event loop.
+        payload = await sync_to_async(availability_index.cars_for_range)(start_date, end_date)
 
     return JsonResponse(
         {
             "start_date": start_date_str,
             "end_date": end_date_str,
-            "days": (end_date - start_date).days + 1,
+            "days": days,
             "cars": payload,
         }
     )
 
 
+def booking_next_available(request):
+    user_session = request.session.get("user")
+    if not user_session:
+        return JsonResponse({"error": "Unauthorized"}, status=401)
+
+    days, error_message = _to_int(request.GET.get("days"), "days", min_value=1)
+    if error_message or days > NEXT_AVAILABLE_MAX_DAYS:
+        return JsonResponse({"error": f"days must be between 1 and {NEXT_AVAILABLE_MAX_DAYS}"}, status=400)
+
+    limit, error_message = _to_int(request.GET.get("limit") or 3, "limit", min_value=1)
+    if error_message or limit > NEXT_AVAILABLE_MAX_WINDOWS:
+        return JsonResponse({"error": f"limit must be between 1 and {NEXT_AVAILABLE_MAX_WINDOWS}"}, status=400)
+
+    # Bookings start at least one day ahead, so no window starts before tomorrow.
+    earliest = date.today() + timedelta(days=1)
+    after_str = _clean_text(request.GET.get("after"))
+    try:
+        after = max(datetime.strptime(after_str, "%Y-%m-%d").date(), earliest) if after_str else earliest
+    except ValueError:
+        return JsonResponse({"error": "Invalid date format, expected YYYY-MM-DD"}, status=400)
+    latest = date.today() + timedelta(days=NEXT_AVAILABLE_MAX_AHEAD_DAYS)
+    if after > latest:
+        return JsonResponse({"error": f"after must be on or before {latest.isoformat()}"}, status=400)
+
+    raw_car_ids = _clean_text(request.GET.get("car_id"))
+    if raw_car_ids:
+        try:
+            car_ids = [int(car_id) for car_id in raw_car_ids.split(",")]
+        except ValueError:
+            return JsonResponse({"error": "car_id must be a comma-separated list of IDs"}, status=400)
+        if len(car_ids) > NEXT_AVAILABLE_MAX_CARS:
+            return JsonResponse({"error": f"At most {NEXT_AVAILABLE_MAX_CARS} car IDs per request"}, status=400)
+    else:
+        filters, error_message = _car_filter_q(request.GET)
+        if error_message:
+            return JsonResponse({"error": error_message}, status=400)
+        car_ids = list(Car.objects.filter(filters, is_active=True).values_list("id", flat=True))
+
+    return JsonResponse(
+        {
+            "after": after.isoformat(),
+            "days": days,
+            "cars": availability_index.free_windows(car_ids, after, days, limit),
+        }
+    )
+
+
 # History view
 def history(request):
     user = request.session.get("user")
@@ -1619,12 +2648,7 @@ def history(request):
     if not user:
         return redirect("login")
 
-    history_bookings = (
-        Booking.objects.filter(user_id=user["id"])
-        .filter(Q(order_stage="completed") | Q(status="rejected"))
-        .select_related("car")
-        .order_by("-completed_at", "-created_at")
-    )
+    history_bookings = _customer_history(user["id"])
 
     return render(
         request,
@@ -1643,12 +2667,7 @@ def order(request):
     if not user_session:
         return redirect("login")
 
-    bookings = (
-        Booking.objects.filter(user_id=user_session["id"])
-        .exclude(status="rejected")
-        .select_related("car")
-        .order_by("-created_at")
-    )
+    bookings = _customer_orders(user_session["id"])
 
     booking_id = request.GET.get("booking_id", "")
     selected_booking = None
@@ -1669,6 +2688,7 @@ def order(request):
             "selected_booking": selected_booking,
             "selected_progress": selected_progress,
             "selected_stage_action": stage_action,
+            "notifications_stream": _notifications_stream_enabled(request),
             "shop_name": getattr(settings, "SHOP_NAME", "TripCraft Car Rent Pickup Center"),
             "shop_address": getattr(settings, "SHOP_ADDRESS", ""),
             "shop_lat": getattr(settings, "SHOP_LAT", 13.7466),
@@ -1686,31 +2706,35 @@ def advance_order_stage(request, booking_id):
     if request.method != "POST":
         return HttpResponse("Method not allowed", status=405)
 
-    booking = Booking.objects.filter(id=booking_id, user_id=user_session["id"]).first()
-    if booking is None:
-        return HttpResponse("Order not found", status=404)
+    with transaction.atomic():
+        booking = Booking.objects.select_for_update().filter(id=booking_id, user_id=user_session["id"]).first()
+        if booking is None:
+            return HttpResponse("Order not found", status=404)
 
-    if booking.status == "rejected":
-        return redirect(f"{reverse('order')}?booking_id={booking.id}")
+        if booking.status == "rejected":
+            return redirect(f"{reverse('order')}?booking_id={booking.id}")
 
-    if booking.order_stage in ("awaiting_contact", "awaiting_handover"):
-        return redirect(f"{reverse('order')}?booking_id={booking.id}")
+        if booking.order_stage in ("awaiting_contact", "awaiting_handover"):
+            return redirect(f"{reverse('order')}?booking_id={booking.id}")
 
-    next_stage = ORDER_STAGE_NEXT.get(booking.order_stage)
-    if not next_stage:
-        return redirect(f"{reverse('order')}?booking_id={booking.id}")
+        next_stage = ORDER_STAGE_NEXT.get(booking.order_stage)
+        if not next_stage:
+            return redirect(f"{reverse('order')}?booking_id={booking.id}")
 
-    booking.order_stage = next_stage
+        before = booking_state(booking)
+        booking.order_stage = next_stage
 
-    update_fields = ["order_stage"]
-    if next_stage == "completed":
-        booking.completed_at = timezone.now()
-        update_fields.append("completed_at")
-        if booking.status != "rejected":
-            booking.status = "approved"
-            update_fields.append("status")
+        update_fields = ["order_stage"]
+        if next_stage == "completed":
+            booking.completed_at = timezone.now()
+            update_fields.append("completed_at")
+            if booking.status != "rejected":
+                booking.status = "approved"
+                update_fields.append("status")
 
-    booking.save(update_fields=update_fields)
+        booking.save(update_fields=update_fields)
+        record_booking_change(before, booking_state(booking))
+    availability_index.track_booking(booking)
     return redirect(f"{reverse('order')}?booking_id={booking.id}")
 
 
@@ -1722,19 +2746,23 @@ def cancel_order(request, booking_id):
     if request.method != "POST":
         return HttpResponse("Method not allowed", status=405)
 
-    booking = Booking.objects.filter(id=booking_id, user_id=user_session["id"]).first()
-    if booking is None:
-        return HttpResponse("Order not found", status=404)
+    with transaction.atomic():
+        booking = Booking.objects.select_for_update().filter(id=booking_id, user_id=user_session["id"]).first()
+        if booking is None:
+            return HttpResponse("Order not found", status=404)
 
-    if booking.order_stage == "completed":
-        return redirect(f"{reverse('order')}?booking_id={booking.id}")
+        if booking.order_stage == "completed":
+            return redirect(f"{reverse('order')}?booking_id={booking.id}")
 
-    if booking.status == "rejected":
-        return redirect("history")
+        if booking.status == "rejected":
+            return redirect("history")
 
-    booking.status = "rejected"
-    booking.completed_at = timezone.now()
-    booking.save(update_fields=["status", "completed_at"])
+        before = booking_state(booking)
+        booking.status = "rejected"
+        booking.completed_at = timezone.now()
+        booking.save(update_fields=["status", "completed_at"])
+        record_booking_change(before, booking_state(booking))
+    availability_index.track_booking(booking)
 
     _create_user_notification(
         user=booking.user,
@@ -1753,7 +2781,7 @@ def profile(request):
     if not user_session:
         return redirect("login")
 
-    user = User.objects.filter(id=user_session["id"]).first()
+    user = _current_user(request)
     if user is None:
         return redirect("logout")
 
@@ -1776,7 +2804,7 @@ def profile_update_phone(request):
             status=400,
         )
 
-    user = User.objects.filter(id=user_session["id"]).first()
+    user = _current_user(request)
     if user is None:
         return JsonResponse({"success": False, "message": "User not found"}, status=404)
 
@@ -1791,7 +2819,9 @@ def profile_update_phone(request):
         )
 
     user.phoneNumber = phone_number
-    user.save(update_fields=["phoneNumber"])
+    with transaction.atomic():
+        user.save(update_fields=["phoneNumber"])
+        refresh_booking_search_text(user_id=user.id)
 
     request.session["user"]["phoneNumber"] = phone_number
     request.session.modified = True
@@ -1829,7 +2859,7 @@ def profile_change_password(request):
             status=400,
         )
 
-    user = User.objects.filter(id=user_session["id"]).first()
+    user = _current_user(request)
     if user is None:
         return JsonResponse({"success": False, "message": "User not found"}, status=404)
 
@@ -1,9 +1,11 @@
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-SECRET_KEY = 'dev-secret-key'
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'dev-secret-key')
 DEBUG = True
 ALLOWED_HOSTS = ['*']
 
@@ -13,12 +15,19 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    'whitenoise.runserver_nostatic',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'api',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # WhiteNoise, made async-capable so ASGI requests never queue on Django's sync thread.
+    'api.middleware.StaticFilesMiddleware',
+    'api.middleware.QueryInstrumentationMiddleware',
+    # Only active with DB_REPLICA_HOSTS; must wrap SessionMiddleware (see api.db_router).
+    'api.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -46,6 +55,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'backend.wsgi.application'
+ASGI_APPLICATION = 'backend.asgi.application'
 
 DATABASES = {
     'default': {
@@ -53,8 +63,8 @@ DATABASES = {
         'NAME': 'car_rent',
         'USER': 'postgres',
         'PASSWORD': '123456789',
-        'HOST': 'localhost',
-        'PORT': '5432',
+        'HOST': os.environ.get('DB_HOST', 'localhost'),
+        'PORT': os.environ.get('DB_PORT', '5432'),
     }
 }
 
@@ -65,9 +75,22 @@ USE_I18N = True
 USE_TZ = True
 
 STATIC_URL = '/static/'
+# Only the asset folders; the HTML templates next to them are not static files.
 STATICFILES_DIRS = [
-    BASE_DIR / "api" / "templates",
+    ("Env", BASE_DIR / "api" / "templates" / "Env"),
+    ("Image", BASE_DIR / "api" / "templates" / "Image"),
 ]
+# `python manage.py collectstatic` writes content-hashed copies plus .gz/.br siblings here;
+# WhiteNoise serves the hashed names with far-future immutable cache headers.
+STATIC_ROOT = BASE_DIR / "staticfiles"
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
@@ -83,9 +106,162 @@ def _env_float(name, default):
         return default
 
 
+def _env_int(name, default):
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
 SHOP_NAME = os.environ.get("SHOP_NAME", "TripCraft Car Rent Pickup Center")
 SHOP_ADDRESS = os.environ.get("SHOP_ADDRESS", "Udon Thani Rajabhat University (Sam Phrao), 234 Moo 1, Ban Lao - Don Kloi Rd., Sam Phrao, Mueang Udon Thani, Udon Thani 41000")
 SHOP_LAT = _env_float("SHOP_LAT", 17.4515928)
 SHOP_LNG = _env_float("SHOP_LNG", 102.931065)
 
+# Seconds before a worker rebuilds its in-memory booking availability index.
+AVAILABILITY_INDEX_MAX_AGE = _env_float("AVAILABILITY_INDEX_MAX_AGE", 300.0)
+
+# In-process sweep of notifications for completed/cancelled bookings.
+# 0 disables it (run `python manage.py sweep_notifications` from cron instead).
+NOTIFICATION_SWEEP_INTERVAL = _env_float("NOTIFICATION_SWEEP_INTERVAL", 0.0)
+NOTIFICATION_SWEEP_BATCH_SIZE = _env_int("NOTIFICATION_SWEEP_BATCH_SIZE", 1000)
+
+# Under WSGI every open notification stream holds a worker thread for up to five
+# minutes, so the Order page polls instead unless NOTIFICATION_STREAM_WSGI=1 (only for
+# servers with far more threads than open Order tabs). ASGI always streams.
+NOTIFICATION_STREAM_WSGI = os.environ.get("NOTIFICATION_STREAM_WSGI", "0") == "1"
+
+# The Django cache holds the catalog version, the availability generation and the
+# occupancy months. Invalidations only reach other worker processes (and management
+# commands such as seed_data) through a shared backend (CACHE_BACKEND):
+#   "redis": REDIS_URL (default redis://127.0.0.1:6379/0), needs `pip install redis`.
+#   "database": the api_cache table, created by `python manage.py createcachetable`.
+#   "locmem" (default without REDIS_URL): a separate in-memory cache per process.
+REDIS_URL = os.environ.get("REDIS_URL", "")
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "redis" if REDIS_URL else "locmem")
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL or "redis://127.0.0.1:6379/0",
+        }
+    }
+elif CACHE_BACKEND == "database":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "api_cache",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+SHARED_CACHE = CACHE_BACKEND in ("redis", "database")
+
+# Seconds a cached public catalog response is kept; any car/image write invalidates it sooner
+# (on other workers only with a shared cache, hence the short default without one).
+CATALOG_CACHE_TIMEOUT = _env_int("CATALOG_CACHE_TIMEOUT", 3600 if SHARED_CACHE else 60)
+
+# Where sessions live: "cached_db" (cache first, database on a miss), "signed_cookies"
+# (no server-side storage at all) or "db" (one django_session query per request).
+# cached_db is only the default with a shared cache: with a per-process one, a logout on
+# one worker would leave the session cached and valid on the others.
+SESSION_MODE = os.environ.get("SESSION_MODE", "cached_db" if SHARED_CACHE else "db")
+SESSION_ENGINE = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}.get(SESSION_MODE, "django.contrib.sessions.backends.db")
+# A signed cookie holds session["user"], role included: with the public dev key anyone
+# could sign {"role": "admin"} themselves.
+if SESSION_ENGINE.endswith(".signed_cookies") and "DJANGO_SECRET_KEY" not in os.environ:
+    raise ImproperlyConfigured("SESSION_MODE=signed_cookies needs a private DJANGO_SECRET_KEY in the environment")
+
+# Processes that resize uploaded car images into thumbnail/card/full WebP and JPEG variants.
+IMAGE_VARIANT_WORKERS = _env_int("IMAGE_VARIANT_WORKERS", 2)
+
+# Per-request SQL stats (Server-Timing header + one "api.sql" log line); off unless SQL_INSTRUMENTATION=1.
+SQL_INSTRUMENTATION = os.environ.get("SQL_INSTRUMENTATION", "0") == "1"
+SQL_SLOWEST_QUERIES = _env_int("SQL_SLOWEST_QUERIES", 3)
+SQL_REPEATED_QUERY_THRESHOLD = _env_int("SQL_REPEATED_QUERY_THRESHOLD", 5)
+
+# How workers get Postgres connections (DB_CONNECTION_MODE):
+#   "per_request": connect on the first query, close when the request ends (Django's default).
+#   "persistent": keep a thread's connection for DB_CONN_MAX_AGE seconds. WSGI only:
+#                 under ASGI every request has its own connection.
+#   "pool": a psycopg 3 pool per process (DB_POOL_* sizes). Works under WSGI and ASGI.
+#   "pgbouncer": DB_HOST/DB_PORT point at pgbouncer in transaction pooling mode, so no
+#                server-side cursors; LISTEN goes straight to DB_DIRECT_HOST/DB_DIRECT_PORT.
+DB_CONNECTION_MODE = os.environ.get("DB_CONNECTION_MODE", "per_request")
+# Check a reused/pooled connection before handing it out (one extra round trip per request).
+DB_HEALTH_CHECKS = os.environ.get("DB_HEALTH_CHECKS", "1") == "1"
+if DB_CONNECTION_MODE == "persistent":
+    DATABASES["default"]["CONN_MAX_AGE"] = _env_int("DB_CONN_MAX_AGE", 300)
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = DB_HEALTH_CHECKS
+elif DB_CONNECTION_MODE == "pool":
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = DB_HEALTH_CHECKS
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": _env_int("DB_POOL_MIN_SIZE", 2),
+            "max_size": _env_int("DB_POOL_MAX_SIZE", 20),
+            # Seconds a request waits for a free connection before failing.
+            "timeout": _env_float("DB_POOL_TIMEOUT", 10.0),
+            "max_idle": _env_float("DB_POOL_MAX_IDLE", 600.0),
+        },
+    }
+elif DB_CONNECTION_MODE == "pgbouncer":
+    DATABASES["default"]["CONN_MAX_AGE"] = _env_int("DB_CONN_MAX_AGE", 300)
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = DB_HEALTH_CHECKS
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+# The notification listener keeps one LISTEN session per process, which must be a
+# plain connection to Postgres: not taken from the pool, not through pgbouncer.
+NOTIFICATION_LISTEN_DATABASE = "default"
+if DB_CONNECTION_MODE in ("pool", "pgbouncer"):
+    DATABASES["listen"] = {
+        **DATABASES["default"],
+        "HOST": os.environ.get("DB_DIRECT_HOST", DATABASES["default"]["HOST"]),
+        "PORT": os.environ.get("DB_DIRECT_PORT", DATABASES["default"]["PORT"]),
+        "OPTIONS": {},
+        "CONN_MAX_AGE": 0,
+        "DISABLE_SERVER_SIDE_CURSORS": False,
+    }
+    NOTIFICATION_LISTEN_DATABASE = "listen"
+
+# Read replicas (DB_REPLICA_HOSTS="host[:port],..."), each connected like "default" and
+# named replica1, replica2, ... GET/HEAD requests read from one of them; writes, other
+# methods and clients that wrote in the last DB_REPLICA_PIN_SECONDS use the primary.
+# DB_REPLICA_NAME points them at another database name, e.g. a local stand-in.
+DATABASE_REPLICAS = []
+for _index, _address in enumerate(filter(None, os.environ.get("DB_REPLICA_HOSTS", "").split(",")), start=1):
+    _host, _, _port = _address.strip().partition(":")
+    DATABASES[f"replica{_index}"] = {
+        **DATABASES["default"],
+        "NAME": os.environ.get("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "HOST": _host,
+        "PORT": _port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica{_index}")
+DB_REPLICA_PIN_SECONDS = _env_float("DB_REPLICA_PIN_SECONDS", 5.0)
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ["api.db_router.PrimaryReplicaRouter"]
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "api.sql": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
+
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"